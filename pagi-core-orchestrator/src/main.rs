@@ -8,16 +8,23 @@ mod watchdog;
 use memory_manager::MemoryManager;
 use proto::pagi_proto::pagi_server::{Pagi, PagiServer};
 use proto::pagi_proto::{
-    ActionRequest, ActionResponse, ApplyRequest, ApplyResponse, Empty, HealRequest, HealResponse,
-    MemoryRequest, MemoryResponse, PatchRequest, PatchResponse, RlmRequest, RlmResponse,
-    SearchRequest, SearchResponse, UpsertRequest, UpsertResponse,
+    ActionRequest, ActionResponse, ActionStreamRequest, ActionStreamResponse, ApplyRequest,
+    ApplyResponse, Empty, HealRequest, HealResponse, MemoryRequest, MemoryResponse, PatchRequest,
+    PatchResponse, RlmRequest, RlmResponse, SearchRequest, SearchResponse, UpsertRequest,
+    UpsertResponse,
 };
 use safety_governor::SafetyGovernor;
 use std::path::PathBuf;
+use std::pin::Pin;
 use std::sync::Arc;
-use tonic::{Request, Response, Status};
+use tokio_stream::wrappers::ReceiverStream;
+use tokio_stream::Stream;
+use tonic::{Request, Response, Status, Streaming};
 use watchdog::Watchdog;
 
+type ActionResponseStream =
+    Pin<Box<dyn Stream<Item = Result<ActionStreamResponse, Status>> + Send + 'static>>;
+
 struct Orchestrator {
     memory: Arc<MemoryManager>,
     watchdog: Arc<Watchdog>,
@@ -57,64 +64,56 @@ impl Pagi for Orchestrator {
         &self,
         request: Request<ActionRequest>,
     ) -> Result<Response<ActionResponse>, Status> {
-        let req = request.into_inner();
+        dispatch_action(&self.watchdog, self.safety_governor.max_depth, request.into_inner())
+            .await
+            .map(Response::new)
+    }
 
-        // Mirror recursion circuit-breaker semantics used by guard_rlm without introducing new schema drift.
-        if (req.depth as u32) > self.safety_governor.max_depth {
-            return Err(Status::invalid_argument(
-                "Recursion depth exceeded; circuit breaker activated",
-            ));
-        }
+    type ExecuteActionStreamStream = ActionResponseStream;
 
-        // Sovereignty gate: outbound LLM usage must be explicitly enabled.
-        // The Python bridge consults this when `PAGI_ACTIONS_VIA_GRPC=true`.
-        if req.skill_name == "llm_gateway" {
-            let allow_outbound = std::env::var("PAGI_ALLOW_OUTBOUND")
-                .ok()
-                .map(|v| {
-                    let v = v.trim().to_lowercase();
-                    v == "true" || v == "1" || v == "yes" || v == "y" || v == "on"
-                })
-                .unwrap_or(false);
-            if !allow_outbound {
-                return Err(Status::permission_denied(
-                    "Outbound LLM calls are disabled (PAGI_ALLOW_OUTBOUND=false)",
-                ));
+    async fn execute_action_stream(
+        &self,
+        request: Request<Streaming<ActionStreamRequest>>,
+    ) -> Result<Response<Self::ExecuteActionStreamStream>, Status> {
+        let mut inbound = request.into_inner();
+        let (tx, rx) = tokio::sync::mpsc::channel(64);
+        let watchdog = Arc::clone(&self.watchdog);
+        let max_depth = self.safety_governor.max_depth;
+        tokio::spawn(async move {
+            loop {
+                let msg = match inbound.message().await {
+                    Ok(Some(msg)) => msg,
+                    Ok(None) => break,
+                    Err(status) => {
+                        let _ = tx.send(Err(status)).await;
+                        break;
+                    }
+                };
+                // One task per action: a slow skill does not hold up the calls pipelined behind it.
+                let tx = tx.clone();
+                let watchdog = Arc::clone(&watchdog);
+                tokio::spawn(async move {
+                    let result = match msg.action {
+                        Some(action) => dispatch_action(&watchdog, max_depth, action).await,
+                        None => Err(Status::invalid_argument("ActionStreamRequest.action is required")),
+                    };
+                    // Per-call errors travel in the response (same shape the bridge builds for unary
+                    // failures) so one denied action does not end the session's stream.
+                    let result = result.unwrap_or_else(|status| ActionResponse {
+                        observation: "Action failed".to_string(),
+                        success: false,
+                        error: format!("grpc_error:{}", status.message()),
+                    });
+                    let _ = tx
+                        .send(Ok(ActionStreamResponse {
+                            call_id: msg.call_id,
+                            result: Some(result),
+                        }))
+                        .await;
+                });
             }
-        }
-
-        // PAGI_MOCK_MODE precedence: mock path when request asks for mock or env forces mock.
-        let env_mock = std::env::var("PAGI_MOCK_MODE")
-            .map(|v| v.trim().eq_ignore_ascii_case("true") || v == "1")
-            .unwrap_or(false);
-        if req.mock_mode || env_mock {
-            let skill = req.skill_name;
-            return Ok(Response::new(ActionResponse {
-                observation: format!("Observation: mock executed skill={skill}"),
-                success: true,
-                error: "".to_string(),
-            }));
-        }
-
-        // Real dispatch only when explicitly enabled (allow-list, timeout, no shell).
-        let allow_real = std::env::var("PAGI_ALLOW_REAL_DISPATCH")
-            .map(|v| v.trim().eq_ignore_ascii_case("true") || v == "1")
-            .unwrap_or(false);
-        if allow_real {
-            return self
-                .watchdog
-                .execute_action_real(req)
-                .await
-                .map(Response::new);
-        }
-
-        // PAGI_ALLOW_REAL_DISPATCH != true → return mock observation (do not expose unimplemented).
-        let skill = req.skill_name;
-        Ok(Response::new(ActionResponse {
-            observation: format!("Observation: mock executed skill={skill}"),
-            success: true,
-            error: "".to_string(),
-        }))
+        });
+        Ok(Response::new(Box::pin(ReceiverStream::new(rx))))
     }
 
     async fn self_heal(
@@ -177,6 +176,66 @@ impl Pagi for Orchestrator {
     }
 }
 
+/// ExecuteAction semantics shared by the unary RPC and each call on ExecuteActionStream.
+async fn dispatch_action(
+    watchdog: &Watchdog,
+    max_depth: u32,
+    req: ActionRequest,
+) -> Result<ActionResponse, Status> {
+    // Mirror recursion circuit-breaker semantics used by guard_rlm without introducing new schema drift.
+    if (req.depth as u32) > max_depth {
+        return Err(Status::invalid_argument(
+            "Recursion depth exceeded; circuit breaker activated",
+        ));
+    }
+
+    // Sovereignty gate: outbound LLM usage must be explicitly enabled.
+    // The Python bridge consults this when `PAGI_ACTIONS_VIA_GRPC=true`.
+    if req.skill_name == "llm_gateway" {
+        let allow_outbound = std::env::var("PAGI_ALLOW_OUTBOUND")
+            .ok()
+            .map(|v| {
+                let v = v.trim().to_lowercase();
+                v == "true" || v == "1" || v == "yes" || v == "y" || v == "on"
+            })
+            .unwrap_or(false);
+        if !allow_outbound {
+            return Err(Status::permission_denied(
+                "Outbound LLM calls are disabled (PAGI_ALLOW_OUTBOUND=false)",
+            ));
+        }
+    }
+
+    // PAGI_MOCK_MODE precedence: mock path when request asks for mock or env forces mock.
+    let env_mock = std::env::var("PAGI_MOCK_MODE")
+        .map(|v| v.trim().eq_ignore_ascii_case("true") || v == "1")
+        .unwrap_or(false);
+    if req.mock_mode || env_mock {
+        let skill = req.skill_name;
+        return Ok(ActionResponse {
+            observation: format!("Observation: mock executed skill={skill}"),
+            success: true,
+            error: "".to_string(),
+        });
+    }
+
+    // Real dispatch only when explicitly enabled (allow-list, timeout, no shell).
+    let allow_real = std::env::var("PAGI_ALLOW_REAL_DISPATCH")
+        .map(|v| v.trim().eq_ignore_ascii_case("true") || v == "1")
+        .unwrap_or(false);
+    if allow_real {
+        return watchdog.execute_action_real(req).await;
+    }
+
+    // PAGI_ALLOW_REAL_DISPATCH != true → return mock observation (do not expose unimplemented).
+    let skill = req.skill_name;
+    Ok(ActionResponse {
+        observation: format!("Observation: mock executed skill={skill}"),
+        success: true,
+        error: "".to_string(),
+    })
+}
+
 fn default_paths() -> (PathBuf, PathBuf, PathBuf) {
     let cwd = std::env::current_dir().unwrap_or_else(|_| PathBuf::from("."));
     let registry = std::env::var("PAGI_REGISTRY_PATH")
@@ -231,6 +290,7 @@ mod tests {
             mock_mode: true,
             allow_list_hash: String::new(),
             timeout_ms: 0,
+            params_json: String::new(),
         });
         let resp = orch.execute_action(req).await.unwrap();
         let inner = resp.into_inner();
@@ -266,6 +326,7 @@ mod tests {
             mock_mode: false,
             allow_list_hash: String::new(),
             timeout_ms: 0,
+            params_json: String::new(),
         });
         let resp = orch.execute_action(req).await.unwrap();
         let inner = resp.into_inner();
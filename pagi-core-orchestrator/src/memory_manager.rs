@@ -13,9 +13,55 @@ use qdrant_client::qdrant::{
 use tonic::Status;
 
 use crate::proto::pagi_proto::{
-    SearchHit, SearchRequest, SearchResponse, UpsertRequest, UpsertResponse,
+    QuantizedVector, SearchHit, SearchRequest, SearchResponse, UpsertRequest, UpsertResponse,
+    VectorEncoding,
 };
 
+/// IEEE 754 binary16 bits -> f32 (exact; every half is representable as f32).
+fn f16_to_f32(bits: u16) -> f32 {
+    let sign = ((bits >> 15) as u32) << 31;
+    let exp = ((bits >> 10) & 0x1f) as u32;
+    let frac = (bits & 0x3ff) as u32;
+    let out = match exp {
+        0 if frac == 0 => sign,
+        0 => {
+            // Subnormal half: frac * 2^-24.
+            let v = frac as f32 / 16_777_216.0;
+            return if sign != 0 { -v } else { v };
+        }
+        0x1f => sign | 0x7f80_0000 | (frac << 13),
+        _ => sign | ((exp + 112) << 23) | (frac << 13),
+    };
+    f32::from_bits(out)
+}
+
+/// Resolve a float32 vector from the plain `repeated float` field or, when that is empty, from its
+/// compact QuantizedVector form (float16 halves, or int8 codes: value = code * scale + offset).
+fn decode_vector(vector: Vec<f32>, quantized: Option<QuantizedVector>) -> Result<Vec<f32>, Status> {
+    let Some(q) = quantized.filter(|_| vector.is_empty()) else {
+        return Ok(vector);
+    };
+    if q.encoding == VectorEncoding::Float16 as i32 {
+        if q.data.len() % 2 != 0 {
+            return Err(Status::invalid_argument("float16 vector data has odd length"));
+        }
+        Ok(q.data
+            .chunks_exact(2)
+            .map(|b| f16_to_f32(u16::from_le_bytes([b[0], b[1]])))
+            .collect())
+    } else if q.encoding == VectorEncoding::Int8 as i32 {
+        Ok(q.data
+            .iter()
+            .map(|&b| (b as i8) as f32 * q.scale + q.offset)
+            .collect())
+    } else {
+        Err(Status::invalid_argument(format!(
+            "unsupported QuantizedVector encoding {}",
+            q.encoding
+        )))
+    }
+}
+
 /// Tiered memory manager; layers 1–7 per blueprint.
 pub struct MemoryManager {
     /// L1 sensory: ring-buffer stub (key -> raw bytes).
@@ -28,19 +74,43 @@ pub struct MemoryManager {
     embedding_dim: usize,
     /// Cached zero vector for fallback queries.
     zero_vector: Vec<f32>,
+    /// PAGI_EMBEDDING_DIM=native: vectors arrive unpadded at the bridge model's size, so a
+    /// mis-sized query vector is a contract error rather than a cue to fall back to zeros.
+    native_dim: bool,
 }
 
 impl MemoryManager {
-    fn embedding_dim_from_env() -> usize {
-        std::env::var("PAGI_EMBEDDING_DIM")
-            .ok()
-            .and_then(|s| s.parse().ok())
-            .unwrap_or(1536)
+    /// (dim, native). `native` (or `0`) sizes collections to the bridge model's real dimension,
+    /// PAGI_EMBEDDING_NATIVE_DIM (default 384, all-MiniLM-L6-v2), instead of the padded 1536.
+    fn embedding_dim_from_env() -> (usize, bool) {
+        let raw = std::env::var("PAGI_EMBEDDING_DIM").unwrap_or_default();
+        let raw = raw.trim();
+        if raw.eq_ignore_ascii_case("native") || raw == "0" {
+            let native = std::env::var("PAGI_EMBEDDING_NATIVE_DIM")
+                .ok()
+                .and_then(|s| s.trim().parse().ok())
+                .unwrap_or(384);
+            return (native, true);
+        }
+        (raw.parse().unwrap_or(1536), false)
+    }
+
+    /// Requests declare the bridge model's vector size (`embedding_dim`, 0 = undeclared). Native
+    /// collections are sized by PAGI_EMBEDDING_NATIVE_DIM, so a different declared size means the
+    /// model was swapped on one side only: refuse loudly instead of storing or searching mismatched vectors.
+    fn check_declared_dim(&self, declared: u32) -> Result<(), Status> {
+        if self.native_dim && declared != 0 && declared as usize != self.embedding_dim {
+            return Err(Status::failed_precondition(format!(
+                "bridge embeds {} dims but native collections have {} (PAGI_EMBEDDING_NATIVE_DIM); set it to the bridge model's dimension",
+                declared, self.embedding_dim
+            )));
+        }
+        Ok(())
     }
 
     /// Create and connect to Qdrant at URI from PAGI_QDRANT_URI. Use init_kbs() after to create collections.
     pub async fn new_async() -> Result<Arc<Self>, Box<dyn std::error::Error + Send + Sync>> {
-        let embedding_dim = Self::embedding_dim_from_env();
+        let (embedding_dim, native_dim) = Self::embedding_dim_from_env();
         let zero_vector = vec![0f32; embedding_dim];
 
         // Allow running orchestrator without Qdrant for Phase-3 loop/action testing.
@@ -56,6 +126,7 @@ impl MemoryManager {
                 l4_semantic: None,
                 embedding_dim,
                 zero_vector,
+                native_dim,
             }));
         }
 
@@ -73,10 +144,11 @@ impl MemoryManager {
             l4_semantic: Some(l4_semantic),
             embedding_dim,
             zero_vector,
+            native_dim,
         }))
     }
 
-    /// Generic init for 8 KBs; dimensions from PAGI_EMBEDDING_DIM (default 1536), cosine distance.
+    /// Generic init for 8 KBs; dimensions from PAGI_EMBEDDING_DIM (default 1536; `native`: model size), cosine distance.
     pub async fn init_kbs(&self) -> Result<(), Box<dyn std::error::Error + Send + Sync>> {
         let Some(l4) = self.l4_semantic.as_ref() else {
             // Qdrant disabled; L4 init is a no-op.
@@ -156,13 +228,21 @@ impl MemoryManager {
         &self,
         req: SearchRequest,
     ) -> Result<SearchResponse, Status> {
+        self.check_declared_dim(req.embedding_dim)?;
         let Some(l4) = self.l4_semantic.as_ref() else {
             return Ok(SearchResponse { hits: vec![] });
         };
         let limit = req.limit.max(1).min(100) as u64;
         let dim = self.embedding_dim;
-        let query_vector: Vec<f32> = if req.query_vector.len() == dim {
-            req.query_vector
+        let requested = decode_vector(req.query_vector, req.quantized_query)?;
+        let query_vector: Vec<f32> = if requested.len() == dim {
+            requested
+        } else if self.native_dim && !requested.is_empty() {
+            return Err(Status::invalid_argument(format!(
+                "query_vector has {} dims; native collections expect {} (PAGI_EMBEDDING_NATIVE_DIM)",
+                requested.len(),
+                dim
+            )));
         } else {
             self.zero_vector.clone()
         };
@@ -222,6 +302,7 @@ impl MemoryManager {
 
     /// L4 upsert: store vector points into a KB collection. Python embeds; Rust owns I/O.
     pub async fn upsert_vectors(&self, req: UpsertRequest) -> Result<UpsertResponse, Status> {
+        self.check_declared_dim(req.embedding_dim)?;
         let l4 = self
             .l4_semantic
             .as_ref()
@@ -233,7 +314,16 @@ impl MemoryManager {
             for (k, v) in p.payload {
                 payload.insert(k, v);
             }
-            points.push(PointStruct::new(PointId::from(p.id), p.vector, payload));
+            let vector = decode_vector(p.vector, p.quantized)?;
+            if self.native_dim && vector.len() != self.embedding_dim {
+                return Err(Status::invalid_argument(format!(
+                    "point {} has {} dims; native collections expect {} (PAGI_EMBEDDING_NATIVE_DIM)",
+                    p.id,
+                    vector.len(),
+                    self.embedding_dim
+                )));
+            }
+            points.push(PointStruct::new(PointId::from(p.id), vector, payload));
         }
         let n = points.len();
         l4
@@ -246,3 +336,72 @@ impl MemoryManager {
         })
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn decode_vector_prefers_plain_floats() {
+        let q = QuantizedVector {
+            encoding: VectorEncoding::Int8 as i32,
+            data: vec![1],
+            scale: 1.0,
+            offset: 0.0,
+        };
+        assert_eq!(decode_vector(vec![0.5, 0.25], Some(q)).unwrap(), vec![0.5, 0.25]);
+    }
+
+    #[test]
+    fn decode_vector_float16_and_int8() {
+        // 1.0, -2.0, 0.5 as little-endian halves.
+        let halves: Vec<u8> = [0x3c00u16, 0xc000, 0x3800]
+            .iter()
+            .flat_map(|h| h.to_le_bytes())
+            .collect();
+        let q = QuantizedVector {
+            encoding: VectorEncoding::Float16 as i32,
+            data: halves,
+            scale: 0.0,
+            offset: 0.0,
+        };
+        assert_eq!(decode_vector(vec![], Some(q)).unwrap(), vec![1.0, -2.0, 0.5]);
+
+        let q = QuantizedVector {
+            encoding: VectorEncoding::Int8 as i32,
+            data: vec![0x81, 0x00, 0x7f], // -127, 0, 127
+            scale: 0.5,
+            offset: 1.0,
+        };
+        assert_eq!(decode_vector(vec![], Some(q)).unwrap(), vec![-62.5, 1.0, 64.5]);
+    }
+
+    #[test]
+    fn declared_dim_must_match_native_collections() {
+        let manager = |native_dim| MemoryManager {
+            l1_sensory: DashMap::new(),
+            l2_working: DashMap::new(),
+            l4_semantic: None,
+            embedding_dim: 384,
+            zero_vector: vec![0f32; 384],
+            native_dim,
+        };
+        assert!(manager(true).check_declared_dim(384).is_ok());
+        assert!(manager(true).check_declared_dim(0).is_ok());
+        let err = manager(true).check_declared_dim(768).unwrap_err();
+        assert_eq!(err.code(), tonic::Code::FailedPrecondition);
+        assert!(manager(false).check_declared_dim(768).is_ok());
+    }
+
+    #[test]
+    fn decode_vector_rejects_odd_float16_data() {
+        let q = QuantizedVector {
+            encoding: VectorEncoding::Float16 as i32,
+            data: vec![0x00, 0x3c, 0x00],
+            scale: 0.0,
+            offset: 0.0,
+        };
+        let err = decode_vector(vec![], Some(q)).unwrap_err();
+        assert_eq!(err.code(), tonic::Code::InvalidArgument);
+    }
+}
@@ -240,6 +240,7 @@ impl Watchdog {
             mock_mode: false,
             allow_list_hash: Self::allow_list_hash(&allow_list),
             timeout_ms: 15_000,
+            params_json: String::new(),
         };
 
         let evolve_resp = self.execute_action_real(evolve_req).await?;
@@ -338,7 +339,12 @@ impl Watchdog {
             )));
         }
 
-        let params_json: String = {
+        // params_json (typed JSON object) wins over the string map when both are sent.
+        let params_json: String = if !req.params_json.is_empty() {
+            serde_json::from_str::<serde_json::Map<String, serde_json::Value>>(&req.params_json)
+                .map_err(|e| Status::invalid_argument(format!("params_json: {}", e)))?;
+            req.params_json.clone()
+        } else {
             let map: HashMap<&str, &str> = req
                 .params
                 .iter()
@@ -430,6 +436,8 @@ impl Watchdog {
             kb_name: "kb_core".to_string(),
             limit: 5,
             query_vector: vec![],
+            quantized_query: None,
+            embedding_dim: 0,
         };
         let prior = self
             .memory
@@ -727,6 +735,7 @@ mod tests {
             mock_mode: false,
             allow_list_hash: String::new(),
             timeout_ms: 5000,
+            params_json: String::new(),
         };
         let result = watchdog.execute_action_real(req).await;
         assert!(result.is_err());
@@ -755,6 +764,7 @@ mod tests {
             mock_mode: false,
             allow_list_hash: String::new(),
             timeout_ms: 50,
+            params_json: String::new(),
         };
         let result = watchdog.execute_action_real(req).await;
         assert!(result.is_ok());
@@ -765,6 +775,33 @@ mod tests {
         std::env::remove_var("PAGI_DISABLE_QDRANT");
     }
 
+    #[tokio::test]
+    async fn test_execute_action_rejects_non_object_params_json() {
+        let _g = lock_test_env();
+        std::env::set_var("PAGI_DISABLE_QDRANT", "1");
+        let temp = temp_bridge_dir(&["peek_file"], false);
+        let registry = temp.join("registry");
+        fs::create_dir_all(&registry).unwrap();
+        let memory = MemoryManager::new_async().await.unwrap();
+        let core_dir = std::env::current_dir().unwrap_or_else(|_| PathBuf::from("."));
+        let watchdog = Watchdog::new(registry, memory, core_dir, temp.clone());
+        let req = ActionRequest {
+            skill_name: "peek_file".to_string(),
+            params: HashMap::new(),
+            depth: 0,
+            reasoning_id: "r1".to_string(),
+            mock_mode: false,
+            allow_list_hash: String::new(),
+            timeout_ms: 5000,
+            params_json: "[1, 2]".to_string(),
+        };
+        let err = watchdog.execute_action_real(req).await.unwrap_err();
+        assert_eq!(err.code(), tonic::Code::InvalidArgument);
+        assert!(err.message().contains("params_json"));
+        let _ = fs::remove_dir_all(temp);
+        std::env::remove_var("PAGI_DISABLE_QDRANT");
+    }
+
     #[tokio::test]
     #[cfg(not(target_os = "windows"))]
     async fn test_apply_patch_auto_commit() {
@@ -4,7 +4,6 @@ import { Mic, ArrowRight, User } from 'lucide-react';
 import { Message, AgentEvent, ProjectContext as ProjectContextType } from '../types';
 import { gemini } from '../services/geminiService';
 import { mockBackend } from '../services/mockBackendService';
-import type { RLMSummaryItem } from '../services/geminiService';
 import ProjectContext from './ProjectContext';
 
 interface ChatViewProps {
@@ -120,7 +119,7 @@ const ChatView: React.FC<ChatViewProps> = ({ onStatusChange }) => {
           email: flags.personalEmail === true,
           calendar: flags.personalCalendar === true,
         };
-        const summaries = await gemini.rlmMultiTurn({
+        const turns = gemini.rlmMultiTurnStream({
           query: currentInput,
           context: lastAssistant?.content ?? '',
           depth: 0,
@@ -129,15 +128,15 @@ const ChatView: React.FC<ChatViewProps> = ({ onStatusChange }) => {
           feature_flags: Object.values(feature_flags).some(Boolean) ? feature_flags : undefined,
           mock_mode: savedConfig.useMockModeForRlm === true,  // false = force real RLM (structured/LLM) even if bridge has PAGI_MOCK_MODE=true
         });
+        // Render each turn as the bridge streams it; "Continuing..." while the last one has not converged.
         const parts: string[] = [];
-        summaries.forEach((s: RLMSummaryItem, i: number) => {
-          parts.push(`**Turn ${i + 1}**\n${s.summary}`);
-          if (!s.converged && i === summaries.length - 1) parts.push('*Continuing...*');
-        });
-        const fullContent = parts.join('\n\n---\n\n');
-        setMessages(prev =>
-          prev.map(m => (m.id === assistantId ? { ...m, content: fullContent } : m))
-        );
+        for await (const s of turns) {
+          parts.push(`**Turn ${parts.length + 1}**\n${s.summary}`);
+          const fullContent = [...parts, ...(s.converged ? [] : ['*Continuing...*'])].join('\n\n---\n\n');
+          setMessages(prev =>
+            prev.map(m => (m.id === assistantId ? { ...m, content: fullContent } : m))
+          );
+        }
       } else {
         let fullContent = '';
         const stream = gemini.streamChat(
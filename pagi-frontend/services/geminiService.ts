@@ -53,6 +53,40 @@ export class GeminiService {
    * Use when PAGI_ALLOW_LOCAL_DISPATCH or bridge is available.
    */
   async rlmMultiTurn(payload: RLMMultiTurnPayload): Promise<RLMSummaryItem[]> {
+    const res = await this.postRlmMultiTurn(payload, false);
+    return res.json();
+  }
+
+  /**
+   * POST to bridge /rlm-multi-turn with stream=true; yields each RLMSummary as its turn completes
+   * (SSE `turn` events) and returns when the bridge sends `done`.
+   */
+  async *rlmMultiTurnStream(payload: RLMMultiTurnPayload): AsyncGenerator<RLMSummaryItem> {
+    const res = await this.postRlmMultiTurn(payload, true);
+    const reader = res.body?.getReader();
+    if (!reader) return;
+
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const frames = buffer.split('\n\n');
+      buffer = frames.pop() || '';
+      for (const frame of frames) {
+        const event = frame.match(/^event: (.*)$/m)?.[1];
+        const data = frame.match(/^data: (.*)$/m)?.[1];
+        if (event === 'done') return;
+        if (event === 'turn' && data) {
+          const turn = JSON.parse(data);
+          yield { summary: turn.summary, converged: turn.converged };
+        }
+      }
+    }
+  }
+
+  private async postRlmMultiTurn(payload: RLMMultiTurnPayload, stream: boolean): Promise<Response> {
     const base = this.getBridgeUrl();
     const body: Record<string, unknown> = {
       query: payload.query,
@@ -63,6 +97,7 @@ export class GeminiService {
     if (payload.vertical_use_case) body.vertical_use_case = payload.vertical_use_case;
     if (payload.feature_flags && Object.keys(payload.feature_flags).length > 0) body.feature_flags = payload.feature_flags;
     if (payload.mock_mode !== undefined) body.mock_mode = payload.mock_mode;
+    if (stream) body.stream = true;
     const res = await fetch(`${base}/rlm-multi-turn`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
@@ -72,7 +107,7 @@ export class GeminiService {
       const text = await res.text();
       throw new Error(text || `RLM multi-turn failed: ${res.status}`);
     }
-    return res.json();
+    return res;
   }
 
   /**
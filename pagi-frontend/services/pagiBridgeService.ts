@@ -14,7 +14,7 @@ export class PagiBridgeService {
     const wsUrl = url ?? `${base}/ws/agent`;
     if (this.socket) this.socket.close();
 
-    this.socket = new WebSocket(url);
+    this.socket = new WebSocket(wsUrl);
     this.socket.onmessage = (e) => {
       try {
         const event: AgentEvent = JSON.parse(e.data);
@@ -29,6 +29,17 @@ export class PagiBridgeService {
     };
   }
 
+  /**
+   * Starts an RLM session on the open socket; its AgentEvents arrive via onEvent
+   * (session_started … session_ended). Body is the same as POST /rlm-multi-turn.
+   */
+  startSession(payload: { query: string; context?: string; max_turns?: number; vertical_use_case?: string; feature_flags?: Record<string, boolean>; mock_mode?: boolean }) {
+    if (!this.socket || this.socket.readyState !== WebSocket.OPEN) {
+      throw new Error("PAGI Bridge socket is not open; call connect() first.");
+    }
+    this.socket.send(JSON.stringify(payload));
+  }
+
   onEvent(callback: (event: AgentEvent) => void) {
     this.eventListeners.push(callback);
     return () => {
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Embedding backend benchmark: torch SentenceTransformer vs ONNX Runtime int8 (PAGI_EMBED_BACKEND).
+
+For each backend, pinned to the same PAGI_BENCH_THREADS cores:
+- latency: single-text encode p50/p95 over PAGI_BENCH_LATENCY_ITERS calls (the route path)
+- throughput: texts/s and texts/s/core encoding PAGI_BENCH_TEXTS texts in batches of
+  PAGI_BENCH_BATCH (the indexing path)
+Then cosine parity of onnx against torch on the same texts; exits 1 when the minimum cosine is below
+PAGI_BENCH_MIN_COSINE (default 0.99), so it can gate an export in CI.
+
+Texts are chunks of the repo docs (ARCHITECTURE.md, README.md) so lengths match real indexing.
+
+Usage:
+  python scripts/export_onnx.py            # once, writes models/<model>-onnx
+  python scripts/bench_embed.py
+  PAGI_BENCH_THREADS=4 PAGI_BENCH_TEXTS=1024 python scripts/bench_embed.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure `src/` is importable when running from `scripts/`.
+_BRIDGE_ROOT = Path(__file__).resolve().parents[1]
+if str(_BRIDGE_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BRIDGE_ROOT))
+
+from src.embed_backends import EMBED_BACKENDS, cosine_parity, load_embed_model  # noqa: E402
+
+
+def _texts(n: int) -> list[str]:
+    chunks: list[str] = []
+    for name in ("ARCHITECTURE.md", "README.md"):
+        path = _BRIDGE_ROOT.parent / name
+        if path.is_file():
+            text = path.read_text(encoding="utf-8", errors="replace")
+            chunks += [text[i : i + 500] for i in range(0, len(text), 500)]
+    chunks = chunks or [f"sample sentence number {i} about memory, skills and recursion" for i in range(64)]
+    return [chunks[i % len(chunks)] for i in range(n)]
+
+
+def _bench(model, texts: list[str], batch: int, latency_iters: int) -> tuple[float, float, float, np.ndarray]:
+    model.encode(texts[:batch], batch_size=batch)  # warm-up outside the timed region
+    lat = []
+    for i in range(latency_iters):
+        t0 = time.perf_counter()
+        model.encode(texts[i % len(texts)])
+        lat.append((time.perf_counter() - t0) * 1000)
+    t0 = time.perf_counter()
+    vectors = np.asarray(model.encode(texts, batch_size=batch), dtype=np.float32)
+    tput = len(texts) / (time.perf_counter() - t0)
+    return float(np.percentile(lat, 50)), float(np.percentile(lat, 95)), tput, vectors
+
+
+def main() -> None:
+    threads = int(os.environ.get("PAGI_BENCH_THREADS", "1"))
+    n_texts = int(os.environ.get("PAGI_BENCH_TEXTS", "256"))
+    batch = int(os.environ.get("PAGI_BENCH_BATCH", "32"))
+    latency_iters = int(os.environ.get("PAGI_BENCH_LATENCY_ITERS", "100"))
+    min_cosine = float(os.environ.get("PAGI_BENCH_MIN_COSINE", "0.99"))
+    model_name = os.environ.get("PAGI_EMBED_MODEL", "all-MiniLM-L6-v2")
+
+    import torch
+
+    torch.set_num_threads(threads)
+    os.environ["PAGI_ONNX_THREADS"] = str(threads)
+    texts = _texts(n_texts)
+
+    print(f"model={model_name} threads={threads} texts={n_texts} batch={batch}")
+    results: dict[str, tuple[float, float, float, np.ndarray]] = {}
+    for backend in EMBED_BACKENDS:
+        model = load_embed_model(model_name, backend=backend)
+        results[backend] = _bench(model, texts, batch, latency_iters)
+        p50, p95, tput, _ = results[backend]
+        speedup = tput / results["torch"][2]
+        print(
+            f"{backend:6s}  p50={p50:7.2f} ms  p95={p95:7.2f} ms  "
+            f"{tput:8.1f} texts/s  {tput / threads:8.1f} texts/s/core  ({speedup:.2f}x)"
+        )
+
+    parity = cosine_parity(results["torch"][3], results["onnx"][3])
+    print(f"parity onnx vs torch: min={parity['min']:.5f} mean={parity['mean']:.5f} (threshold {min_cosine})")
+    if parity["min"] < min_cosine:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
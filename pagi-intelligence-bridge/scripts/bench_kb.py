@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the L4 KB search path: fresh channel per request vs pooled grpc.aio.
+
+Starts an in-process fake orchestrator (SemanticSearch only) on an ephemeral port, then compares:
+- legacy: sync handler on a thread pool, new grpc.insecure_channel per request (pre-pool behaviour)
+- pooled: async `api_search` route on the shared grpc.aio channel pool
+
+Embedding is stubbed to a constant vector so only the gRPC/handler path is measured.
+
+Usage:
+  python scripts/bench_kb.py
+  PAGI_BENCH_REQUESTS=5000 PAGI_BENCH_CONCURRENCY=64 python scripts/bench_kb.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from concurrent import futures
+from pathlib import Path
+
+import grpc
+
+# Ensure `src/` is importable when running from `scripts/`.
+_BRIDGE_ROOT = Path(__file__).resolve().parents[1]
+if str(_BRIDGE_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BRIDGE_ROOT))
+
+from src.pagi_pb import pagi_pb2, pagi_pb2_grpc  # noqa: E402
+
+
+class _FakeOrchestrator(pagi_pb2_grpc.PagiServicer):
+    def SemanticSearch(self, request, context):
+        return pagi_pb2.SearchResponse(
+            hits=[pagi_pb2.SearchHit(document_id="d1", score=0.9, content_snippet=request.query)]
+        )
+
+
+def _start_server() -> tuple[grpc.Server, int]:
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=32))
+    pagi_pb2_grpc.add_PagiServicer_to_server(_FakeOrchestrator(), server)
+    port = server.add_insecure_port("[::1]:0")
+    server.start()
+    return server, port
+
+
+def _legacy_search(addr: str, vector: list[float]) -> int:
+    """Pre-pool route body: new channel per request, blocking call."""
+    channel = grpc.insecure_channel(addr)
+    try:
+        stub = pagi_pb2_grpc.PagiStub(channel)
+        req = pagi_pb2.SearchRequest(query="bench", kb_name="kb_personal", limit=20, query_vector=vector)
+        return len(stub.SemanticSearch(req).hits)
+    finally:
+        channel.close()
+
+
+def _bench_legacy(addr: str, vector: list[float], n: int, concurrency: int) -> float:
+    t0 = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: _legacy_search(addr, vector), range(n)))
+    return n / (time.perf_counter() - t0)
+
+
+async def _bench_pooled(n: int, concurrency: int) -> float:
+    from src import main as bridge_main
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            await bridge_main.api_search(query="bench", kb_name="kb_personal", limit=20)
+
+    await one()  # open pool outside the timed region
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    rps = n / (time.perf_counter() - t0)
+    await bridge_main._close_grpc_aio()
+    return rps
+
+
+def main() -> None:
+    n = int(os.environ.get("PAGI_BENCH_REQUESTS", "2000"))
+    concurrency = int(os.environ.get("PAGI_BENCH_CONCURRENCY", "40"))
+    dim = int(os.environ.get("PAGI_EMBEDDING_DIM", "1536"))
+
+    server, port = _start_server()
+    os.environ["PAGI_GRPC_PORT"] = str(port)
+    os.environ["PAGI_ALLOW_LOCAL_DISPATCH"] = "true"
+
+    from src import main as bridge_main
+
+    vector = [0.1] * dim
+    bridge_main._embed_content = lambda _text: vector  # isolate gRPC path from the model
+
+    try:
+        legacy = _bench_legacy(f"[::1]:{port}", vector, n, concurrency)
+        pooled = asyncio.run(_bench_pooled(n, concurrency))
+    finally:
+        server.stop(grace=None)
+
+    print(f"requests={n} concurrency={concurrency} dim={dim}")
+    print(f"{'legacy_channel_per_request':35s}  {legacy:10.1f} req/s")
+    print(f"{'pooled_grpc_aio':35s}  {pooled:10.1f} req/s  ({pooled / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Wire-size and latency benchmark for bulk UpsertVectors: float32 vs float16 vs int8 transport.
+
+Starts an in-process fake orchestrator (UpsertVectors only; decodes QuantizedVector like
+memory_manager.rs, outside the timed region) on an ephemeral port, then for each encoding sends
+PAGI_BENCH_BATCHES requests of PAGI_BENCH_POINTS random unit vectors and reports serialized bytes per
+request, mean encode+RPC latency per batch, and mean cosine between decoded and original vectors.
+
+Usage:
+  python scripts/bench_vectors.py
+  PAGI_BENCH_DIM=1536 PAGI_BENCH_POINTS=256 PAGI_BENCH_BATCHES=50 python scripts/bench_vectors.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent import futures
+from pathlib import Path
+
+import grpc
+import numpy as np
+
+# Ensure `src/` is importable when running from `scripts/`.
+_BRIDGE_ROOT = Path(__file__).resolve().parents[1]
+if str(_BRIDGE_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BRIDGE_ROOT))
+
+from src.pagi_pb import pagi_pb2, pagi_pb2_grpc  # noqa: E402
+from src import embed_and_upsert as eu  # noqa: E402
+
+
+class _FakeOrchestrator(pagi_pb2_grpc.PagiServicer):
+    def __init__(self) -> None:
+        self.last = None
+
+    def UpsertVectors(self, request, context):
+        self.last = request  # decoded after the timed loop; the real decode is in Rust
+        return pagi_pb2.UpsertResponse(success=True, upserted_count=len(request.points))
+
+
+def _decoded(request) -> np.ndarray:
+    return np.stack(
+        [
+            np.asarray(p.vector, dtype=np.float32) if len(p.vector) else eu.dequantize(p.quantized)
+            for p in request.points
+        ]
+    )
+
+
+def _start_server(servicer: _FakeOrchestrator) -> tuple[grpc.Server, int]:
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    pagi_pb2_grpc.add_PagiServicer_to_server(servicer, server)
+    port = server.add_insecure_port("[::1]:0")
+    server.start()
+    return server, port
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def main() -> None:
+    dim = int(os.environ.get("PAGI_BENCH_DIM", "384"))
+    n_points = int(os.environ.get("PAGI_BENCH_POINTS", "64"))
+    n_batches = int(os.environ.get("PAGI_BENCH_BATCHES", "100"))
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((n_points, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    payload = {"content": "x" * 200}
+    points = [(f"doc_chunk_{i}", v, payload) for i, v in enumerate(vectors)]
+
+    servicer = _FakeOrchestrator()
+    server, port = _start_server(servicer)
+    channel = grpc.insecure_channel(f"[::1]:{port}")
+    stub = eu.PagiKBStub(channel)  # sends the packed requests as built
+    print(f"points/request={n_points} dim={dim} batches={n_batches}")
+    try:
+        baseline = None
+        for enc in eu.VECTOR_ENCODINGS:
+            req = eu.upsert_request("kb_core", points, encoding=enc)
+            size = req.ByteSize()
+            stub.UpsertVectors(req)  # warm the channel outside the timed region
+            t0 = time.perf_counter()
+            for _ in range(n_batches):
+                stub.UpsertVectors(eu.upsert_request("kb_core", points, encoding=enc))
+            ms = (time.perf_counter() - t0) * 1000 / n_batches
+            fidelity = float(_cosine(vectors, _decoded(servicer.last)).mean())
+            baseline = baseline or size
+            print(
+                f"{enc:8s}  {size:10d} B/request ({size / baseline:5.2f}x)  "
+                f"{ms:8.3f} ms/batch  cosine={fidelity:.5f}"
+            )
+    finally:
+        channel.close()
+        server.stop(grace=None)
+
+
+if __name__ == "__main__":
+    main()
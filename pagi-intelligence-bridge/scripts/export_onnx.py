@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Export the bridge's SentenceTransformer to ONNX and quantize it to int8 for PAGI_EMBED_BACKEND=onnx.
+
+Writes into the output dir (default: models/<model>-onnx, what embed_backends looks for):
+- model.onnx        transformer graph (token embeddings; pooling/normalize run in numpy)
+- model_int8.onnx   dynamic int8 weight quantization of the above (loaded in preference)
+- tokenizer files and pagi_onnx.json (pooling mode, normalize, max_length, dim)
+
+Then prints cosine parity of the int8 model against torch on a few sentences; run
+scripts/bench_embed.py for the full parity + latency/throughput comparison.
+
+Needs the export-time extras (not bridge runtime deps): torch, onnx, onnxruntime.
+Targets BERT-style encoders (all-MiniLM-L6-v2 and friends) with mean or CLS pooling.
+
+Usage:
+  python scripts/export_onnx.py
+  python scripts/export_onnx.py --model all-MiniLM-L6-v2 --out models/all-MiniLM-L6-v2-onnx
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Ensure `src/` is importable when running from `scripts/`.
+_BRIDGE_ROOT = Path(__file__).resolve().parents[1]
+if str(_BRIDGE_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BRIDGE_ROOT))
+
+from src.embed_backends import ONNX_CONFIG_FILE, OnnxEmbeddingModel, cosine_parity, onnx_model_dir  # noqa: E402
+
+_SAMPLES = [
+    "balance summary transactions last 30 days",
+    "Recursive loop delegates complex queries to sub-calls with depth tracking.",
+    "heart rate 72 bpm, sleep 7.5 hours, steps 9000",
+    "def chunk_doc(file_path, chunk_size=1000): return list(iter_chunks(file_path))",
+]
+
+
+def _pipeline_config(model) -> dict:
+    from sentence_transformers.models import Normalize, Pooling
+
+    pooling = "mean"
+    normalize = False
+    for module in model:
+        if isinstance(module, Pooling):
+            pooling = "cls" if module.pooling_mode_cls_token else "mean"
+        if isinstance(module, Normalize):
+            normalize = True
+    return {
+        "pooling": pooling,
+        "normalize": normalize,
+        "max_length": int(model.max_seq_length),
+        "dim": int(model.get_sentence_embedding_dimension()),
+    }
+
+
+def export(model_name: str, out: Path, opset: int = 14) -> Path:
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    out.mkdir(parents=True, exist_ok=True)
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+
+    dummy = tokenizer(["warm-up export"], return_tensors="pt")
+    # BertModel.forward takes (input_ids, attention_mask, token_type_ids) positionally.
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+    dynamic_axes = {n: {0: "batch", 1: "seq"} for n in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "seq"}
+    fp32_path = out / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[n] for n in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    quantize_dynamic(str(fp32_path), str(out / "model_int8.onnx"), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(str(out))
+    config = {"model": model_name, **_pipeline_config(model)}
+    (out / ONNX_CONFIG_FILE).write_text(json.dumps(config, indent=2) + "\n", encoding="utf-8")
+
+    parity = cosine_parity(model.encode(_SAMPLES), OnnxEmbeddingModel(out).encode(_SAMPLES))
+    print(f"Exported {model_name} -> {out} ({config['dim']}-dim, {config['pooling']} pooling)")
+    print(f"int8 vs torch cosine: min={parity['min']:.5f} mean={parity['mean']:.5f}")
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export an int8 ONNX embedding model for PAGI_EMBED_BACKEND=onnx")
+    parser.add_argument("--model", default=os.environ.get("PAGI_EMBED_MODEL", "all-MiniLM-L6-v2"))
+    parser.add_argument("--out", default=None, help="Output dir (default PAGI_ONNX_MODEL_DIR or models/<model>-onnx)")
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+    export(args.model, Path(args.out) if args.out else onnx_model_dir(args.model), opset=args.opset)
+
+
+if __name__ == "__main__":
+    main()
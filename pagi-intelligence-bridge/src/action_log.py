@@ -0,0 +1,242 @@
+"""Non-blocking action log for the bridge (`recursive_loop._log_action`, self-heal reports, verbose stdout).
+
+Callers only enqueue a record (logging.handlers.QueueHandler); one QueueListener thread writes it,
+flushing once the queue runs dry or every `FLUSH_EVERY` records. Each record names its destinations:
+- `text_path`: the human-readable lines (EXECUTING:, OBSERVATION:, Self-heal reported ...) in the
+  file shared with the orchestrator (PAGI_AGENT_ACTIONS_LOG, PAGI_SELF_HEAL_LOG); format unchanged
+- `jsonl_path` (PAGI_ACTIONS_JSONL_LOG): one JSON object per record: ts, event, reasoning_id, skill,
+  duration_ms, ok, err, msg, ... Rotated by size (PAGI_ACTIONS_LOG_MAX_MB) or, when
+  PAGI_ACTIONS_LOG_ROTATE_WHEN is set (e.g. "midnight", "H"), by time; PAGI_ACTIONS_LOG_BACKUPS files
+  are kept, gzip-compressed with PAGI_ACTIONS_LOG_COMPRESS=true
+- `echo`: stdout (PAGI_VERBOSE_ACTIONS)
+Rotation knobs are read when a JSONL file is first opened.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Any
+
+FLUSH_EVERY = 256
+REOPEN_AFTER_S = 30.0  # a log path that failed to open is retried after this long
+
+
+class _DeferredFlush:
+    """Handler mixin: emit() leaves lines in the stream buffer; the listener flushes per batch."""
+
+    def flush(self) -> None:
+        pass
+
+    def flush_now(self) -> None:
+        super().flush()  # type: ignore[misc]
+
+
+class _TextFileHandler(_DeferredFlush, logging.FileHandler):
+    pass
+
+
+class _SizeRotatingHandler(_DeferredFlush, RotatingFileHandler):
+    pass
+
+
+class _TimeRotatingHandler(_DeferredFlush, TimedRotatingFileHandler):
+    pass
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as out:
+        shutil.copyfileobj(src, out)
+    os.remove(source)
+
+
+def _open_jsonl(path: str) -> logging.Handler:
+    backups = int(os.environ.get("PAGI_ACTIONS_LOG_BACKUPS", "5"))
+    when = os.environ.get("PAGI_ACTIONS_LOG_ROTATE_WHEN", "").strip()
+    if when:
+        handler: logging.Handler = _TimeRotatingHandler(path, when=when, backupCount=backups, encoding="utf-8", utc=True)
+    else:
+        max_bytes = int(float(os.environ.get("PAGI_ACTIONS_LOG_MAX_MB", "50")) * 1024 * 1024)
+        handler = _SizeRotatingHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    if os.environ.get("PAGI_ACTIONS_LOG_COMPRESS", "").strip().lower() in {"1", "true", "yes", "y", "on"}:
+        handler.namer = lambda name: name + ".gz"
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        doc: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "event": getattr(record, "event", "log"),
+            **getattr(record, "fields", {}),
+        }
+        msg = record.getMessage()
+        if msg:
+            doc["msg"] = msg
+        return json.dumps(doc, ensure_ascii=False, default=str)
+
+
+class _RoutedFiles(logging.Handler):
+    """Writes each record to the file named by its `attr` attribute (one handler per path, opened lazily)."""
+
+    def __init__(self, attr: str, open_file: Callable[[str], logging.Handler], formatter: logging.Formatter) -> None:
+        super().__init__()
+        self.attr = attr
+        self.open_file = open_file
+        self.setFormatter(formatter)
+        self._files: dict[str, logging.Handler] = {}
+        self._failed: dict[str, float] = {}  # path -> when opening it last failed
+
+    def emit(self, record: logging.LogRecord) -> None:
+        path = getattr(record, self.attr, None)
+        if not path:
+            return
+        try:
+            handler = self._files.get(path)
+            if handler is None:
+                if time.monotonic() - self._failed.get(path, -REOPEN_AFTER_S) < REOPEN_AFTER_S:
+                    return  # recently unopenable: drop instead of retrying per record
+                try:
+                    handler = self.open_file(path)
+                except Exception:
+                    self._failed[path] = time.monotonic()
+                    raise
+                self._failed.pop(path, None)
+                handler.setFormatter(self.formatter)
+                self._files[path] = handler
+            handler.handle(record)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        for handler in self._files.values():
+            if isinstance(handler, _DeferredFlush):
+                handler.flush_now()
+            else:
+                handler.flush()
+
+    def close(self) -> None:
+        for handler in self._files.values():
+            handler.close()
+        self._files.clear()
+        super().close()
+
+
+class _Stdout(logging.Handler):
+    """Echo to the current sys.stdout (resolved per record, so redirected stdout is honoured)."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if getattr(record, "echo", False):
+            sys.stdout.write(record.getMessage() + "\n")
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+
+
+class _BatchingListener(QueueListener):
+    def __init__(self, q: queue.SimpleQueue, *handlers: logging.Handler) -> None:
+        super().__init__(q, *handlers)
+        self._unflushed = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        done = getattr(record, "flush_event", None)
+        if done is None:
+            try:
+                super().handle(record)
+            except Exception:
+                pass  # a bad record must not end the only listener thread
+            self._unflushed += 1
+        if done is not None or self._unflushed >= FLUSH_EVERY or self.queue.empty():
+            self._unflushed = 0
+            for handler in self.handlers:
+                try:
+                    handler.flush()
+                except Exception:
+                    pass
+        if done is not None:
+            done.set()
+
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_logger = logging.getLogger("pagi.actions")
+_logger.setLevel(logging.INFO)
+_logger.propagate = False
+_logger.addHandler(QueueHandler(_queue))
+_listener: _BatchingListener | None = None
+_lock = threading.Lock()
+
+
+def _ensure_listener() -> None:
+    global _listener
+    if _listener is not None:
+        return
+    with _lock:
+        if _listener is None:
+            plain = logging.Formatter("%(message)s")
+            _listener = _BatchingListener(
+                _queue,
+                _RoutedFiles("text_path", lambda p: _TextFileHandler(p, encoding="utf-8"), plain),
+                _RoutedFiles("jsonl_path", _open_jsonl, JsonLineFormatter()),
+                _Stdout(),
+            )
+            _listener.start()
+
+
+def write_record(
+    line: str,
+    *,
+    event: str,
+    text_path: str | None = None,
+    jsonl_path: str | None = None,
+    echo: bool = False,
+    **fields: Any,
+) -> None:
+    """Enqueue one record: `line` goes to `text_path` (and stdout with `echo`), `event` + `fields` +
+    `line` to `jsonl_path`. An empty `line` is a JSONL-only record. Never blocks on I/O."""
+    text_path = text_path if line else None
+    if not (text_path or jsonl_path or (echo and line)):
+        return
+    _ensure_listener()
+    extra = {
+        "event": event,
+        "fields": {k: v for k, v in fields.items() if v is not None},
+        "text_path": text_path,
+        "jsonl_path": jsonl_path,
+        "echo": echo,
+    }
+    _logger.info("%s", line.rstrip(), extra=extra)
+
+
+def flush(timeout: float | None = 5.0) -> bool:
+    """Wait until every record enqueued so far is written and flushed; False on timeout."""
+    if _listener is None:
+        return True
+    done = threading.Event()
+    _logger.info("", extra={"flush_event": done})
+    return done.wait(timeout)
+
+
+def close() -> None:
+    """Write what is queued, then stop the listener and close files (shutdown; restarted on next record)."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(close)
@@ -0,0 +1,153 @@
+"""Session-scoped memoization of side-effect-free skill results (`recursive_loop._execute_action`).
+
+Key = (session, skill, canonical params, mock flag). Only skills declared in `IDEMPOTENT_SKILLS` are
+cached; each declaration names how the skill's result depends on the filesystem:
+- "file":  the file at params["path"] (or "file_path"), fingerprinted by (mtime_ns, size)
+- "dir":   the directory listing at params["path"]: the directory's own (mtime_ns, size)
+- "tree":  everything under params["path"] (down to params["max_depth"] for list_files_recursive):
+           (relpath, mtime_ns, size) of every entry, capped at TREE_MAX_ENTRIES (larger trees are not
+           cached). Hidden and `TREE_PRUNED_DIRS` directories (.git, node_modules, build output, ...)
+           count only by their own entry: a change deep inside them does not invalidate a result.
+           The skills themselves still walk them; this only keeps repo-root fingerprints affordable.
+- None:    a pure function of its params (analyze_code)
+A hit is served only while the stored fingerprint still matches; failed results are never stored.
+
+A session is one `ActionMemo` installed with `memo_session`: /rlm requests, /rlm-multi-turn sessions
+(all turns) and /ws/agent sessions each get their own, and child loops of a sub-query fan-out share
+their parent's.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Literal, Optional
+
+Dependency = Optional[Literal["file", "dir", "tree"]]
+
+IDEMPOTENT_SKILLS: dict[str, Dependency] = {
+    "peek_file": "file",
+    "read_entire_file_safe": "file",
+    "list_dir": "dir",
+    "list_files_recursive": "tree",
+    "search_codebase": "tree",
+    "analyze_code": None,
+}
+
+TREE_MAX_ENTRIES = 5000
+TREE_PRUNED_DIRS = frozenset({"node_modules", "__pycache__", "venv", "target"})  # besides hidden dirs
+_STALE = object()  # fingerprint could not be taken: do not cache
+
+
+def _stat_fingerprint(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None  # missing: cache the "not found" result until it appears
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _tree_fingerprint(root: Path, max_depth: int | None = None) -> Any:
+    if not root.is_dir():
+        return _stat_fingerprint(root)
+    digest = hashlib.sha256()
+    entries = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        if max_depth is not None:
+            rel = os.path.relpath(dirpath, root)
+            if (0 if rel == "." else rel.count(os.sep) + 1) >= max_depth:
+                dirnames.clear()
+                continue
+        names = dirnames + filenames
+        # Not descended into, but still stat'ed below: adding or removing their direct entries counts.
+        dirnames[:] = [d for d in dirnames if not (d.startswith(".") or d in TREE_PRUNED_DIRS)]
+        for name in names:
+            entries += 1
+            if entries > TREE_MAX_ENTRIES:
+                return _STALE
+            full = os.path.join(dirpath, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(full, root)}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8", "replace"))
+    return digest.hexdigest()
+
+
+def fingerprint(skill: str, params: dict[str, Any]) -> Any:
+    """Current fingerprint of what `skill` reads, or `_STALE` when it cannot be cached."""
+    dependency = IDEMPOTENT_SKILLS[skill]
+    if dependency is None:
+        return None
+    path = Path(str(params.get("path") or params.get("file_path") or ".")).resolve()
+    if dependency == "tree":
+        max_depth = params.get("max_depth", 3) if skill == "list_files_recursive" else None
+        try:
+            return _tree_fingerprint(path, None if max_depth is None else int(max_depth))
+        except (TypeError, ValueError):
+            return _STALE
+    return _stat_fingerprint(path)
+
+
+def memo_key(skill: str, params: dict[str, Any], mock_mode: bool) -> str:
+    blob = json.dumps([skill, params, mock_mode], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ActionMemo:
+    """Results of one reasoning session, LRU-bounded by `max_entries`."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[Any, tuple[str, bool, str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, skill: str, params: dict[str, Any], mock_mode: bool) -> tuple[str, Any, tuple[str, bool, str] | None]:
+        """(key, current fingerprint, cached result or None). Pass key and fingerprint on to `store`."""
+        key = memo_key(skill, params, mock_mode)
+        current = fingerprint(skill, params)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and current is not _STALE and entry[0] == current:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return key, current, entry[1]
+            self.misses += 1
+        return key, current, None
+
+    def store(self, key: str, current: Any, result: tuple[str, bool, str]) -> None:
+        # `current` was taken before the skill ran, so a change made meanwhile invalidates the entry.
+        if current is _STALE or not result[1]:
+            return
+        with self._lock:
+            self._data[key] = (current, result)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+_session: ContextVar[ActionMemo | None] = ContextVar("pagi_action_memo", default=None)
+
+
+def current_memo() -> ActionMemo | None:
+    return _session.get()
+
+
+@contextmanager
+def memo_session(memo: ActionMemo | None = None) -> Iterator[ActionMemo]:
+    """Install `memo` (a new one by default) for actions executed in this context."""
+    memo = memo if memo is not None else ActionMemo()
+    token = _session.set(memo)
+    try:
+        yield memo
+    finally:
+        _session.reset(token)
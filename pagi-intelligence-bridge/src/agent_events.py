@@ -0,0 +1,58 @@
+"""Live AgentEvent emission for /ws/agent (docs/Boilerplate-Contract.md §3, contract/types.ts AgentEvent).
+
+recursive_loop calls `emit_event` at its reasoning points (thought, action_planned/_started/_completed,
+search_issued, converged, error). Events go to the sink installed by `agent_event_sink` for the current
+context, so a WebSocket session only sees its own loop; without a sink `emit_event` is a no-op and the
+HTTP routes pay nothing. The sink may be called from worker threads (asyncio.to_thread copies the
+context): the /ws/agent sink hands events to its event loop with call_soon_threadsafe.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+# Align with contract/types.ts AgentEventKind (and mock_provider.AGENT_EVENT_KINDS).
+AGENT_EVENT_KINDS = frozenset({
+    "session_started", "thought", "action_planned", "action_started", "action_completed",
+    "memory_read", "memory_written", "search_issued", "search_result", "converged",
+    "error", "session_ended",
+})
+
+AgentEventSink = Callable[[dict[str, Any]], None]
+
+_sink: ContextVar[AgentEventSink | None] = ContextVar("pagi_agent_event_sink", default=None)
+
+
+def agent_event(event: str, payload: dict[str, Any], reasoning_id: str | None = None) -> dict[str, Any]:
+    """Contract AgentEvent message: `event`, ISO `timestamp`, optional `reasoning_id`, kind fields."""
+    if event not in AGENT_EVENT_KINDS:
+        raise ValueError(f"unknown agent event kind: {event}")
+    msg = {"event": event, "timestamp": datetime.now(timezone.utc).isoformat(), **payload}
+    if reasoning_id:
+        msg["reasoning_id"] = reasoning_id
+    return msg
+
+
+def emit_event(event: str, payload: dict[str, Any], reasoning_id: str | None = None) -> None:
+    """Send an AgentEvent to the current sink; a failing sink never breaks the loop."""
+    sink = _sink.get()
+    if sink is None:
+        return
+    try:
+        sink(agent_event(event, payload, reasoning_id))
+    except Exception:
+        pass
+
+
+@contextmanager
+def agent_event_sink(sink: AgentEventSink) -> Iterator[None]:
+    """Route `emit_event` calls made in this context (and tasks/threads it starts) to `sink`."""
+    token = _sink.set(sink)
+    try:
+        yield
+    finally:
+        _sink.reset(token)
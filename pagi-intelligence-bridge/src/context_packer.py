@@ -0,0 +1,99 @@
+"""Token-budgeted context packing for RLM prompts (replaces the PAGI_MULTI_TURN_CONTEXT_MAX_CHARS tail cut).
+
+`context` accumulates records: the caller's initial context, turn summaries (`Summary:`), and
+observation-like records (`Observation:`, `Peeked:`, `Sub-summary:`, `Sub-error:`) whose continuation
+lines belong to them. `pack_context` trims each observation-like record to an `obs_max_tokens` head,
+then keeps whole records newest-first until the budget is spent; the stale records it drops are
+replaced by one omission line. Tokens are counted with the target model's tokenizer via
+litellm.token_counter, else estimated at ~4 characters per token.
+"""
+
+from __future__ import annotations
+
+try:
+    import litellm
+except ImportError:
+    litellm = None
+
+SUMMARY_PREFIX = "Summary:"
+OBSERVATION_PREFIXES = ("Observation:", "Peeked:", "Sub-summary:", "Sub-error:")
+RECORD_PREFIXES = (SUMMARY_PREFIX, *OBSERVATION_PREFIXES)
+TRUNCATED_MARKER = " …[truncated]"
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    if not text:
+        return 0
+    if litellm is not None:
+        try:
+            return int(litellm.token_counter(model=model or "", text=text))
+        except Exception:
+            pass
+    return -(-len(text) // 4)
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str | None = None) -> str:
+    """Head of `text` plus a truncation marker, within `max_tokens` ("" if even the marker does not fit).
+
+    The longest fitting head is found by bisection on its length: O(log n) token counts.
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    lo, hi = 0, len(text) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid].rstrip() + TRUNCATED_MARKER, model) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    head = text[:lo].rstrip()
+    return head + TRUNCATED_MARKER if head else ""
+
+
+def split_records(context: str) -> list[str]:
+    """Split on lines starting with a record prefix; other lines continue the current record."""
+    records: list[str] = []
+    for line in context.split("\n"):
+        if records and not line.startswith(RECORD_PREFIXES):
+            records[-1] += "\n" + line
+        else:
+            records.append(line)
+    return [r for r in records if r.strip()]
+
+
+def pack_context(context: str, budget_tokens: int, model: str | None = None, obs_max_tokens: int = 512) -> str:
+    """Fit `context` into `budget_tokens`, preferring the newest records and trimmed observations."""
+    if count_tokens(context, model) <= budget_tokens:
+        return context
+    records = split_records(context)
+    kept: list[str] = []
+    remaining = budget_tokens
+    omitted = 0
+    for i in range(len(records) - 1, -1, -1):
+        record = records[i]
+        if record.startswith(OBSERVATION_PREFIXES):
+            record = truncate_tokens(record, obs_max_tokens, model)
+        cost = count_tokens(record, model) + 1  # joining newline
+        if cost > remaining:
+            if not kept:  # the newest record alone is over budget: keep its head
+                record = truncate_tokens(record, remaining - 1, model)
+                if record:
+                    kept.append(record)
+                    i -= 1
+            omitted = i + 1
+            break
+        kept.append(record)
+        remaining -= cost
+    if omitted:
+        while True:
+            marker = f"[{omitted} earlier context records omitted]"
+            used = sum(count_tokens(r, model) + 1 for r in kept) + count_tokens(marker, model)
+            if used <= budget_tokens or not kept:
+                break
+            kept.pop()  # the oldest kept record makes room for the marker
+            omitted += 1
+        if count_tokens(marker, model) <= budget_tokens:
+            kept.append(marker)
+    return "\n".join(reversed(kept))
@@ -2,17 +2,43 @@
 """Embed documents with Sentence Transformers and upsert to L4 via gRPC (MemoryManager).
 
 Bootstrap kb_core with generic docs (e.g. ARCHITECTURE.md, README.md). Chunks < 10k chars;
-vectors padded to PAGI_EMBEDDING_DIM (default 1536) for collection compatibility.
+vectors padded to PAGI_EMBEDDING_DIM (default 1536) for collection compatibility, or sent at the
+model's own size with PAGI_EMBEDDING_DIM=native. Vectors stay float32 numpy end to end and go on
+the wire as raw buffers (packed request views in pagi.proto), never as per-element Python floats.
+Compact transport: PAGI_VECTOR_ENCODING / --encoding float16 (2 B/dim) or int8 (1 B/dim + scale/offset)
+sends QuantizedVector instead of float32; the orchestrator decodes before storage/search.
+Streaming: chunks are read through a bounded buffer and embedded/upserted in fixed-size batches.
+Parallel: several files/dirs/globs are chunked on threads and embedded on a process pool (model
+loaded once per worker) with bounded concurrent upserts; a chunks/s and MB/s report ends the run.
+Incremental: a local manifest (PAGI_KB_MANIFEST, default .kb_manifest.json) records a content hash per
+(kb, doc, chunk); unchanged chunks are skipped, changed ones re-embedded, removed ones reported.
 Search mode: embed query → SemanticSearch with query_vector for end-to-end L4 verification.
+Backend: PAGI_EMBED_BACKEND=torch (default) or onnx (int8 export from scripts/export_onnx.py).
 Usage:
   poetry run python src/embed_and_upsert.py --doc path/to/doc.md --kb kb_core
+  poetry run python src/embed_and_upsert.py --doc path/to/doc.md --kb kb_core --full
+  poetry run python src/embed_and_upsert.py --doc big.log --kb kb_core --overlap 100 --batch-size 128
+  poetry run python src/embed_and_upsert.py --doc ../docs '../**/*.md' --kb kb_core --workers 8
   poetry run python src/embed_and_upsert.py --search "hierarchy" --kb kb_core --limit 5
 """
 
 import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
 import os
 import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
+
+import numpy as np
 
 # Generated stubs live in pagi_pb/ and grpc file does "import pagi_pb2"; add pagi_pb dir to path.
 _pagi_pb_dir = Path(__file__).resolve().parent / "pagi_pb"
@@ -22,9 +48,20 @@ if str(_pagi_pb_dir) not in sys.path:
 import pagi_pb2
 import pagi_pb2_grpc
 
+try:
+    from .embed_backends import load_embed_model
+    from .grpc_client import sync_channel
+except ImportError:  # run as a script: src/ is sys.path[0]
+    from embed_backends import load_embed_model
+    from grpc_client import sync_channel
+
 
-def _embedding_dim() -> int:
-    return int(os.environ.get("PAGI_EMBEDDING_DIM", "1536"))
+def _embedding_dim() -> int | None:
+    """Target vector size from PAGI_EMBEDDING_DIM (default 1536); None for `native` (model's own size)."""
+    raw = os.environ.get("PAGI_EMBEDDING_DIM", "1536").strip().lower()
+    if raw in ("native", "0"):
+        return None
+    return int(raw)
 
 
 def _grpc_addr() -> str:
@@ -32,14 +69,132 @@ def _grpc_addr() -> str:
     return f"[::1]:{port}"
 
 
-def embed_text(text: str, model) -> list[float]:
-    vec = model.encode(text).tolist()
-    dim = _embedding_dim()
-    if len(vec) < dim:
-        vec = vec + [0.0] * (dim - len(vec))
-    elif len(vec) > dim:
-        vec = vec[:dim]
-    return vec
+def fit_dim(vec: Any, dim: int | None) -> np.ndarray:
+    """float32 view of a vector (or row matrix) zero-padded/truncated to `dim`; None keeps it as is."""
+    arr = np.asarray(vec, dtype=np.float32)
+    n = arr.shape[-1]
+    if dim is None or n == dim:
+        return arr
+    if n > dim:
+        return arr[..., :dim]
+    out = np.zeros(arr.shape[:-1] + (dim,), dtype=np.float32)
+    out[..., :n] = arr
+    return out
+
+
+def _f32_bytes(vec: Any) -> bytes:
+    # Little-endian float32 is the wire encoding of a packed `repeated float`.
+    return np.ascontiguousarray(vec, dtype="<f4").tobytes()
+
+
+VECTOR_ENCODINGS = ("float32", "float16", "int8")
+
+
+def _vector_encoding(encoding: str | None = None) -> str:
+    """Wire encoding for vectors: `encoding`, else PAGI_VECTOR_ENCODING (default float32)."""
+    enc = (encoding or os.environ.get("PAGI_VECTOR_ENCODING", "float32")).strip().lower()
+    if enc not in VECTOR_ENCODINGS:
+        raise ValueError(f"Unknown vector encoding {enc!r}; expected one of {', '.join(VECTOR_ENCODINGS)}")
+    return enc
+
+
+def quantize(vec: Any, encoding: str) -> "pagi_pb2.QuantizedVector":
+    """Compact one vector: float16 halves, or int8 codes with value = code * scale + offset."""
+    arr = np.asarray(vec, dtype=np.float32)
+    if encoding == "float16":
+        return pagi_pb2.QuantizedVector(
+            encoding=pagi_pb2.VECTOR_ENCODING_FLOAT16, data=arr.astype("<f2").tobytes()
+        )
+    if encoding == "int8":
+        lo, hi = (float(arr.min()), float(arr.max())) if arr.size else (0.0, 0.0)
+        # Symmetric codes in [-127, 127] around the midpoint; scale/offset are float32 on the wire.
+        offset = np.float32((hi + lo) / 2)
+        scale = np.float32((hi - lo) / 254) or np.float32(1.0)
+        codes = np.clip(np.rint((arr - offset) / scale), -127, 127).astype(np.int8)
+        return pagi_pb2.QuantizedVector(
+            encoding=pagi_pb2.VECTOR_ENCODING_INT8, data=codes.tobytes(), scale=scale, offset=offset
+        )
+    raise ValueError(f"Not a quantized encoding: {encoding!r}")
+
+
+def dequantize(q: "pagi_pb2.QuantizedVector") -> np.ndarray:
+    """Inverse of `quantize` (mirrors the orchestrator's decode in memory_manager.rs)."""
+    if q.encoding == pagi_pb2.VECTOR_ENCODING_FLOAT16:
+        return np.frombuffer(q.data, dtype="<f2").astype(np.float32)
+    if q.encoding == pagi_pb2.VECTOR_ENCODING_INT8:
+        codes = np.frombuffer(q.data, dtype=np.int8).astype(np.float32)
+        return codes * np.float32(q.scale) + np.float32(q.offset)
+    raise ValueError(f"Unsupported QuantizedVector encoding {q.encoding}")
+
+
+def upsert_request(
+    kb_name: str,
+    points: Iterable[tuple[str, Any, dict[str, str]]],
+    encoding: str | None = None,
+) -> "pagi_pb2.UpsertRequestPacked":
+    """UpsertRequest wire bytes for (id, vector, payload) triples, as the packed view: send it through
+    a `PagiKBStub` (it serializes to exactly the UpsertRequest the orchestrator decodes)."""
+    enc = _vector_encoding(encoding)
+    packed = pagi_pb2.UpsertRequestPacked(kb_name=kb_name)
+    for point_id, vector, payload in points:
+        vec = np.asarray(vector, dtype=np.float32)
+        packed.embedding_dim = vec.shape[-1]
+        if enc == "float32":
+            packed.points.add(id=point_id, vector=_f32_bytes(vec), payload=payload)
+        else:
+            packed.points.add(id=point_id, quantized=quantize(vec, enc), payload=payload)
+    return packed
+
+
+def search_request(
+    query: str,
+    kb_name: str,
+    limit: int,
+    query_vector: Any,
+    encoding: str | None = None,
+) -> "pagi_pb2.SearchRequestPacked":
+    """SearchRequest wire bytes carrying `query_vector`, as the packed view (send via `PagiKBStub`)."""
+    enc = _vector_encoding(encoding)
+    vec = np.asarray(query_vector, dtype=np.float32)
+    packed = pagi_pb2.SearchRequestPacked(query=query, kb_name=kb_name, limit=limit, embedding_dim=vec.shape[-1])
+    if enc == "float32":
+        packed.query_vector = _f32_bytes(vec)
+    else:
+        packed.quantized_query.CopyFrom(quantize(vec, enc))
+    return packed
+
+
+def _serialize(message: Any) -> bytes:
+    return message.SerializeToString()
+
+
+class PagiKBStub(pagi_pb2_grpc.PagiStub):
+    """PagiStub whose UpsertVectors / SemanticSearch send whatever message they are given as its own
+    bytes, so the packed requests above go out without a decode into repeated floats and re-encode.
+    Plain UpsertRequest / SearchRequest messages work too. Sync and aio channels alike.
+    """
+
+    def __init__(self, channel: Any) -> None:
+        super().__init__(channel)
+        self.UpsertVectors = channel.unary_unary(
+            "/pagi.Pagi/UpsertVectors",
+            request_serializer=_serialize,
+            response_deserializer=pagi_pb2.UpsertResponse.FromString,
+        )
+        self.SemanticSearch = channel.unary_unary(
+            "/pagi.Pagi/SemanticSearch",
+            request_serializer=_serialize,
+            response_deserializer=pagi_pb2.SearchResponse.FromString,
+        )
+
+
+def embed_text(text: str, model) -> np.ndarray:
+    return fit_dim(model.encode(text), _embedding_dim())
+
+
+def embed_texts(texts: list[str], model) -> np.ndarray:
+    """Embed a batch in one forward pass (indexing path); returns a (len(texts), dim) float32 matrix."""
+    return fit_dim(model.encode(texts, batch_size=len(texts)), _embedding_dim())
 
 
 def search_kb(
@@ -48,37 +203,247 @@ def search_kb(
     limit: int = 5,
     grpc_addr: str | None = None,
     model_name: str | None = None,
+    encoding: str | None = None,
 ):
     """Embed query, call SemanticSearch with query_vector, return hits (for L4 demo)."""
-    import grpc
-    from sentence_transformers import SentenceTransformer
-
     grpc_addr = grpc_addr or _grpc_addr()
     model_name = model_name or os.environ.get("PAGI_EMBED_MODEL", "all-MiniLM-L6-v2")
-    model = SentenceTransformer(model_name)
+    model = _load_model(model_name)
     vector = embed_text(query, model)
 
-    channel = grpc.insecure_channel(grpc_addr)
-    stub = pagi_pb2_grpc.PagiStub(channel)
-    req = pagi_pb2.SearchRequest(
-        query=query,
-        kb_name=kb_name,
-        limit=min(max(limit, 1), 100),
-        query_vector=vector,
-    )
+    stub = PagiKBStub(sync_channel(grpc_addr))
+    req = search_request(query, kb_name, min(max(limit, 1), 100), vector, encoding=encoding)
     response = stub.SemanticSearch(req)
     return response.hits
 
 
-def chunk_doc(file_path: str | Path, chunk_size: int = 1000) -> list[str]:
+def iter_chunks(
+    file_path: str | Path,
+    chunk_size: int = 1000,
+    overlap: int = 0,
+    read_chars: int = 1 << 20,
+) -> Iterator[str]:
+    """Stream `chunk_size`-char chunks; each starts `overlap` chars before the previous one ended.
+
+    Reads through a buffered text reader `read_chars` characters at a time, so memory is bounded by
+    one read block plus one chunk regardless of file size. Decoding is incremental (a multi-byte
+    UTF-8 sequence split across reads is never cut), with the same newline/replace semantics as
+    `read_text(errors="replace")`.
+    """
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"Doc not found: {path}")
-    text = path.read_text(encoding="utf-8", errors="replace")
-    return [
-        text[i : i + chunk_size]
-        for i in range(0, len(text), chunk_size)
-    ]
+    if chunk_size <= 0 or not 0 <= overlap < chunk_size:
+        raise ValueError("chunk_size must be > 0 and 0 <= overlap < chunk_size")
+    step = chunk_size - overlap
+    buf = ""
+    emitted = False
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            block = f.read(max(read_chars, chunk_size))
+            if not block:
+                break
+            buf += block
+            start = 0
+            while len(buf) - start >= chunk_size:
+                yield buf[start : start + chunk_size]
+                emitted = True
+                start += step
+            buf = buf[start:]
+    # Tail: skip when it is only the overlap already carried by the previous chunk.
+    if buf and not (emitted and len(buf) <= overlap):
+        yield buf
+
+
+def chunk_doc(file_path: str | Path, chunk_size: int = 1000, overlap: int = 0) -> list[str]:
+    return list(iter_chunks(file_path, chunk_size=chunk_size, overlap=overlap))
+
+
+def _manifest_path() -> Path:
+    return Path(os.environ.get("PAGI_KB_MANIFEST", ".kb_manifest.json"))
+
+
+def load_manifest(path: str | Path) -> dict:
+    """Load {kb_name: {doc: {"model", "dim", "chunk_size", "chunks": {idx: sha256}}}}; empty if missing/corrupt."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: str | Path, manifest: dict) -> None:
+    """Write atomically (tmp + replace) so an interrupted run never leaves a truncated manifest."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _chunk_hash(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+def _load_model(model_name: str):
+    """Embedding model for PAGI_EMBED_BACKEND (torch SentenceTransformer by default, or ONNX int8)."""
+    return load_embed_model(model_name)
+
+
+def _make_stub(grpc_addr: str):
+    return PagiKBStub(sync_channel(grpc_addr))
+
+
+def _completed(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run inline and wrap the outcome in a Future (in-process embed path)."""
+    fut: Future = Future()
+    try:
+        fut.set_result(fn(*args))
+    except BaseException as e:
+        fut.set_exception(e)
+    return fut
+
+
+@dataclass
+class IndexReport:
+    """Outcome of one incremental index run for a single document."""
+
+    response: Any  # pagi_pb2.UpsertResponse (synthesized success when nothing changed)
+    total_chunks: int = 0
+    upserted: int = 0
+    skipped: int = 0
+    removed: list[str] = field(default_factory=list)  # point ids no longer produced by the doc
+    bytes_read: int = 0
+
+
+def _index_doc(
+    kb_name: str,
+    doc_path: str | Path,
+    doc_id: str,
+    prev: dict,
+    *,
+    model_name: str,
+    chunk_size: int,
+    overlap: int,
+    batch_size: int,
+    full: bool,
+    embed_submit: Callable[[list[str]], Future],
+    get_stub: Callable[[], Any],
+    upsert_slots: threading.Semaphore,
+    embed_slots: threading.Semaphore,
+    encoding: str | None = None,
+) -> tuple[IndexReport, dict | None]:
+    """Stream one doc through hash → embed → upsert; return its report and new manifest entry.
+
+    `embed_slots` bounds embed batches outstanding (submitted, not yet sent) and `upsert_slots`
+    UpsertVectors calls in flight; both are shared across docs, so memory stays bounded by those counts.
+    """
+    batch_size = max(1, batch_size)
+    # A different model/dim/chunking invalidates every stored vector for the doc.
+    same_layout = (
+        prev.get("model") == model_name
+        and prev.get("dim") == _embedding_dim()
+        and prev.get("chunk_size") == chunk_size
+        and prev.get("overlap", 0) == overlap
+    )
+    prev_chunks: dict[str, str] = prev.get("chunks", {}) if (same_layout and not full) else {}
+
+    hashes: dict[str, str] = {}
+    batch: list[tuple[int, str]] = []
+    pending: deque[tuple[list[tuple[int, str]], Future]] = deque()
+    upserts: list[Future] = []
+    changed = 0
+
+    def _send(items: list[tuple[int, str]], vectors: np.ndarray) -> None:
+        req = upsert_request(
+            kb_name,
+            (
+                (
+                    f"{doc_id}_chunk_{idx}",
+                    vector,
+                    {"content": (chunk[:500] + "…") if len(chunk) > 500 else chunk},
+                )
+                for (idx, chunk), vector in zip(items, vectors)
+            ),
+            encoding=encoding,
+        )
+        upsert_slots.acquire()
+        try:
+            fut = get_stub().UpsertVectors.future(req)
+        except BaseException:
+            upsert_slots.release()
+            raise
+        fut.add_done_callback(lambda _f: upsert_slots.release())
+        upserts.append(fut)
+
+    def _drain_one() -> None:
+        items, fut = pending.popleft()
+        try:
+            vectors = fut.result()
+        finally:
+            embed_slots.release()
+        _send(items, vectors)
+
+    def _embed(items: list[tuple[int, str]]) -> None:
+        # Only wait for a slot holding none: otherwise free one by sending this doc's oldest batch,
+        # so docs never wait on each other's slots.
+        while not embed_slots.acquire(blocking=not pending):
+            _drain_one()
+        try:
+            fut = embed_submit([c for _, c in items])
+        except BaseException:
+            embed_slots.release()
+            raise
+        pending.append((items, fut))
+
+    try:
+        for idx, chunk in enumerate(iter_chunks(doc_path, chunk_size=chunk_size, overlap=overlap)):
+            h = _chunk_hash(chunk)
+            hashes[str(idx)] = h
+            if prev_chunks.get(str(idx)) == h:
+                continue
+            batch.append((idx, chunk))
+            changed += 1
+            if len(batch) >= batch_size:
+                _embed(batch)
+                batch = []
+        if batch:
+            _embed(batch)
+        while pending:
+            _drain_one()
+    finally:
+        for _ in pending:  # failed mid-doc: give the other docs their slots back
+            embed_slots.release()
+
+    success = True
+    upserted_count = 0
+    for fut in upserts:
+        resp = fut.result()
+        success = success and resp.success
+        upserted_count += resp.upserted_count
+
+    total = len(hashes)
+    removed = sorted(
+        (f"{doc_id}_chunk_{i}" for i in (prev.get("chunks") or {}) if int(i) >= total),
+        key=lambda pid: int(pid.rsplit("_", 1)[1]),
+    )
+    report = IndexReport(
+        response=pagi_pb2.UpsertResponse(success=success, upserted_count=upserted_count),
+        total_chunks=total,
+        upserted=changed,
+        skipped=total - changed,
+        removed=removed,
+        bytes_read=Path(doc_path).stat().st_size,
+    )
+    entry = None
+    if success:
+        entry = {
+            "model": model_name,
+            "dim": _embedding_dim(),
+            "chunk_size": chunk_size,
+            "overlap": overlap,
+            "chunks": hashes,
+        }
+    return report, entry
 
 
 def upsert_to_kb(
@@ -87,50 +452,268 @@ def upsert_to_kb(
     grpc_addr: str | None = None,
     chunk_size: int = 1000,
     model_name: str | None = None,
-):
-    import grpc
-    from sentence_transformers import SentenceTransformer
+    manifest_path: str | Path | None = None,
+    full: bool = False,
+    overlap: int = 0,
+    batch_size: int = 64,
+    encoding: str | None = None,
+) -> IndexReport:
+    """Stream chunks → embed `batch_size` at a time → upsert each batch while the next one embeds.
 
+    At most one UpsertVectors call is in flight, so peak memory is ~two batches of points and no
+    single request approaches the gRPC message limit, however large the document.
+    """
     grpc_addr = grpc_addr or _grpc_addr()
     model_name = model_name or os.environ.get("PAGI_EMBED_MODEL", "all-MiniLM-L6-v2")
-    model = SentenceTransformer(model_name)
-
-    channel = grpc.insecure_channel(grpc_addr)
-    stub = pagi_pb2_grpc.PagiStub(channel)
-    chunks = chunk_doc(doc_path, chunk_size=chunk_size)
-    doc_basename = Path(doc_path).name
-
-    points = []
-    for idx, chunk in enumerate(chunks):
-        vector = embed_text(chunk, model)
-        snippet = (chunk[:500] + "…") if len(chunk) > 500 else chunk
-        point = pagi_pb2.VectorPoint(
-            id=f"{doc_basename}_chunk_{idx}",
-            vector=vector,
-            payload={"content": snippet},
+    manifest_path = Path(manifest_path) if manifest_path is not None else _manifest_path()
+    doc_id = Path(doc_path).name
+    # Model and channel are created on first changed batch only (nothing to do -> no load).
+    lazy: dict[str, Any] = {}
+
+    def embed_submit(texts: list[str]) -> Future:
+        if "model" not in lazy:
+            lazy["model"] = _load_model(model_name)
+        return _completed(embed_texts, texts, lazy["model"])
+
+    def get_stub():
+        if "stub" not in lazy:
+            lazy["stub"] = _make_stub(grpc_addr)
+        return lazy["stub"]
+
+    manifest = load_manifest(manifest_path)
+    report, entry = _index_doc(
+        kb_name,
+        doc_path,
+        doc_id,
+        manifest.get(kb_name, {}).get(doc_id) or {},
+        model_name=model_name,
+        chunk_size=chunk_size,
+        overlap=overlap,
+        batch_size=batch_size,
+        full=full,
+        embed_submit=embed_submit,
+        get_stub=get_stub,
+        upsert_slots=threading.Semaphore(1),
+        embed_slots=threading.Semaphore(1),
+        encoding=encoding,
+    )
+    if entry is not None:
+        manifest.setdefault(kb_name, {})[doc_id] = entry
+        save_manifest(manifest_path, manifest)
+    return report
+
+
+def expand_docs(specs: list[str], pattern: str = "*") -> list[tuple[Path, str]]:
+    """Resolve files, directories (recursive, `pattern`) and globs to (path, doc_id) pairs.
+
+    doc_id is the point-id prefix and manifest key: the basename for a file given directly (stable
+    with earlier single-doc runs), the path relative to the directory for directory members, and the
+    matched path for glob results. Hidden directories (e.g. .git) are skipped.
+    """
+    out: dict[Path, tuple[Path, str]] = {}
+    for spec in specs:
+        p = Path(spec)
+        if p.is_file():
+            out.setdefault(p.resolve(), (p, p.name))
+        elif p.is_dir():
+            for f in sorted(p.rglob(pattern)):
+                rel = f.relative_to(p)
+                if f.is_file() and not any(part.startswith(".") for part in rel.parts[:-1]):
+                    out.setdefault(f.resolve(), (f, rel.as_posix()))
+        else:
+            for m in sorted(glob.glob(spec, recursive=True)):
+                f = Path(m)
+                if f.is_file():
+                    out.setdefault(f.resolve(), (f, f.as_posix()))
+    return list(out.values())
+
+
+_worker_model = None
+
+
+def _worker_init(torch_threads: int) -> None:
+    # One process per core: keep torch from oversubscribing cores inside each worker.
+    try:
+        import torch
+
+        torch.set_num_threads(max(1, torch_threads))
+    except ImportError:
+        pass
+
+
+def _worker_embed(model_name: str, texts: list[str]) -> np.ndarray:
+    """Process-pool task: model loads once per worker process, then is reused for every batch."""
+    global _worker_model
+    if _worker_model is None:
+        _worker_model = _load_model(model_name)
+    return embed_texts(texts, _worker_model)
+
+
+@dataclass
+class IndexRunReport:
+    """Aggregate of a multi-document run (throughput report for the CLI)."""
+
+    docs: dict[str, IndexReport] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def total_chunks(self) -> int:
+        return sum(r.total_chunks for r in self.docs.values())
+
+    @property
+    def embedded(self) -> int:
+        return sum(r.upserted for r in self.docs.values())
+
+    @property
+    def bytes_read(self) -> int:
+        return sum(r.bytes_read for r in self.docs.values())
+
+    def throughput(self) -> tuple[float, float]:
+        """(chunks/sec, MB/sec) over the whole run."""
+        if self.elapsed <= 0:
+            return (0.0, 0.0)
+        return (self.total_chunks / self.elapsed, self.bytes_read / (1024 * 1024) / self.elapsed)
+
+
+def index_paths(
+    kb_name: str,
+    specs: list[str],
+    grpc_addr: str | None = None,
+    chunk_size: int = 1000,
+    model_name: str | None = None,
+    manifest_path: str | Path | None = None,
+    full: bool = False,
+    overlap: int = 0,
+    batch_size: int = 64,
+    workers: int | None = None,
+    max_in_flight: int = 4,
+    pattern: str = "*",
+    encoding: str | None = None,
+) -> IndexRunReport:
+    """Index many docs: parallel read/chunk threads, embedding on a process pool, bounded upserts.
+
+    `workers` defaults to min(cores, docs); with 1 worker the model runs in-process. One shared
+    channel carries all upserts; at most `max_in_flight` UpsertVectors calls are outstanding, and
+    at most max(workers, max_in_flight) embed batches across all docs (enough to keep every worker
+    busy and every upsert slot fed).
+    """
+    grpc_addr = grpc_addr or _grpc_addr()
+    model_name = model_name or os.environ.get("PAGI_EMBED_MODEL", "all-MiniLM-L6-v2")
+    manifest_path = Path(manifest_path) if manifest_path is not None else _manifest_path()
+    docs = expand_docs(specs, pattern=pattern)
+    cores = os.cpu_count() or 1
+    workers = workers if workers is not None else min(cores, max(1, len(docs)))
+
+    run = IndexRunReport()
+    manifest = load_manifest(manifest_path)
+    kb_manifest = manifest.setdefault(kb_name, {})
+    manifest_lock = threading.Lock()
+    upsert_slots = threading.Semaphore(max(1, max_in_flight))
+    embed_slots = threading.Semaphore(max(1, workers, max_in_flight))
+    stub_lock = threading.Lock()
+    lazy: dict[str, Any] = {}
+
+    def get_stub():
+        with stub_lock:
+            if "stub" not in lazy:
+                lazy["stub"] = _make_stub(grpc_addr)
+            return lazy["stub"]
+
+    pool: ProcessPoolExecutor | None = None
+    if workers > 1:
+        # spawn: never fork a process that may already hold a live gRPC channel.
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+            initargs=(max(1, cores // workers),),
         )
-        points.append(point)
 
-    req = pagi_pb2.UpsertRequest(kb_name=kb_name, points=points)
-    response = stub.UpsertVectors(req)
-    return response
+        def embed_submit(texts: list[str]) -> Future:
+            return pool.submit(_worker_embed, model_name, texts)
+    else:
+        model_lock = threading.Lock()
+
+        def embed_submit(texts: list[str]) -> Future:
+            with model_lock:
+                if "model" not in lazy:
+                    lazy["model"] = _load_model(model_name)
+                return _completed(embed_texts, texts, lazy["model"])
+
+    def _one(doc: tuple[Path, str]) -> tuple[str, IndexReport]:
+        path, doc_id = doc
+        with manifest_lock:
+            prev = dict(kb_manifest.get(doc_id) or {})
+        report, entry = _index_doc(
+            kb_name,
+            path,
+            doc_id,
+            prev,
+            model_name=model_name,
+            chunk_size=chunk_size,
+            overlap=overlap,
+            batch_size=batch_size,
+            full=full,
+            embed_submit=embed_submit,
+            get_stub=get_stub,
+            upsert_slots=upsert_slots,
+            embed_slots=embed_slots,
+            encoding=encoding,
+        )
+        if entry is not None:
+            with manifest_lock:
+                kb_manifest[doc_id] = entry
+        return doc_id, report
+
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(docs), workers))) as readers:
+            futures = {readers.submit(_one, d): d for d in docs}
+            for fut in as_completed(futures):
+                try:
+                    doc_id, report = fut.result()
+                    run.docs[doc_id] = report
+                except Exception as e:
+                    run.errors[futures[fut][1]] = str(e)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    run.elapsed = time.perf_counter() - t0
+    save_manifest(manifest_path, manifest)
+    return run
 
 
 def main() -> None:
     import grpc
 
     parser = argparse.ArgumentParser(description="Embed doc and upsert to L4 KB, or search with embedded query")
-    parser.add_argument("--doc", help="Path to document to index (e.g. ARCHITECTURE.md)")
+    parser.add_argument("--doc", nargs="+", help="Files, directories or globs to index (e.g. ARCHITECTURE.md docs/ '**/*.md')")
     parser.add_argument("--search", help="Query string: embed and run SemanticSearch (demo L4 end-to-end)")
     parser.add_argument("--kb", default="kb_core", help="KB collection name")
     parser.add_argument("--limit", type=int, default=5, help="Max search results (with --search)")
     parser.add_argument("--grpc", default=None, help="gRPC address (default [::1]:PAGI_GRPC_PORT)")
     parser.add_argument("--chunk-size", type=int, default=1000, help="Chars per chunk (indexing only)")
+    parser.add_argument("--manifest", default=None, help="Chunk manifest path (default PAGI_KB_MANIFEST or .kb_manifest.json)")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-embed every chunk")
+    parser.add_argument("--overlap", type=int, default=0, help="Chars shared between consecutive chunks (indexing only)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embed/UpsertVectors batch (indexing only)")
+    parser.add_argument("--workers", type=int, default=None, help="Embedding processes (default: min(cores, docs); 1 = in-process)")
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Max concurrent UpsertVectors calls (multi-doc indexing); embed batches outstanding are capped at max(workers, this)")
+    parser.add_argument("--pattern", default="*", help="File pattern when --doc names a directory (e.g. '*.md')")
+    parser.add_argument(
+        "--encoding",
+        choices=VECTOR_ENCODINGS,
+        default=None,
+        help="Vector wire encoding (default PAGI_VECTOR_ENCODING or float32)",
+    )
     args = parser.parse_args()
 
     if args.search:
         try:
-            hits = search_kb(args.search, kb_name=args.kb, limit=args.limit, grpc_addr=args.grpc)
+            hits = search_kb(
+                args.search, kb_name=args.kb, limit=args.limit, grpc_addr=args.grpc, encoding=args.encoding
+            )
             print(f"Query: \"{args.search}\" -> {len(hits)} hit(s) in {args.kb}")
             for i, h in enumerate(hits, 1):
                 print(f"  [{i}] id={h.document_id} score={h.score:.4f}")
@@ -146,19 +729,68 @@ def main() -> None:
 
     if not args.doc:
         parser.error("Either --doc or --search is required")
+    log_path = os.environ.get("PAGI_SELF_HEAL_LOG")
+    single = len(args.doc) == 1 and Path(args.doc[0]).is_file() and (args.workers or 1) <= 1
     try:
-        resp = upsert_to_kb(
+        if single:
+            report = upsert_to_kb(
+                args.kb,
+                args.doc[0],
+                grpc_addr=args.grpc,
+                chunk_size=args.chunk_size,
+                manifest_path=args.manifest,
+                full=args.full,
+                overlap=args.overlap,
+                batch_size=args.batch_size,
+                encoding=args.encoding,
+            )
+            resp = report.response
+            print(
+                f"Upserted {resp.upserted_count} points to {args.kb} (success={resp.success}; "
+                f"changed={report.upserted} unchanged={report.skipped} of {report.total_chunks} chunks)"
+            )
+            if report.removed:
+                print(f"Removed from doc (stale in {args.kb}): {', '.join(report.removed)}")
+            # L6 traceability: log KB bootstrap when audit log is configured
+            if log_path and resp.success:
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.write(f"L6 KB bootstrap: indexed {args.doc[0]} -> {args.kb} ({resp.upserted_count} points)\n")
+            return
+
+        run = index_paths(
             args.kb,
             args.doc,
             grpc_addr=args.grpc,
             chunk_size=args.chunk_size,
+            manifest_path=args.manifest,
+            full=args.full,
+            overlap=args.overlap,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            pattern=args.pattern,
+            encoding=args.encoding,
+        )
+        for doc_id, report in sorted(run.docs.items()):
+            resp = report.response
+            print(
+                f"  {doc_id}: upserted {resp.upserted_count} (changed={report.upserted} "
+                f"unchanged={report.skipped} of {report.total_chunks})"
+            )
+            if report.removed:
+                print(f"    removed from doc (stale in {args.kb}): {', '.join(report.removed)}")
+            if log_path and resp.success:
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.write(f"L6 KB bootstrap: indexed {doc_id} -> {args.kb} ({resp.upserted_count} points)\n")
+        for doc_id, err in sorted(run.errors.items()):
+            print(f"  {doc_id}: ERROR {err}", file=sys.stderr)
+        cps, mbps = run.throughput()
+        print(
+            f"Indexed {len(run.docs)} doc(s) into {args.kb} in {run.elapsed:.2f}s: "
+            f"{run.total_chunks} chunks ({run.embedded} embedded), {cps:.1f} chunks/s, {mbps:.2f} MB/s"
         )
-        print(f"Upserted {resp.upserted_count} points to {args.kb} (success={resp.success})")
-        # L6 traceability: log KB bootstrap when audit log is configured
-        log_path = os.environ.get("PAGI_SELF_HEAL_LOG")
-        if log_path and resp.success:
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(f"L6 KB bootstrap: indexed {args.doc} -> {args.kb} ({resp.upserted_count} points)\n")
+        if run.errors:
+            sys.exit(1)
     except grpc.RpcError as e:
         print(f"gRPC error: {e.code()} {e.details()}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,131 @@
+"""Pluggable embedding backends behind `main._get_embed_model` and `embed_and_upsert._load_model`.
+
+PAGI_EMBED_BACKEND selects the implementation; both expose the SentenceTransformer surface the bridge
+uses (`encode(texts, batch_size=...)` -> float32 rows, `get_sentence_embedding_dimension()`):
+- torch (default): sentence_transformers.SentenceTransformer on PyTorch.
+- onnx: the same model exported by scripts/export_onnx.py (int8 dynamic quantization by default) run
+  on onnxruntime's CPU provider. Tokenization, pooling and normalization mirror the ST pipeline, so
+  vectors stay interchangeable with torch ones (check with scripts/bench_embed.py).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    from .settings import get_settings
+except ImportError:  # run as a script: src/ is sys.path[0]
+    from settings import get_settings
+
+EMBED_BACKENDS = ("torch", "onnx")
+
+# Written next to the exported model; carries the ST pipeline settings the ONNX graph lacks.
+ONNX_CONFIG_FILE = "pagi_onnx.json"
+
+
+def embed_backend() -> str:
+    backend = get_settings().embed_backend
+    if backend not in EMBED_BACKENDS:
+        raise ValueError(f"Unknown PAGI_EMBED_BACKEND {backend!r}; expected one of {', '.join(EMBED_BACKENDS)}")
+    return backend
+
+
+def onnx_model_dir(model_name: str) -> Path:
+    """PAGI_ONNX_MODEL_DIR, else models/<model name>-onnx (export_onnx.py's default output)."""
+    configured = os.environ.get("PAGI_ONNX_MODEL_DIR")
+    if configured:
+        return Path(configured)
+    return Path("models") / f"{model_name.replace('/', '_')}-onnx"
+
+
+def load_embed_model(model_name: str, backend: str | None = None) -> Any:
+    """Construct the embedding model for `backend` (default: PAGI_EMBED_BACKEND)."""
+    backend = backend or embed_backend()
+    if backend == "onnx":
+        threads = int(os.environ.get("PAGI_ONNX_THREADS", "0"))
+        return OnnxEmbeddingModel(onnx_model_dir(model_name), threads=threads or None)
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def _pool(token_embeddings: np.ndarray, attention_mask: np.ndarray, mode: str) -> np.ndarray:
+    """Sentence vectors from (batch, seq, hidden) token states; `mean` ignores padding like ST Pooling."""
+    if mode == "cls":
+        return token_embeddings[:, 0].astype(np.float32)
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (token_embeddings * mask).sum(axis=1)
+    return (summed / np.clip(mask.sum(axis=1), 1e-9, None)).astype(np.float32)
+
+
+class OnnxEmbeddingModel:
+    """SentenceTransformer-compatible `encode` over an exported ONNX transformer (onnxruntime, CPU).
+
+    `model_dir` holds model_int8.onnx (preferred) or model.onnx, the tokenizer files and
+    pagi_onnx.json (pooling, normalize, max_length). `threads` sets intra-op threads (None: ORT default).
+    """
+
+    def __init__(self, model_dir: str | Path, threads: int | None = None) -> None:
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_dir = Path(model_dir)
+        onnx_file = model_dir / "model_int8.onnx"
+        if not onnx_file.is_file():
+            onnx_file = model_dir / "model.onnx"
+        if not onnx_file.is_file():
+            raise FileNotFoundError(
+                f"No ONNX model in {model_dir}; run scripts/export_onnx.py or set PAGI_ONNX_MODEL_DIR"
+            )
+        config_path = model_dir / ONNX_CONFIG_FILE
+        config = json.loads(config_path.read_text(encoding="utf-8")) if config_path.is_file() else {}
+        self.pooling: str = config.get("pooling", "mean")
+        self.normalize: bool = bool(config.get("normalize", True))
+        self.max_length: int = int(config.get("max_length", 256))
+        self._dim: int | None = config.get("dim")
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+        self._session = ort.InferenceSession(str(onnx_file), sess_options=opts, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.model_file = onnx_file
+
+    def get_sentence_embedding_dimension(self) -> int | None:
+        return self._dim
+
+    def encode(self, sentences: str | list[str], batch_size: int = 32, **_kwargs: Any) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        batch_size = max(1, batch_size)
+        rows: list[np.ndarray] = []
+        for start in range(0, len(texts), batch_size):
+            enc = self._tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self._input_names}
+            token_embeddings = self._session.run(None, feeds)[0]
+            rows.append(_pool(token_embeddings, enc["attention_mask"], self.pooling))
+        emb = np.concatenate(rows) if rows else np.zeros((0, self._dim or 0), dtype=np.float32)
+        if self.normalize:
+            emb /= np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+        return emb[0] if single else emb
+
+
+def cosine_parity(reference: np.ndarray, candidate: np.ndarray) -> dict[str, float]:
+    """Row-wise cosine between two (n, dim) embedding matrices: min and mean (1.0 = identical)."""
+    a = np.asarray(reference, dtype=np.float32)
+    b = np.asarray(candidate, dtype=np.float32)
+    cos = (a * b).sum(axis=1) / np.clip(np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1), 1e-12, None)
+    return {"min": float(cos.min()), "mean": float(cos.mean())}
@@ -0,0 +1,160 @@
+"""In-process embedding services for the bridge (L4 embed path behind `main._embed_content`).
+
+EmbeddingBatcher coalesces concurrent single-text encode calls (HTTP routes, track_*/query_* skills)
+into one batched forward pass, so concurrent requests share the model instead of queueing on it.
+EmbeddingCache is a byte-bounded LRU in front of it for the templated queries skills repeat.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+import numpy as np
+
+
+class EmbeddingBatcher:
+    """Gather texts for up to `max_wait_ms` or `max_batch` items, run one `encode`, fan results out.
+
+    Callers block in `encode()` on their own Future; a daemon worker owns the model calls, so the
+    model is only ever entered from one thread.
+    """
+
+    def __init__(
+        self,
+        get_model: Callable[[], Any],
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        self._get_model = get_model
+        self.max_batch = max(1, max_batch)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self._queue: queue.SimpleQueue[tuple[str, Future]] = queue.SimpleQueue()
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="pagi-embed-batcher", daemon=True)
+                self._worker.start()
+
+    def encode(self, text: str, timeout: float | None = None) -> Any:
+        """Return the embedding row for `text` (whatever the model yields per item, e.g. a numpy row)."""
+        fut: Future = Future()
+        self._ensure_worker()
+        self._queue.put((text, fut))
+        return fut.result(timeout=timeout)
+
+    def _collect(self) -> list[tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            texts = [t for t, _ in batch]
+            try:
+                vectors = self._get_model().encode(texts, batch_size=len(texts))
+            except BaseException as e:  # deliver to every waiter; keep the worker alive
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, fut), vec in zip(batch, vectors):
+                fut.set_result(vec)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": (self.items / self.batches) if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
+class EmbeddingCache:
+    """Byte-bounded LRU of final (padded/truncated) vectors keyed by (model name, dim, text hash).
+
+    Vectors are stored as read-only float32 numpy arrays (the wire type of `VectorPoint.vector`) and
+    handed back without copying, so the bound is `entries * dim * 4` bytes. `max_bytes <= 0`
+    disables the cache.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[tuple[str, int | None, bytes], np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_name: str, dim: int | None, text: str) -> tuple[str, int | None, bytes]:
+        # Exact text: a cached vector is always the one the model returns for this very input.
+        return (model_name, dim, hashlib.sha256(text.encode("utf-8")).digest())
+
+    def get(self, key: tuple[str, int | None, bytes]) -> np.ndarray | None:
+        if self.max_bytes <= 0:
+            return None
+        with self._lock:
+            vec = self._data.get(key)
+            if vec is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return vec
+
+    def put(self, key: tuple[str, int | None, bytes], vector: Any) -> None:
+        if self.max_bytes <= 0:
+            return
+        arr = np.array(vector, dtype=np.float32)  # own copy, so callers cannot alias the cached entry
+        arr.setflags(write=False)
+        size = arr.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._data[key] = arr
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,274 @@
+"""Resilient channels for every bridge → orchestrator gRPC call (recursive_loop, main KB routes, L5 skills).
+
+Channels from `sync_channel` / `aio_channel` carry two layers:
+- Retries (gRPC service config): idempotent RPCs (`RETRYABLE_METHODS`) are retried on UNAVAILABLE
+  with jittered exponential backoff, up to PAGI_GRPC_RETRY_MAX_ATTEMPTS attempts within the call's
+  own deadline. ExecuteAction, ProposePatch and ApplyPatch have side effects and are never retried.
+- A per-method circuit breaker (interceptor): after PAGI_GRPC_BREAKER_FAILURES consecutive
+  UNAVAILABLE / DEADLINE_EXCEEDED results the method's breaker opens and calls fail at once with
+  `CircuitOpenError` (a grpc.RpcError with code UNAVAILABLE, so existing `except grpc.RpcError` paths
+  degrade as before, just without waiting out a deadline). After PAGI_GRPC_BREAKER_RESET_SECS one
+  trial call is let through (half-open): success closes the breaker, failure re-opens it.
+Other status codes mean the orchestrator answered and count as success. The breaker wraps unary
+calls; ExecuteActionStream sessions are not counted.
+
+`breaker_states()` is exported on GET /health/grpc. Knobs are read when a channel or breaker is built.
+`AioChannelPool` keeps the long-lived aio channels every async caller shares.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import grpc
+
+SERVICE = "pagi.Pagi"
+RETRYABLE_METHODS = ("SemanticSearch", "UpsertVectors", "AccessMemory")  # UpsertVectors writes by point id
+TRIP_CODES = frozenset({grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED})
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _env_truthy(name: str, default: bool = False) -> bool:
+    v = os.environ.get(name)
+    if v is None:
+        return default
+    return v.strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+class CircuitOpenError(grpc.RpcError):
+    """Raised instead of calling a method whose breaker is open."""
+
+    def __init__(self, method: str, retry_in_s: float) -> None:
+        super().__init__(f"circuit open for {method}; retry in {retry_in_s:.1f}s")
+        self.method = method
+        self.retry_in_s = retry_in_s
+
+    def code(self) -> grpc.StatusCode:
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self) -> str:
+        return str(self)
+
+
+class CircuitBreaker:
+    """closed → open after `failure_threshold` consecutive failures → half-open after `reset_timeout_s`."""
+
+    def __init__(self, method: str, failure_threshold: int, reset_timeout_s: float) -> None:
+        self.method = method
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_s = reset_timeout_s
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            retry_in = self.opened_at + self.reset_timeout_s - time.monotonic()
+            if self.state == "open" and retry_in <= 0:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError(self.method, max(0.0, retry_in))
+
+    def record(self, code: grpc.StatusCode | None) -> None:
+        with self._lock:
+            trial, self._trial_in_flight = self._trial_in_flight, False
+            if code == grpc.StatusCode.CANCELLED:
+                return  # the caller gave up: says nothing about the orchestrator
+            if code in TRIP_CODES:
+                self.failures += 1
+                if trial or (self.state == "closed" and self.failures >= self.failure_threshold):
+                    self.state = "open"
+                    self.opened_at = time.monotonic()
+                    self.trips += 1
+            else:
+                self.state = "closed"
+                self.failures = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in_s": (
+                    round(max(0.0, self.opened_at + self.reset_timeout_s - time.monotonic()), 3)
+                    if self.state == "open" else 0.0
+                ),
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(method: str | bytes) -> CircuitBreaker:
+    """The shared breaker for a full method name ("/pagi.Pagi/SemanticSearch"), created on first use."""
+    if isinstance(method, bytes):
+        method = method.decode()
+    with _breakers_lock:
+        breaker = _breakers.get(method)
+        if breaker is None:
+            breaker = _breakers[method] = CircuitBreaker(
+                method,
+                failure_threshold=int(_env_float("PAGI_GRPC_BREAKER_FAILURES", 5)),
+                reset_timeout_s=_env_float("PAGI_GRPC_BREAKER_RESET_SECS", 5.0),
+            )
+        return breaker
+
+
+def breaker_states() -> dict[str, dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.method: b.snapshot() for b in breakers}
+
+
+def reset_breakers() -> None:
+    """Forget all breakers (tests; they are rebuilt with the current env on next use)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+class _BreakerInterceptor(grpc.UnaryUnaryClientInterceptor):
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        breaker = breaker_for(client_call_details.method)
+        breaker.before_call()
+        try:
+            outcome = continuation(client_call_details, request)
+        except BaseException:
+            breaker.record(grpc.StatusCode.CANCELLED)  # release a half-open trial
+            raise
+        # Record on completion: `.future()` callers (pipelined upserts) must get the call back at once.
+        outcome.add_done_callback(lambda call: breaker.record(call.code()))
+        return outcome
+
+
+class _AioBreakerInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        breaker = breaker_for(client_call_details.method)
+        breaker.before_call()
+        try:
+            call = await continuation(client_call_details, request)
+            code = await call.code()
+        except BaseException:
+            breaker.record(grpc.StatusCode.CANCELLED)  # release a half-open trial
+            raise
+        breaker.record(code)
+        return call
+
+
+def retry_service_config() -> str:
+    """Service config JSON: retry policy for `RETRYABLE_METHODS` (gRPC randomizes each backoff)."""
+    policy = {
+        "maxAttempts": max(2, min(5, int(_env_float("PAGI_GRPC_RETRY_MAX_ATTEMPTS", 3)))),
+        "initialBackoff": f"{_env_float('PAGI_GRPC_RETRY_INITIAL_BACKOFF_MS', 50) / 1000:g}s",
+        "maxBackoff": f"{_env_float('PAGI_GRPC_RETRY_MAX_BACKOFF_MS', 1000) / 1000:g}s",
+        "backoffMultiplier": 2,
+        "retryableStatusCodes": ["UNAVAILABLE"],
+    }
+    return json.dumps({
+        "methodConfig": [{
+            "name": [{"service": SERVICE, "method": m} for m in RETRYABLE_METHODS],
+            "retryPolicy": policy,
+        }]
+    })
+
+
+def keepalive_options() -> list[tuple[str, int]]:
+    """Keepalive options for long-lived channels (env-tunable for LB/NAT idle timeouts)."""
+    return [
+        ("grpc.keepalive_time_ms", int(_env_float("PAGI_GRPC_KEEPALIVE_TIME_MS", 30000))),
+        ("grpc.keepalive_timeout_ms", int(_env_float("PAGI_GRPC_KEEPALIVE_TIMEOUT_MS", 10000))),
+        ("grpc.keepalive_permit_without_calls", 1 if _env_truthy("PAGI_GRPC_KEEPALIVE_PERMIT_WITHOUT_CALLS", default=True) else 0),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
+
+def _options(options: Sequence[tuple[str, Any]]) -> list[tuple[str, Any]]:
+    return list(options) + [("grpc.enable_retries", 1), ("grpc.service_config", retry_service_config())]
+
+
+def sync_channel(addr: str, options: Sequence[tuple[str, Any]] = ()) -> grpc.Channel:
+    return grpc.intercept_channel(grpc.insecure_channel(addr, options=_options(options)), _BreakerInterceptor())
+
+
+def aio_channel(addr: str, options: Sequence[tuple[str, Any]] = ()) -> grpc.aio.Channel:
+    return grpc.aio.insecure_channel(addr, options=_options(options), interceptors=[_AioBreakerInterceptor()])
+
+
+async def _close_channels(channels: Sequence[grpc.aio.Channel]) -> None:
+    for ch in channels:
+        await ch.close()
+
+
+class AioChannelPool:
+    """Round-robin pools of long-lived `aio_channel`s, one pool per address, bound to the running event loop.
+
+    aio channels cannot be shared across event loops; if the loop changes (e.g. TestClient without a
+    context manager), the pools are rebuilt on the new loop and the old channels are closed: on their
+    own loop while it still runs, otherwise from the new one (`close()` without grace never awaits).
+    """
+
+    def __init__(self, stub_factory: Callable[[grpc.aio.Channel], Any]) -> None:
+        self._stub_factory = stub_factory
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._channels: dict[str, list[grpc.aio.Channel]] = {}
+        self._stubs: dict[str, list[Any]] = {}
+        self._next: dict[str, int] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def stub(self, addr: str, size: int = 1) -> Any:
+        """Next stub for `addr`; the pool for it is opened with `size` channels on first use."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._retire(loop)
+            self._loop = loop
+        stubs = self._stubs.get(addr)
+        if not stubs:
+            # Local subchannel pool: each channel gets its own HTTP/2 connection instead of sharing one.
+            options = keepalive_options() + [("grpc.use_local_subchannel_pool", 1)]
+            channels = self._channels[addr] = [aio_channel(addr, options=options) for _ in range(max(1, size))]
+            stubs = self._stubs[addr] = [self._stub_factory(ch) for ch in channels]
+        n = self._next.get(addr, 0)
+        self._next[addr] = n + 1
+        return stubs[n % len(stubs)]
+
+    def _retire(self, loop: asyncio.AbstractEventLoop) -> None:
+        channels = [ch for chs in self._channels.values() for ch in chs]
+        old = self._loop
+        self._channels, self._stubs, self._next = {}, {}, {}
+        if not channels:
+            return
+        if old is not None and old.is_running():
+            asyncio.run_coroutine_threadsafe(_close_channels(channels), old)
+            return
+        task = loop.create_task(_close_channels(channels))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        channels = [ch for chs in self._channels.values() for ch in chs]
+        self._channels, self._stubs, self._next = {}, {}, {}
+        self._loop = None
+        await _close_channels(channels)
@@ -0,0 +1,146 @@
+"""LLM response cache for structured RLM steps (`recursive_loop._Completion`).
+
+Exact tier: key = sha256(model, full message list); a retry or replayed multi-turn session with the
+same query and context gets the stored answer. Semantic tier (optional): within the same scope
+(model + system prompt + recursion depth + context hash), a user query whose embedding is at least
+`semantic_threshold` cosine-similar to a cached one reuses that answer. Only the query is embedded, so
+the context (which dominates the prompt) must match exactly rather than just look alike. Both tiers
+share the entry store, TTL and LRU size bound.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+@dataclass
+class _Entry:
+    content: str
+    expires_at: float
+    latency_s: float  # what the original completion cost; credited to `latency_saved_s` per reuse
+    scope: bytes
+    vector: np.ndarray | None  # unit-norm query embedding (semantic tier only)
+
+
+class LLMResponseCache:
+    """TTL + LRU cache of completion contents, bounded by `max_entries` (`<= 0` disables).
+
+    `embed` maps query text to a vector and `semantic_threshold` (cosine, e.g. 0.95) enables the
+    semantic tier; leave either None for exact matching only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_s: float,
+        semantic_threshold: float | None = None,
+        embed: Callable[[str], Any] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.semantic_threshold = semantic_threshold
+        self.embed = embed
+        self._data: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.latency_saved_s = 0.0
+
+    @property
+    def semantic(self) -> bool:
+        return self.semantic_threshold is not None and self.embed is not None
+
+    @staticmethod
+    def key(model: str, messages: list[dict]) -> bytes:
+        blob = json.dumps([model, messages], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).digest()
+
+    @staticmethod
+    def scope(model: str, system_prompt: str, depth: int = 0, context: str = "") -> bytes:
+        return hashlib.sha256(f"{model}\0{system_prompt}\0{depth}\0{context}".encode("utf-8")).digest()
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.asarray(self.embed(text), dtype=np.float32).ravel()
+        return vec / max(float(np.linalg.norm(vec)), 1e-12)
+
+    def _expire(self, now: float) -> None:
+        for k in [k for k, e in self._data.items() if e.expires_at <= now]:
+            del self._data[k]
+
+    def _hit(self, key: bytes, entry: _Entry) -> str:
+        self._data.move_to_end(key)
+        self.latency_saved_s += entry.latency_s
+        return entry.content
+
+    def get(self, key: bytes, scope: bytes = b"", text: str | None = None) -> str | None:
+        """Exact lookup, then (if enabled and `text` given) nearest same-scope query above the threshold.
+
+        The semantic tier calls `embed`, which may block on the model: async callers run this on a thread.
+        """
+        if self.max_entries <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._data.get(key)
+            if entry is not None:
+                self.exact_hits += 1
+                return self._hit(key, entry)
+            candidates = [(k, e) for k, e in self._data.items() if e.scope == scope and e.vector is not None]
+        if not (self.semantic and text and candidates):
+            with self._lock:
+                self.misses += 1
+            return None
+        query = self._vector(text)
+        sims = np.stack([e.vector for _, e in candidates]) @ query
+        best = int(np.argmax(sims))
+        with self._lock:
+            k, entry = candidates[best]
+            if sims[best] >= self.semantic_threshold and self._data.get(k) is entry:
+                self.semantic_hits += 1
+                return self._hit(k, entry)
+            self.misses += 1
+        return None
+
+    def put(self, key: bytes, content: str, latency_s: float, scope: bytes = b"", text: str | None = None) -> None:
+        if self.max_entries <= 0:
+            return
+        vector = self._vector(text) if (self.semantic and text) else None
+        entry = _Entry(content, time.monotonic() + self.ttl_s, latency_s, scope, vector)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = entry
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        hits = self.exact_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (hits / total) if total else 0.0,
+            "latency_saved_s": round(self.latency_saved_s, 3),
+            "entries": len(self._data),
+            "evictions": self.evictions,
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "semantic_threshold": self.semantic_threshold if self.semantic else None,
+        }
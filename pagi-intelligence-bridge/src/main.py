@@ -1,19 +1,24 @@
 """FastAPI entrypoint for pagi-intelligence-bridge (sidecar to Rust orchestrator)."""
 
+import asyncio
 import os
+import threading
+import time
 import traceback
 import uuid
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
 from typing import Any, Literal
 import json
 
 import grpc
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 load_dotenv()  # Load .env from cwd if present (reproducible L5 verification)
 
@@ -22,80 +27,266 @@ print(f"Effective PAGI_MOCK_MODE: {os.getenv('PAGI_MOCK_MODE')}")
 print(f"Effective PAGI_ALLOW_OUTBOUND: {os.getenv('PAGI_ALLOW_OUTBOUND')}")
 print(f"LLM key present: {'yes' if os.getenv('PAGI_OPENROUTER_API_KEY') else 'no'}")
 
+from . import action_log
+from .action_memo import ActionMemo, memo_session
+from .agent_events import agent_event, agent_event_sink
+from .grpc_client import breaker_states, keepalive_options, sync_channel
 from .recursive_loop import (
     MAX_RECURSION_DEPTH,
     RLMQuery,
     RLMSummary,
+    _load_local_skill_module,
+    _local_dispatch_allow_list,
     _report_self_heal,
-    recursive_loop,
+    _close_grpc_aio,
+    _get_grpc_aio_stub,
+    _close_self_heal_queue,
+    _get_self_heal_queue,
+    _llm_cache,
+    _skills_dir,
+    arecursive_loop,
+    set_llm_cache_embedder,
 )
-
-
-def _env_truthy(name: str, default: bool = False) -> bool:
-    v = os.environ.get(name)
-    if v is None:
-        return default
-    return v.strip().lower() in {"1", "true", "yes", "y", "on"}
+from .settings import apply_overrides, get_settings, scoped_settings
 
 
 def _allow_kb_routes() -> bool:
     """Gate L4 KB routes: allow when local dispatch or vertical is personal."""
-    allow = os.environ.get("PAGI_ALLOW_LOCAL_DISPATCH", "").strip().lower() in ("1", "true", "yes", "y", "on")
-    vertical = (os.environ.get("PAGI_VERTICAL_USE_CASE") or "").strip().lower()
-    return allow or vertical == "personal"
+    return get_settings().allow_kb_routes
 
 
 _embed_model = None
+_embed_model_lock = threading.Lock()
 
 
 def _get_embed_model():
-    """Lazy-load Sentence Transformer for L4 embed (reuse existing dep)."""
+    """Lazy-load the L4 embed model (PAGI_EMBED_BACKEND: torch SentenceTransformer or ONNX int8).
+
+    Concurrent first calls load once.
+    """
     global _embed_model
     if _embed_model is None:
-        from sentence_transformers import SentenceTransformer
-        _embed_model = SentenceTransformer(os.environ.get("PAGI_EMBED_MODEL", "all-MiniLM-L6-v2"))
+        with _embed_model_lock:
+            if _embed_model is None:
+                from .embed_backends import load_embed_model
+                _embed_model = load_embed_model(get_settings().embed_model)
     return _embed_model
 
 
 def _grpc_addr() -> str:
-    port = os.environ.get("PAGI_GRPC_PORT", "50051")
-    return f"[::1]:{port}"
+    return get_settings().kb_grpc_addr
+
+
+_grpc_channel: grpc.Channel | None = None
+_grpc_stub = None
+_grpc_stub_addr: str | None = None
+_grpc_lock = threading.Lock()
 
 
 def _get_grpc_stub():
-    """Return gRPC Pagi stub (Rust orchestrator)."""
-    from .pagi_pb import pagi_pb2_grpc
+    """Return gRPC Pagi stub (Rust orchestrator) on a long-lived sync channel.
 
-    channel = grpc.insecure_channel(_grpc_addr())
-    return pagi_pb2_grpc.PagiStub(channel)
+    The channel is created once per address and reused, so skills and policy gates no longer pay a
+    TCP/HTTP2 handshake per call.
+    """
+    from .embed_and_upsert import PagiKBStub
+
+    global _grpc_channel, _grpc_stub, _grpc_stub_addr
+    addr = _grpc_addr()
+    with _grpc_lock:
+        if _grpc_stub is None or _grpc_stub_addr != addr:
+            if _grpc_channel is not None:
+                _grpc_channel.close()
+            _grpc_channel = sync_channel(addr, options=keepalive_options())
+            _grpc_stub = PagiKBStub(_grpc_channel)
+            _grpc_stub_addr = addr
+        return _grpc_stub
 
 
 def _get_kb_stub():
-    """Return gRPC Pagi stub for UpsertVectors / SemanticSearch (Rust MemoryManager)."""
+    """Return gRPC Pagi stub for UpsertVectors / SemanticSearch (Rust MemoryManager). Sync; used by L5 skills."""
     return _get_grpc_stub()
 
 
-def _embed_content(text: str) -> list[float]:
-    from .embed_and_upsert import _embedding_dim
-    model = _get_embed_model()
-    vec = model.encode(text).tolist()
+def _grpc_channel_ready(timeout: float = 0.5) -> bool:
+    """True when the shared orchestrator channel is connected (waits up to `timeout` for a connect)."""
+    _get_grpc_stub()
+    with _grpc_lock:
+        channel = _grpc_channel
+    try:
+        grpc.channel_ready_future(channel).result(timeout=timeout)
+    except grpc.FutureTimeoutError:
+        return False
+    return True
+
+
+def _get_kb_aio_stub():
+    """Return an async gRPC Pagi stub from the shared aio channel pool (KB routes, async L5 skills)."""
+    return _get_grpc_aio_stub(_grpc_addr())
+
+
+_embed_batcher = None
+_embed_batcher_lock = threading.Lock()
+
+
+def _get_embed_batcher():
+    """Shared micro-batcher in front of the embed model (PAGI_EMBED_BATCH_MAX_SIZE / PAGI_EMBED_BATCH_WAIT_MS)."""
+    global _embed_batcher
+    if _embed_batcher is None:
+        from .embedding import EmbeddingBatcher
+
+        with _embed_batcher_lock:
+            if _embed_batcher is None:
+                cfg = get_settings()
+                _embed_batcher = EmbeddingBatcher(
+                    _get_embed_model, max_batch=cfg.embed_batch_max_size, max_wait_ms=cfg.embed_batch_wait_ms
+                )
+    return _embed_batcher
+
+
+_embed_cache = None
+
+
+def _get_embed_cache():
+    """Shared LRU of embedded texts, bounded by PAGI_EMBED_CACHE_MAX_MB (0 disables)."""
+    global _embed_cache
+    if _embed_cache is None:
+        from .embedding import EmbeddingCache
+
+        with _embed_batcher_lock:
+            if _embed_cache is None:
+                _embed_cache = EmbeddingCache(int(get_settings().embed_cache_max_mb * 1024 * 1024))
+    return _embed_cache
+
+
+def _embed_content(text: str) -> Any:
+    """Embed `text` as a float32 vector sized per PAGI_EMBEDDING_DIM (`native`: the model's own size)."""
+    from .embed_and_upsert import _embedding_dim, fit_dim
+    from .embed_backends import embed_backend
     dim = _embedding_dim()
-    if len(vec) < dim:
-        vec = vec + [0.0] * (dim - len(vec))
-    elif len(vec) > dim:
-        vec = vec[:dim]
+    cache = _get_embed_cache()
+    # Backend is part of the key: int8 ONNX vectors are close to, not identical with, torch ones.
+    model_key = f"{get_settings().embed_model}@{embed_backend()}"
+    cache_key = cache.key(model_key, dim, text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    batcher = _get_embed_batcher()
+    if batcher.max_batch > 1:
+        vec = fit_dim(batcher.encode(text), dim)
+    else:
+        # Batching disabled: encode inline on the caller's thread.
+        vec = fit_dim(_get_embed_model().encode(text), dim)
+    cache.put(cache_key, vec)
     return vec
 
 
+# Semantic tier of the LLM response cache embeds prompts through the shared model, batcher and LRU.
+set_llm_cache_embedder(_embed_content)
+
+
+def _kb_upsert_request(kb_name: str, point_id: str, vector, payload: dict[str, str]):
+    """Single-point UpsertRequest (packed view; KB stubs send it as is); vector as raw float32, or float16/int8 per PAGI_VECTOR_ENCODING."""
+    from .embed_and_upsert import upsert_request
+    return upsert_request(kb_name, [(point_id, vector, payload)])
+
+
+def _kb_search_request(query: str, kb_name: str, limit: int, vector):
+    """SearchRequest for `vector`, encoded like `_kb_upsert_request` (PAGI_VECTOR_ENCODING)."""
+    from .embed_and_upsert import search_request
+    return search_request(query, kb_name, limit, vector)
+
+
+def _kb_log(kb_name: str, text: str, content: str) -> None:
+    """Embed `text` and upsert it to `kb_name` as one point carrying `content` (sync L5 skills)."""
+    vector = _embed_content(text[:10000])
+    req = _kb_upsert_request(kb_name, str(uuid.uuid4()), vector, {"content": content[:10000]})
+    _get_kb_stub().UpsertVectors(req, timeout=10.0)
+
+
+async def _akb_log(kb_name: str, text: str, content: str) -> None:
+    """`_kb_log` for async skills: embeds on the threadpool, upserts through the pooled aio stub."""
+    vector = await run_in_threadpool(_embed_content, text[:10000])
+    req = _kb_upsert_request(kb_name, str(uuid.uuid4()), vector, {"content": content[:10000]})
+    await _get_kb_aio_stub().UpsertVectors(req, timeout=10.0)
+
+
+def _kb_hits(query: str, kb_name: str, limit: int = 20) -> list:
+    """SemanticSearch hits for `query` in `kb_name` (sync L5 skills)."""
+    req = _kb_search_request(query, kb_name, limit, _embed_content(query))
+    resp = _get_kb_stub().SemanticSearch(req, timeout=10.0)
+    return list(resp.hits)
+
+
+async def _akb_hits(query: str, kb_name: str, limit: int = 20) -> list:
+    """`_kb_hits` for async skills: embeds on the threadpool, searches through the pooled aio stub."""
+    vector = await run_in_threadpool(_embed_content, query)
+    resp = await _get_kb_aio_stub().SemanticSearch(_kb_search_request(query, kb_name, limit, vector), timeout=10.0)
+    return list(resp.hits)
+
+
+_warmup_status: dict[str, Any] = {"state": "idle", "error": None, "seconds": None, "skills_loaded": None, "skills_failed": []}
+_warmup_thread: threading.Thread | None = None
+
+
+def _warmup() -> None:
+    """Preload allow-listed skill modules, then load the embed model and run one warm-up encode."""
+    t0 = time.perf_counter()
+    _warmup_status.update(state="loading", error=None)
+    loaded, failed = 0, []
+    for name in sorted(_local_dispatch_allow_list()):
+        if not (_skills_dir() / f"{name}.py").is_file():
+            continue  # built-in action (peek_file, save_skill, ...), not a module
+        try:
+            _load_local_skill_module(name)
+            loaded += 1
+        except Exception:
+            failed.append(name)
+    _warmup_status.update(skills_loaded=loaded, skills_failed=failed)
+    try:
+        # First encode initialises kernels/tokenizer caches; the first real request no longer pays it.
+        _get_embed_model().encode(["warm-up"], batch_size=1)
+    except Exception as e:
+        _warmup_status.update(state="error", error=str(e), seconds=time.perf_counter() - t0)
+        return
+    _warmup_status.update(state="ready", seconds=time.perf_counter() - t0)
+
+
+def _start_warmup() -> None:
+    """Run `_warmup` on a daemon thread (PAGI_EMBED_PRELOAD) so startup and /health are not delayed."""
+    global _warmup_thread
+    if _warmup_thread is None or not _warmup_thread.is_alive():
+        _warmup_thread = threading.Thread(target=_warmup, name="pagi-embed-warmup", daemon=True)
+        _warmup_thread.start()
+
+
 class RLMMultiTurnRequest(RLMQuery):
     """RLM query with optional max_turns, per-request vertical, and feature_flags for /rlm-multi-turn."""
 
     max_turns: int = 5
     vertical_use_case: str | None = None  # e.g. research, codegen, code_review, personal; overrides env for this request
     feature_flags: dict | None = None  # e.g. {"health": True, "finance": True}; passed to RLMQuery for personal vertical
+    stream: bool = False  # true: text/event-stream, one `turn` event per RLMSummary as it completes, then `done`
 
 
-app = FastAPI(title="pagi-intelligence-bridge", version="0.1.0")
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    if get_settings().embed_preload:
+        _start_warmup()
+    yield
+    # Drain pooled channels on shutdown so in-flight RPCs are not cut mid-stream.
+    global _grpc_channel, _grpc_stub, _grpc_stub_addr
+    await _close_grpc_aio()
+    await asyncio.to_thread(_close_self_heal_queue)  # queued self-heal reports get a short drain window
+    await asyncio.to_thread(action_log.close)  # write out queued action-log records
+    with _grpc_lock:
+        if _grpc_channel is not None:
+            _grpc_channel.close()
+        _grpc_channel = _grpc_stub = _grpc_stub_addr = None
+
+
+app = FastAPI(title="pagi-intelligence-bridge", version="0.1.0", lifespan=_lifespan)
 
 # Frontend dev server (Vite) calls into bridge from a different origin.
 # Keep permissive defaults for local bare-metal, but allow tightening via env.
@@ -179,6 +370,70 @@ def health_env() -> dict:
     }
 
 
+@app.get("/health/embed")
+def health_embed() -> dict:
+    """Embedding path counters: LRU cache hit/miss and micro-batcher batch sizes."""
+    return {
+        "cache": _get_embed_cache().stats(),
+        "batcher": _get_embed_batcher().stats(),
+    }
+
+
+@app.get("/health/llm-cache")
+def health_llm_cache() -> dict:
+    """Structured-step LLM response cache counters: exact/semantic hits, hit rate, latency saved."""
+    return _llm_cache().stats()
+
+
+@app.get("/health/grpc")
+def health_grpc() -> dict:
+    """Per-method circuit breaker state for orchestrator calls (src/grpc_client.py)."""
+    return {"addr": _grpc_addr(), "breakers": breaker_states()}
+
+
+@app.get("/health/self-heal")
+def health_self_heal() -> dict:
+    """Self-heal report queue: pending, deduplicated and dropped counts, recent fingerprints."""
+    return _get_self_heal_queue().stats()
+
+
+@app.get("/ready")
+def ready() -> JSONResponse:
+    """Readiness for load balancers: 200 when the model, gRPC channel and skill registry this instance
+    needs are warm, else 503 (same body). The model is required with PAGI_EMBED_PRELOAD; the gRPC
+    channel when KB routes or PAGI_ACTIONS_VIA_GRPC use it.
+    """
+    preload = get_settings().embed_preload
+    state = _warmup_status["state"]
+    model = {
+        "ready": state == "ready" if preload else True,
+        "required": preload,
+        "loaded": _embed_model is not None,
+        "state": state,
+        "error": _warmup_status["error"],
+        "seconds": _warmup_status["seconds"],
+    }
+
+    cfg = get_settings()
+    grpc_required = cfg.allow_kb_routes or cfg.actions_via_grpc
+    grpc_check = {
+        "ready": _grpc_channel_ready() if grpc_required else True,
+        "required": grpc_required,
+        "addr": _grpc_addr(),
+    }
+
+    skills_dir = _skills_dir()
+    skills = {
+        "ready": skills_dir.is_dir() and (not preload or _warmup_status["skills_loaded"] is not None),
+        "loaded": _warmup_status["skills_loaded"],
+        "failed": _warmup_status["skills_failed"],
+    }
+
+    checks = {"model": model, "grpc": grpc_check, "skills": skills}
+    ok = all(c["ready"] for c in checks.values())
+    return JSONResponse({"ready": ok, "checks": checks}, status_code=200 if ok else 503)
+
+
 _ALLOWED_UI_CONFIG_KEYS = frozenset({
     "PAGI_PROJECT_ROOT",
     "PAGI_ALLOW_OUTBOUND",
@@ -209,10 +464,10 @@ def api_config(body: ConfigOverridesBody) -> dict:
     applied = {}
     for k, v in (body.overrides or {}).items():
         if k in _ALLOWED_UI_CONFIG_KEYS:
-            val = "true" if v is True else ("false" if v is False else str(v))
-            os.environ[k] = val
-            applied[k] = val
-    return {"success": True, "applied": applied}
+            applied[k] = "true" if v is True else ("false" if v is False else str(v))
+    # One swap for the whole batch: readers see either the old or the new settings, never a mix.
+    settings = apply_overrides(applied)
+    return {"success": True, "applied": applied, "settings_version": settings.version}
 
 
 @app.post("/debug")
@@ -229,15 +484,13 @@ def debug_trigger(data: dict) -> dict:
 
 
 @app.post("/rlm", response_model=RLMSummary)
-def handle_rlm(query: RLMQuery) -> RLMSummary:
+async def handle_rlm(query: RLMQuery) -> RLMSummary:
     """Run one RLM step: peek / delegate / synthesize. Delegation guarded by Rust via gRPC in production."""
-    return recursive_loop(query)
+    return await arecursive_loop(query)
 
 
-@app.post("/rlm-multi-turn")
-def handle_rlm_multi_turn(body: RLMMultiTurnRequest) -> list[dict]:
-    """Run multi-turn RLM: loop recursive_loop, inject summary as context until converged or max_turns. Returns list of RLMSummary dicts. Optional vertical_use_case and feature_flags override/env for this request."""
-    summaries: list[dict] = []
+async def _multi_turn_summaries(body: RLMMultiTurnRequest) -> AsyncIterator[RLMSummary]:
+    """Run turns of `body`, chaining each summary into the next turn's context; yield each as it completes."""
     query = RLMQuery(
         query=body.query,
         context=body.context,
@@ -245,29 +498,99 @@ def handle_rlm_multi_turn(body: RLMMultiTurnRequest) -> list[dict]:
         feature_flags=body.feature_flags,
         mock_mode=body.mock_mode,
     )
-    prev_vertical = os.environ.get("PAGI_VERTICAL_USE_CASE")
-    if body.vertical_use_case:
-        os.environ["PAGI_VERTICAL_USE_CASE"] = body.vertical_use_case.strip().lower()
+    # Request-scoped vertical (ContextVar), so concurrent sessions for different verticals do not interfere.
+    # Scoped per turn, not across the yield: the consumer may resume this generator from another context.
+    scope = {"vertical_use_case": body.vertical_use_case.strip().lower()} if body.vertical_use_case else {}
+    memo = ActionMemo()  # one memoization session across all turns
+    for _ in range(body.max_turns):
+        with scoped_settings(**scope), memo_session(memo):
+            out = await arecursive_loop(query)
+        yield out
+        if out.converged:
+            return
+        query = RLMQuery(
+            query=body.query,
+            context=f"{query.context}\nSummary: {out.summary}".strip(),
+            depth=query.depth,
+            feature_flags=body.feature_flags,
+            mock_mode=body.mock_mode,
+        )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/rlm-multi-turn")
+async def handle_rlm_multi_turn(body: RLMMultiTurnRequest) -> Any:
+    """Run multi-turn RLM: loop recursive_loop, inject summary as context until converged or max_turns. Returns list of RLMSummary dicts. Optional vertical_use_case (request-scoped) and feature_flags apply to this request only.
+
+    With `stream: true` the turns are sent as Server-Sent Events instead: `turn` ({turn, summary, converged})
+    as each completes, then `done` ({turns, converged, status: converged|max_turns}).
+    """
+    if body.stream:
+        return StreamingResponse(_multi_turn_events(body), media_type="text/event-stream")
+    return [out.model_dump() async for out in _multi_turn_summaries(body)]
+
+
+async def _multi_turn_events(body: RLMMultiTurnRequest) -> AsyncIterator[str]:
+    turns = 0
+    converged = False
+    async for out in _multi_turn_summaries(body):
+        turns += 1
+        converged = out.converged
+        yield _sse("turn", {"turn": turns, **out.model_dump()})
+    yield _sse("done", {"turns": turns, "converged": converged, "status": "converged" if converged else "max_turns"})
+
+
+@app.websocket("/ws/agent")
+async def ws_agent(websocket: WebSocket) -> None:
+    """Live AgentEvent stream (Boilerplate Contract §3). Each client frame is a /rlm-multi-turn body
+    (`stream` ignored); the session's events are sent as the loop produces them, from `session_started`
+    to `session_ended`, then the socket waits for the next query.
+    """
+    await websocket.accept()
     try:
-        for _ in range(body.max_turns):
-            out = recursive_loop(query)
-            summaries.append(out.model_dump())
-            if out.converged:
-                break
-            query = RLMQuery(
-                query=body.query,
-                context=(query.context + "\n" + out.summary).strip(),
-                depth=query.depth,
-                feature_flags=body.feature_flags,
-                mock_mode=body.mock_mode,
-            )
-        return summaries
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                body = RLMMultiTurnRequest.model_validate_json(raw)
+            except ValidationError as e:
+                await websocket.send_json(agent_event("error", {"message": str(e), "component": "ws_agent"}))
+                continue
+            await _ws_agent_session(websocket, body)
+    except WebSocketDisconnect:
+        pass
+
+
+async def _ws_agent_session(websocket: WebSocket, body: RLMMultiTurnRequest) -> None:
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[dict | None] = asyncio.Queue()
+
+    def sink(msg: dict) -> None:
+        # Called from the loop thread and from to_thread workers (in-process skills, self-heal).
+        loop.call_soon_threadsafe(events.put_nowait, msg)
+
+    async def run() -> None:
+        session_id = str(uuid.uuid4())
+        converged, summary = False, ""
+        sink(agent_event("session_started", {"session_id": session_id, "query": body.query, "depth": body.depth}))
+        try:
+            with agent_event_sink(sink):
+                async for out in _multi_turn_summaries(body):
+                    converged, summary = out.converged, out.summary
+        except Exception as e:
+            sink(agent_event("error", {"message": str(e), "component": "ws_agent"}))
+        finally:
+            sink(agent_event("session_ended", {"session_id": session_id, "converged": converged, "summary": summary}))
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    task = asyncio.create_task(run())
+    try:
+        while (msg := await events.get()) is not None:
+            await websocket.send_json(msg)
     finally:
-        if body.vertical_use_case is not None:
-            if prev_vertical is None:
-                os.environ.pop("PAGI_VERTICAL_USE_CASE", None)
-            else:
-                os.environ["PAGI_VERTICAL_USE_CASE"] = prev_vertical
+        task.cancel()  # client went away mid-session: stop the loop instead of running it to completion
 
 
 class KBMemoryBody(BaseModel):
@@ -277,22 +600,16 @@ class KBMemoryBody(BaseModel):
 
 
 @app.post("/api/memory")
-def api_memory_upsert(body: KBMemoryBody) -> dict:
+async def api_memory_upsert(body: KBMemoryBody) -> dict:
     """Upsert text to personal KB (L4). Proxies to Rust gRPC UpsertVectors. Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        from .pagi_pb import pagi_pb2
         point_id = str(uuid.uuid4())
-        vector = _embed_content(body.content)
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": body.content[:10000]},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name=body.kb_name, points=[point])
-        stub = _get_kb_stub()
-        resp = stub.UpsertVectors(req)
+        vector = await run_in_threadpool(_embed_content, body.content)
+        req = _kb_upsert_request(body.kb_name, point_id, vector, {"content": body.content[:10000]})
+        stub = _get_kb_aio_stub()
+        resp = await stub.UpsertVectors(req)
         return {"success": resp.success, "id": point_id, "upserted_count": resp.upserted_count}
     except grpc.RpcError as e:
         raise HTTPException(status_code=503, detail=f"gRPC L4 upsert failed: {e.code()} {e.details()}")
@@ -306,23 +623,17 @@ class HealthTrackBody(BaseModel):
 
 
 @app.post("/api/health/track")
-def api_health_track(body: HealthTrackBody) -> dict:
+async def api_health_track(body: HealthTrackBody) -> dict:
     """Log health metrics to kb_health. Proxies to UpsertVectors. Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Health KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        from .pagi_pb import pagi_pb2
         point_id = str(uuid.uuid4())
         content = json.dumps(body.metrics)[:10000]
-        vector = _embed_content(content)
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": content},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name="kb_health", points=[point])
-        stub = _get_kb_stub()
-        resp = stub.UpsertVectors(req)
+        vector = await run_in_threadpool(_embed_content, content)
+        req = _kb_upsert_request("kb_health", point_id, vector, {"content": content})
+        stub = _get_kb_aio_stub()
+        resp = await stub.UpsertVectors(req)
         return {"success": resp.success, "id": point_id}
     except grpc.RpcError as e:
         raise HTTPException(status_code=503, detail=f"gRPC L4 health upsert failed: {e.code()} {e.details()}")
@@ -331,7 +642,7 @@ def api_health_track(body: HealthTrackBody) -> dict:
 
 
 @app.get("/api/health/trends")
-def api_health_trends(
+async def api_health_trends(
     query: str,
     period_days: int = 30,
 ) -> dict:
@@ -339,16 +650,10 @@ def api_health_trends(
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Health KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        from .pagi_pb import pagi_pb2
-        vector = _embed_content(query)
-        req = pagi_pb2.SearchRequest(
-            query=query,
-            kb_name="kb_health",
-            limit=min(max(20, 1), 100),
-            query_vector=vector,
-        )
-        stub = _get_kb_stub()
-        resp = stub.SemanticSearch(req)
+        vector = await run_in_threadpool(_embed_content, query)
+        req = _kb_search_request(query, "kb_health", min(max(20, 1), 100), vector)
+        stub = _get_kb_aio_stub()
+        resp = await stub.SemanticSearch(req)
         hits = [
             {"content": h.content_snippet, "score": float(h.score), "metadata": {"document_id": h.document_id}}
             for h in resp.hits
@@ -366,23 +671,17 @@ class FinanceTrackBody(BaseModel):
 
 
 @app.post("/api/finance/track")
-def api_finance_track(body: FinanceTrackBody) -> dict:
+async def api_finance_track(body: FinanceTrackBody) -> dict:
     """Log financial transactions to kb_finance. Proxies to UpsertVectors. Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Finance KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        from .pagi_pb import pagi_pb2
         content = json.dumps(body.transactions)[:10000]
-        vector = _embed_content(content)
+        vector = await run_in_threadpool(_embed_content, content)
         point_id = str(uuid.uuid4())
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": content},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name="kb_finance", points=[point])
-        stub = _get_kb_stub()
-        resp = stub.UpsertVectors(req)
+        req = _kb_upsert_request("kb_finance", point_id, vector, {"content": content})
+        stub = _get_kb_aio_stub()
+        resp = await stub.UpsertVectors(req)
         return {"success": resp.success, "upserted_count": resp.upserted_count}
     except grpc.RpcError as e:
         raise HTTPException(status_code=503, detail=f"gRPC L4 finance upsert failed: {e.code()} {e.details()}")
@@ -391,7 +690,7 @@ def api_finance_track(body: FinanceTrackBody) -> dict:
 
 
 @app.get("/api/finance/summary")
-def api_finance_summary(
+async def api_finance_summary(
     query: str,
     period_days: int = 30,
 ) -> dict:
@@ -399,16 +698,10 @@ def api_finance_summary(
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Finance KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        from .pagi_pb import pagi_pb2
-        vector = _embed_content(query)
-        req = pagi_pb2.SearchRequest(
-            query=query,
-            kb_name="kb_finance",
-            limit=min(max(20, 1), 100),
-            query_vector=vector,
-        )
-        stub = _get_kb_stub()
-        resp = stub.SemanticSearch(req)
+        vector = await run_in_threadpool(_embed_content, query)
+        req = _kb_search_request(query, "kb_finance", min(max(20, 1), 100), vector)
+        stub = _get_kb_aio_stub()
+        resp = await stub.SemanticSearch(req)
         hits = [
             {"content": h.content_snippet, "score": float(h.score), "metadata": {"document_id": h.document_id}}
             for h in resp.hits
@@ -428,10 +721,11 @@ class SocialTrackBody(BaseModel):
     timestamp: str | None = None
 
 
-def _run_l5_skill(skill_name: str, params: dict) -> str:
-    """Load and run an L5 skill by name; return observation string."""
+def _load_l5_skill(skill_name: str):
+    """Load an L5 skill module by name; return (module, params class). Blocking (module load)."""
     from pathlib import Path
     import importlib.util
+    import sys
     skill_path = Path(__file__).resolve().parent / "skills" / f"{skill_name}.py"
     if not skill_path.exists():
         raise ValueError(f"Skill not found: {skill_name}")
@@ -439,16 +733,28 @@ def _run_l5_skill(skill_name: str, params: dict) -> str:
     if spec is None or spec.loader is None:
         raise ValueError(f"Invalid skill module: {skill_name}")
     mod = importlib.util.module_from_spec(spec)
+    # Registered so pydantic can resolve the params model's postponed annotations (e.g. Optional).
+    sys.modules[spec.name] = mod
     spec.loader.exec_module(mod)
     params_cls = getattr(mod, "".join(w.capitalize() for w in skill_name.split("_")) + "Params", None)
     if params_cls is None:
         raise ValueError(f"Params class not found for {skill_name}")
+    return mod, params_cls
+
+
+async def _arun_l5_skill(skill_name: str, params: dict) -> str:
+    """Load and run an L5 skill by name; return observation string. Awaits the skill's `arun` (pooled aio
+    stub) when it has one, else runs the blocking `run` on the threadpool."""
+    mod, params_cls = await run_in_threadpool(_load_l5_skill, skill_name)
     obj = params_cls.model_validate(params)
-    return mod.run(obj)
+    arun = getattr(mod, "arun", None)
+    if arun is not None:
+        return await arun(obj)
+    return await run_in_threadpool(mod.run, obj)
 
 
 @app.post("/api/social/track")
-def api_social_track(body: SocialTrackBody) -> dict:
+async def api_social_track(body: SocialTrackBody) -> dict:
     """Log social activity to kb_social via track_social_activity skill. Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Social KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
@@ -461,14 +767,14 @@ def api_social_track(body: SocialTrackBody) -> dict:
         }
         if body.timestamp is not None:
             params["timestamp"] = body.timestamp
-        result = _run_l5_skill("track_social_activity", params)
+        result = await _arun_l5_skill("track_social_activity", params)
         return {"success": True, "message": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/social/trends")
-def api_social_trends(
+async def api_social_trends(
     period_days: int = 30,
     platform: str | None = None,
 ) -> dict:
@@ -479,7 +785,7 @@ def api_social_trends(
         params = {"period_days": period_days, "kb_name": "kb_social"}
         if platform:
             params["platform"] = platform
-        result = _run_l5_skill("query_social_trends", params)
+        result = await _arun_l5_skill("query_social_trends", params)
         return {"trends": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -491,12 +797,12 @@ class SocialSentimentBody(BaseModel):
 
 
 @app.post("/api/social/sentiment")
-def api_social_sentiment(body: SocialSentimentBody) -> dict:
+async def api_social_sentiment(body: SocialSentimentBody) -> dict:
     """Analyze sentiment of content via social_sentiment skill. Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Social KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        result = _run_l5_skill("social_sentiment", {"content": body.content, "kb_name": "kb_social"})
+        result = await _arun_l5_skill("social_sentiment", {"content": body.content, "kb_name": "kb_social"})
         return {"result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -513,7 +819,7 @@ class EmailTrackBody(BaseModel):
 
 
 @app.post("/api/email/track")
-def api_email_track(body: EmailTrackBody) -> dict:
+async def api_email_track(body: EmailTrackBody) -> dict:
     """Log email event to kb_email via track_email skill. Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Email KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
@@ -530,14 +836,14 @@ def api_email_track(body: EmailTrackBody) -> dict:
             params["recipient"] = body.recipient
         if body.timestamp is not None:
             params["timestamp"] = body.timestamp
-        result = _run_l5_skill("track_email", params)
+        result = await _arun_l5_skill("track_email", params)
         return {"success": True, "message": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/email/history")
-def api_email_history(
+async def api_email_history(
     keyword: str | None = None,
     sender: str | None = None,
     period_days: int = 30,
@@ -551,7 +857,7 @@ def api_email_history(
             params["keyword"] = keyword
         if sender:
             params["sender"] = sender
-        result = _run_l5_skill("query_email_history", params)
+        result = await _arun_l5_skill("query_email_history", params)
         return {"history": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -565,12 +871,12 @@ class EmailDraftBody(BaseModel):
 
 
 @app.post("/api/email/draft")
-def api_email_draft(body: EmailDraftBody) -> dict:
+async def api_email_draft(body: EmailDraftBody) -> dict:
     """Generate email draft via email_draft skill (log-only). Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Email KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        result = _run_l5_skill("email_draft", {
+        result = await _arun_l5_skill("email_draft", {
             "recipient": body.recipient,
             "subject": body.subject,
             "body": body.body,
@@ -593,7 +899,7 @@ class CalendarTrackBody(BaseModel):
 
 
 @app.post("/api/calendar/track")
-def api_calendar_track(body: CalendarTrackBody) -> dict:
+async def api_calendar_track(body: CalendarTrackBody) -> dict:
     """Log calendar event to kb_calendar via track_calendar_event skill. Gated by PAGI_ALLOW_LOCAL_DISPATCH or vertical personal."""
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="Calendar KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
@@ -612,14 +918,14 @@ def api_calendar_track(body: CalendarTrackBody) -> dict:
             params["recurring"] = body.recurring
         if body.reminder_minutes is not None:
             params["reminder_minutes"] = body.reminder_minutes
-        result = _run_l5_skill("track_calendar_event", params)
+        result = await _arun_l5_skill("track_calendar_event", params)
         return {"success": True, "message": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/search")
-def api_search(
+async def api_search(
     query: str,
     kb_name: str = "kb_personal",
     limit: int = 20,
@@ -628,16 +934,10 @@ def api_search(
     if not _allow_kb_routes():
         raise HTTPException(status_code=403, detail="KB routes disabled. Set PAGI_ALLOW_LOCAL_DISPATCH=true or PAGI_VERTICAL_USE_CASE=personal.")
     try:
-        from .pagi_pb import pagi_pb2
-        vector = _embed_content(query)
-        req = pagi_pb2.SearchRequest(
-            query=query,
-            kb_name=kb_name,
-            limit=min(max(limit, 1), 100),
-            query_vector=vector,
-        )
-        stub = _get_kb_stub()
-        resp = stub.SemanticSearch(req)
+        vector = await run_in_threadpool(_embed_content, query)
+        req = _kb_search_request(query, kb_name, min(max(limit, 1), 100), vector)
+        stub = _get_kb_aio_stub()
+        resp = await stub.SemanticSearch(req)
         hits = [
             {"content": h.content_snippet, "score": float(h.score), "metadata": {"document_id": h.document_id}}
             for h in resp.hits
@@ -674,17 +974,16 @@ def llm_gateway(req: LLMGatewayRequest):
 
     # If the bridge is configured to route actions through Rust, require the orchestrator
     # to approve LLM gateway usage (policy gate).
-    if _env_truthy("PAGI_ACTIONS_VIA_GRPC", default=False):
+    cfg = get_settings()
+    if cfg.actions_via_grpc:
         try:
-            _grpc_gate_llm_gateway(
-                (req.model or os.environ.get("PAGI_OPENROUTER_MODEL") or "openrouter/auto").strip()
-            )
+            _grpc_gate_llm_gateway((req.model or cfg.openrouter_model or "openrouter/auto").strip())
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=503, detail=f"Orchestrator gate unavailable: {e!s}") from e
 
-    if not _env_truthy("PAGI_ALLOW_OUTBOUND", default=False):
+    if not cfg.allow_outbound:
         raise HTTPException(
             status_code=403,
             detail="Outbound LLM calls are disabled. Set PAGI_ALLOW_OUTBOUND=true in the bridge environment.",
@@ -698,7 +997,7 @@ def llm_gateway(req: LLMGatewayRequest):
             detail="Missing API key. Set it in Settings (API Key) or in bridge .env as PAGI_OPENROUTER_API_KEY.",
         )
 
-    model = (req.model or os.environ.get("PAGI_OPENROUTER_MODEL") or "openrouter/auto").strip()
+    model = (req.model or cfg.openrouter_model or "openrouter/auto").strip()
     temperature = float(req.temperature) if req.temperature is not None else 0.7
 
     try:
@@ -49,6 +49,11 @@ class PagiStub(object):
                 request_serializer=pagi__pb2.ActionRequest.SerializeToString,
                 response_deserializer=pagi__pb2.ActionResponse.FromString,
                 _registered_method=True)
+        self.ExecuteActionStream = channel.stream_stream(
+                '/pagi.Pagi/ExecuteActionStream',
+                request_serializer=pagi__pb2.ActionStreamRequest.SerializeToString,
+                response_deserializer=pagi__pb2.ActionStreamResponse.FromString,
+                _registered_method=True)
         self.SelfHeal = channel.unary_unary(
                 '/pagi.Pagi/SelfHeal',
                 request_serializer=pagi__pb2.HealRequest.SerializeToString,
@@ -103,6 +108,14 @@ class PagiServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ExecuteActionStream(self, request_iterator, context):
+        """Session-scoped dispatch: many actions pipelined over one stream. Each request runs as soon as it
+        arrives; responses carry its call_id and may come back in any order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SelfHeal(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -157,6 +170,11 @@ def add_PagiServicer_to_server(servicer, server):
                     request_deserializer=pagi__pb2.ActionRequest.FromString,
                     response_serializer=pagi__pb2.ActionResponse.SerializeToString,
             ),
+            'ExecuteActionStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.ExecuteActionStream,
+                    request_deserializer=pagi__pb2.ActionStreamRequest.FromString,
+                    response_serializer=pagi__pb2.ActionStreamResponse.SerializeToString,
+            ),
             'SelfHeal': grpc.unary_unary_rpc_method_handler(
                     servicer.SelfHeal,
                     request_deserializer=pagi__pb2.HealRequest.FromString,
@@ -279,6 +297,33 @@ class Pagi(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ExecuteActionStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/pagi.Pagi/ExecuteActionStream',
+            pagi__pb2.ActionStreamRequest.SerializeToString,
+            pagi__pb2.ActionStreamResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SelfHeal(request,
             target,
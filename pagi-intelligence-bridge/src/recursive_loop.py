@@ -10,25 +10,40 @@ Key invariants:
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import os
 import subprocess
 import importlib.util
 import traceback
+from contextlib import nullcontext
+from contextvars import ContextVar
 import json
 import re
+import threading
+import time
 import uuid
-import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
 from datetime import datetime
 from itertools import islice
 from pathlib import Path
 
+from collections.abc import Callable, Generator
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
 import grpc
 
+from .action_log import write_record
+from .action_memo import IDEMPOTENT_SKILLS, current_memo, memo_session
+from .agent_events import emit_event
+from .context_packer import count_tokens, pack_context
+from .grpc_client import AioChannelPool, sync_channel
+from .llm_cache import LLMResponseCache
 from .pagi_pb import pagi_pb2, pagi_pb2_grpc
+from .self_heal_queue import SelfHealQueue, SelfHealReport
+from .settings import get_settings
 
 try:
     import litellm
@@ -40,47 +55,31 @@ MAX_RECURSION_DEPTH = int(os.environ.get("PAGI_MAX_RECURSION_DEPTH", "5"))
 PEEK_MAX_CHARS = int(os.environ.get("PAGI_PEEK_MAX_CHARS", "2000"))
 
 
-def _env_truthy(name: str, default: bool = False) -> bool:
-    val = os.environ.get(name)
-    if val is None:
-        return default
-    return val.strip().lower() in {"1", "true", "yes", "y", "on"}
-
-
-def _mock_mode() -> bool:
-    return _env_truthy("PAGI_MOCK_MODE", default=False)
-
-
+# Hot-path flags come from the cached settings snapshot (src/settings.py), not per-call os.environ reads.
 def _actions_via_grpc() -> bool:
-    return _env_truthy("PAGI_ACTIONS_VIA_GRPC", default=False)
+    return get_settings().actions_via_grpc
 
 
 def _allow_local_dispatch() -> bool:
-    return _env_truthy("PAGI_ALLOW_LOCAL_DISPATCH", default=False)
+    return get_settings().allow_local_dispatch
 
 
 def _allow_real_dispatch() -> bool:
     """When true, bridge sends timeout_ms (and optional allow_list_hash) for Rust-mediated execution."""
-    return _env_truthy("PAGI_ALLOW_REAL_DISPATCH", default=False)
-
-
-def _vertical_use_case() -> str:
-    """Configurable vertical. Supported: research (self-patch), codegen (AI codegen), code_review (analyze → run_tests → save to reviewed/), personal (web dev/coding, personal KB, generate/run code, save to L5). Enables vertical-specific prompts and synthesis hooks."""
-    return (os.environ.get("PAGI_VERTICAL_USE_CASE") or "").strip().lower()
-
-
-def _auto_evolve_enabled() -> bool:
-    return _env_truthy("PAGI_AUTO_EVOLVE_SKILLS", default=False)
+    return get_settings().allow_real_dispatch
 
 
 def _allow_self_heal_grpc() -> bool:
     """When true, bridge calls orchestrator ProposePatch/ApplyPatch via gRPC on error (gated for safety)."""
-    return _env_truthy("PAGI_ALLOW_SELF_HEAL_GRPC", default=False)
+    return get_settings().allow_self_heal_grpc
+
 
+def _local_dispatch_allow_list() -> frozenset[str]:
+    return _LOCAL_DISPATCH_ALLOW_LIST
 
-def _local_dispatch_allow_list() -> set[str]:
-    # Minimal surface: allow-listed L5 stubs; execute_skill enables chaining; list_dir/list_files_recursive for discovery; analyze_code for RCA; evolve_skill_from_patch for auto-evolve; search_codebase for pattern search; run_tests for pytest/cargo; personal vertical: track_health, track_health_metrics, query_health_trends, health_reminder, manage_finance, track_transactions, get_balance_summary, budget_alert, track_investment, get_portfolio_summary, investment_alert, post_social, manage_email.
-    return {"peek_file", "save_skill", "execute_skill", "list_dir", "read_entire_file_safe", "write_file_safe", "list_files_recursive", "analyze_code", "evolve_skill_from_patch", "search_codebase", "run_tests", "run_python_code_safe", "track_health", "track_health_metrics", "query_health_trends", "health_reminder", "manage_finance", "track_transactions", "get_balance_summary", "budget_alert", "track_investment", "get_portfolio_summary", "investment_alert", "track_social_activity", "query_social_trends", "social_sentiment", "post_social", "manage_email", "track_email", "query_email_history", "email_draft", "track_calendar_event"}
+
+# Minimal surface: allow-listed L5 stubs; execute_skill enables chaining; list_dir/list_files_recursive for discovery; analyze_code for RCA; evolve_skill_from_patch for auto-evolve; search_codebase for pattern search; run_tests for pytest/cargo; personal vertical: track_health, track_health_metrics, query_health_trends, health_reminder, manage_finance, track_transactions, get_balance_summary, budget_alert, track_investment, get_portfolio_summary, investment_alert, post_social, manage_email.
+_LOCAL_DISPATCH_ALLOW_LIST = frozenset({"peek_file", "save_skill", "execute_skill", "list_dir", "read_entire_file_safe", "write_file_safe", "list_files_recursive", "analyze_code", "evolve_skill_from_patch", "search_codebase", "run_tests", "run_python_code_safe", "track_health", "track_health_metrics", "query_health_trends", "health_reminder", "manage_finance", "track_transactions", "get_balance_summary", "budget_alert", "track_investment", "get_portfolio_summary", "investment_alert", "track_social_activity", "query_social_trends", "social_sentiment", "post_social", "manage_email", "track_email", "query_email_history", "email_draft", "track_calendar_event"})
 
 
 _skill_module_cache: dict[str, tuple[float, Any]] = {}
@@ -93,7 +92,8 @@ def _load_local_skill_module(skill_name: str):
 
     # Hot path optimization: cache imported modules by mtime to avoid repeated disk I/O + import work.
     # Disable with PAGI_DISABLE_SKILL_IMPORT_CACHE=true for rapid iteration.
-    if not _env_truthy("PAGI_DISABLE_SKILL_IMPORT_CACHE", default=False):
+    use_cache = not get_settings().disable_skill_import_cache
+    if use_cache:
         try:
             mtime = skill_path.stat().st_mtime
             cached = _skill_module_cache.get(skill_name)
@@ -109,7 +109,7 @@ def _load_local_skill_module(skill_name: str):
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)
 
-    if not _env_truthy("PAGI_DISABLE_SKILL_IMPORT_CACHE", default=False):
+    if use_cache:
         try:
             _skill_module_cache[skill_name] = (skill_path.stat().st_mtime, mod)
         except OSError:
@@ -159,7 +159,7 @@ def _execute_action_locally(action: ActionSpec) -> tuple[str, bool, str]:
 
 def _grpc_addr() -> str:
     # Keep consistent with Rust default in [`pagi-core-orchestrator/src/main.rs`](pagi-core-orchestrator/src/main.rs:123)
-    return os.environ.get("PAGI_GRPC_ADDR") or "[::1]:50051"
+    return get_settings().grpc_addr
 
 
 _grpc_channel: grpc.Channel | None = None
@@ -170,45 +170,120 @@ def _get_grpc_stub() -> pagi_pb2_grpc.PagiStub:
     global _grpc_channel, _grpc_stub
     if _grpc_stub is not None:
         return _grpc_stub
-    _grpc_channel = grpc.insecure_channel(_grpc_addr())
+    _grpc_channel = sync_channel(_grpc_addr())
     _grpc_stub = pagi_pb2_grpc.PagiStub(_grpc_channel)
     return _grpc_stub
 
 
-def _actions_log_path() -> Optional[str]:
-    # Accept both names to avoid churn across configs.
-    return os.environ.get("PAGI_AGENT_ACTIONS_LOG") or os.environ.get("PAGI_ACTIONS_LOG")
+def _aio_stub_factory(channel: grpc.aio.Channel) -> pagi_pb2_grpc.PagiStub:
+    from .embed_and_upsert import PagiKBStub  # sends packed KB requests as is
 
+    return PagiKBStub(channel)
 
-_actions_logger: logging.Logger | None = None
-_actions_logger_path: str | None = None
 
+# The one aio channel pool of the process: async actions here, KB routes and async skills in main.
+_aio_pool = AioChannelPool(_aio_stub_factory)
+
+
+def _get_grpc_aio_stub(addr: str | None = None) -> pagi_pb2_grpc.PagiStub:
+    """Async stub from the shared aio channel pool (PAGI_GRPC_POOL_SIZE channels per address, round-robin)."""
+    return _aio_pool.stub(addr or _grpc_addr(), size=get_settings().grpc_pool_size)
+
+
+class _ActionStream:
+    """One ExecuteActionStream call carrying many actions: requests are pipelined, responses matched by call_id.
+
+    Bound to the event loop it was opened on. When the stream ends or fails, every pending call fails
+    with ConnectionError and `_get_action_stream` opens a new one for the next action.
+    """
+
+    def __init__(self, stub: pagi_pb2_grpc.PagiStub) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        self._outbox: asyncio.Queue[pagi_pb2.ActionStreamRequest | None] = asyncio.Queue()
+        self._pending: dict[str, asyncio.Future[pagi_pb2.ActionResponse]] = {}
+        self._call = stub.ExecuteActionStream(self._requests())
+        self._reader = self.loop.create_task(self._read())
+
+    async def _requests(self):
+        while (msg := await self._outbox.get()) is not None:
+            yield msg
+
+    async def _read(self) -> None:
+        reason = "stream ended"
+        try:
+            async for resp in self._call:
+                fut = self._pending.pop(resp.call_id, None)
+                if fut is not None and not fut.done():
+                    fut.set_result(resp.result)
+        except Exception as e:
+            reason = str(e) or type(e).__name__
+        finally:
+            self.closed = True
+            for fut in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(ConnectionError(f"ExecuteActionStream closed: {reason}"))
+            self._pending.clear()
+
+    async def execute(self, req: pagi_pb2.ActionRequest, timeout: float = 10.0) -> pagi_pb2.ActionResponse:
+        if self.closed:
+            raise ConnectionError("ExecuteActionStream closed")
+        call_id = uuid.uuid4().hex
+        fut = self.loop.create_future()
+        self._pending[call_id] = fut
+        self._outbox.put_nowait(pagi_pb2.ActionStreamRequest(call_id=call_id, action=req))
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"no response within {timeout:g}s") from None
+        finally:
+            self._pending.pop(call_id, None)
+
+    async def close(self) -> None:
+        self.closed = True
+        self._outbox.put_nowait(None)
+        self._call.cancel()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
+
+
+_action_stream: _ActionStream | None = None
 
-def _log_action(line: str) -> None:
-    """Append to actions log with a cached FileHandler (avoids per-call open/close)."""
-    path = _actions_log_path()
-    if not path:
-        return
 
-    global _actions_logger, _actions_logger_path
+def _get_action_stream() -> _ActionStream:
+    """Shared ExecuteActionStream on the aio channel; reopened after it closes or when the loop changes."""
+    global _action_stream
+    stream = _action_stream
+    if stream is None or stream.closed or stream.loop is not asyncio.get_running_loop():
+        stream = _action_stream = _ActionStream(_get_grpc_aio_stub())
+    return stream
+
+
+async def _close_grpc_aio() -> None:
+    global _action_stream
+    if _action_stream is not None:
+        stream, _action_stream = _action_stream, None
+        if stream.loop is asyncio.get_running_loop():
+            await stream.close()
+    await _aio_pool.close()
+
+
+def _log_action(line: str, event: str = "log", *, echo: bool = False, **fields: Any) -> None:
+    """Queue an action-log record (src/action_log.py): `line` for the text log shared with the
+    orchestrator (and stdout with `echo` under PAGI_VERBOSE_ACTIONS), `event` + `fields` for the JSONL log.
+    """
+    cfg = get_settings()
     try:
-        if _actions_logger is None or _actions_logger_path != path:
-            logger = logging.getLogger("pagi.actions")
-            logger.setLevel(logging.INFO)
-            logger.propagate = False
-            # Replace handlers if log path changed.
-            for h in list(logger.handlers):
-                logger.removeHandler(h)
-                try:
-                    h.close()
-                except Exception:
-                    pass
-            handler = logging.FileHandler(path, encoding="utf-8")
-            handler.setFormatter(logging.Formatter("%(message)s"))
-            logger.addHandler(handler)
-            _actions_logger = logger
-            _actions_logger_path = path
-        _actions_logger.info(line.rstrip())
+        write_record(
+            line,
+            event=event,
+            text_path=cfg.actions_log,
+            jsonl_path=cfg.actions_jsonl_log,
+            echo=echo and cfg.verbose_actions,
+            **fields,
+        )
     except Exception:
         # Observability should not crash the loop.
         return
@@ -243,9 +318,14 @@ class RLMStructuredResponse(BaseModel):
 
     thought: str
     action: Optional[ActionSpec] = None
+    actions: list[ActionSpec] = Field(default_factory=list)  # independent actions, executed concurrently
     observation: Optional[str] = None
     is_final: bool = False
 
+    def planned_actions(self) -> list[ActionSpec]:
+        """`action` (single-action form) followed by `actions`, in the order observations are merged."""
+        return ([self.action] if self.action is not None else []) + list(self.actions)
+
 
 class SynthesisAction(BaseModel):
     """Optional post-synthesis side-effect hook (e.g., trigger auto-evolve)."""
@@ -274,15 +354,26 @@ def peek_file(file_path: str, start: int = 0, end: int = 100) -> str:
 
 
 def _report_self_heal(error_trace: str, component: str) -> None:
-    """Report error to Rust Watchdog for ProposePatch. When PAGI_ALLOW_SELF_HEAL_GRPC=true, calls gRPC ProposePatch then optional ApplyPatch."""
-    log_path = os.environ.get("PAGI_SELF_HEAL_LOG")
+    """Report an error to the Rust Watchdog. Enqueues only (src/self_heal_queue.py): the ProposePatch /
+    ApplyPatch calls (PAGI_ALLOW_SELF_HEAL_GRPC=true) and log writes run on the self-heal worker.
+    """
+    emit_event("error", {"message": error_trace[:500], "component": component})
+    _get_self_heal_queue().submit(error_trace, component, context=get_settings())
+
+
+def _deliver_self_heal(report: SelfHealReport) -> None:
+    """Self-heal worker: gRPC ProposePatch then optional ApplyPatch, logged under the submitter's settings."""
+    cfg = report.context or get_settings()
+    error_trace, component = report.error_trace, report.component
+    fields: dict[str, Any] = {"component": component, "fingerprint": report.fingerprint}
 
-    if _allow_self_heal_grpc():
+    if cfg.allow_self_heal_grpc:
         try:
             stub = _get_grpc_stub()
             req = pagi_pb2.PatchRequest(error_trace=error_trace, component=component)
             propose_resp = stub.ProposePatch(req, timeout=10.0)
             obs_lines = [f"ProposePatch: patch_id={propose_resp.patch_id!r} requires_hitl={propose_resp.requires_hitl}"]
+            fields.update(patch_id=propose_resp.patch_id, requires_hitl=propose_resp.requires_hitl)
             if not propose_resp.requires_hitl:
                 apply_req = pagi_pb2.ApplyRequest(
                     patch_id=propose_resp.patch_id,
@@ -292,22 +383,51 @@ def _report_self_heal(error_trace: str, component: str) -> None:
                 )
                 apply_resp = stub.ApplyPatch(apply_req, timeout=10.0)
                 obs_lines.append(f"ApplyPatch: success={apply_resp.success} commit_hash={apply_resp.commit_hash!r}")
-            if log_path:
-                with open(log_path, "a", encoding="utf-8") as f:
-                    f.write("Self-heal reported (gRPC)\n")
-                    f.write(f"[{component}] {error_trace[:2000]}\n")
-                    f.write("\n".join(obs_lines) + "\n")
+                fields.update(applied=apply_resp.success, commit_hash=apply_resp.commit_hash)
+            header, body = "Self-heal reported (gRPC)", [f"[{component}] {error_trace[:2000]}", *obs_lines]
         except Exception as e:
-            if log_path:
-                with open(log_path, "a", encoding="utf-8") as f:
-                    f.write("Self-heal reported (gRPC failed)\n")
-                    f.write(f"[{component}] {error_trace[:2000]}\n")
-                    f.write(f"grpc_error: {e!s}\n")
+            header, body = "Self-heal reported (gRPC failed)", [f"[{component}] {error_trace[:2000]}", f"grpc_error: {e!s}"]
+            fields["err"] = f"grpc_error: {e!s}"
+    else:
+        header, body = "Self-heal reported", [f"[{component}] {error_trace}"]
+
+    # Occurrences are read last: duplicates keep arriving while the RPCs run.
+    if report.occurrences > 1:
+        header += f" (occurrences={report.occurrences})"
+    write_record(
+        "\n".join([header, *body]),
+        event="self_heal",
+        text_path=cfg.self_heal_log,
+        jsonl_path=cfg.actions_jsonl_log,
+        occurrences=report.occurrences,
+        **fields,
+    )
+
+
+_self_heal_queue: SelfHealQueue | None = None
+_self_heal_queue_lock = threading.Lock()
+
+
+def _get_self_heal_queue() -> SelfHealQueue:
+    global _self_heal_queue
+    with _self_heal_queue_lock:
+        if _self_heal_queue is None:
+            _self_heal_queue = SelfHealQueue(
+                _deliver_self_heal,
+                max_pending=int(os.environ.get("PAGI_SELF_HEAL_QUEUE_MAX", "100")),
+                dedup_window_s=float(os.environ.get("PAGI_SELF_HEAL_DEDUP_SECS", "300")),
+                rate_per_min=float(os.environ.get("PAGI_SELF_HEAL_RATE_PER_MIN", "6")),
+            )
+        return _self_heal_queue
+
 
-    elif log_path:
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write("Self-heal reported\n")
-            f.write(f"[{component}] {error_trace}\n")
+def _close_self_heal_queue(timeout: float = 2.0) -> None:
+    """Deliver queued reports for up to `timeout` and retire the queue (shutdown; tests)."""
+    global _self_heal_queue
+    with _self_heal_queue_lock:
+        queue, _self_heal_queue = _self_heal_queue, None
+    if queue is not None:
+        queue.close(timeout)
 
 
 _JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
@@ -323,9 +443,85 @@ def _parse_structured_response(raw: str) -> RLMStructuredResponse:
     return RLMStructuredResponse.model_validate(data)
 
 
-def _stub_llm_raw_response() -> Optional[str]:
-    """Testing hook: provide an assistant JSON blob without outbound calls."""
-    return os.environ.get("PAGI_RLM_STUB_JSON")
+def _announce_action(action: ActionSpec, reasoning_id: str, mock_mode: bool) -> None:
+    msg = f"EXECUTING: {action.skill_name} mock={mock_mode} reasoning_id={reasoning_id}"
+    _log_action(msg, "action_started", echo=True, skill=action.skill_name, reasoning_id=reasoning_id, mock=mock_mode)
+    emit_event("action_started", {"skill_name": action.skill_name}, reasoning_id)
+
+
+def _memo_lookup(action: ActionSpec, mock_mode: bool) -> tuple[Callable[[tuple[str, bool, str]], tuple[str, bool, str]], tuple[str, bool, str] | None]:
+    """(remember, cached result) for an idempotent skill in the current session; `remember` stores a fresh
+    result and passes it through. Filesystem fingerprints are taken here, before the skill runs."""
+    memo = current_memo()
+    if memo is None or action.skill_name not in IDEMPOTENT_SKILLS or not get_settings().action_memo:
+        return _pass_result, None
+    key, current, hit = memo.lookup(action.skill_name, action.params or {}, mock_mode)
+
+    def remember(result: tuple[str, bool, str]) -> tuple[str, bool, str]:
+        memo.store(key, current, result)
+        return result
+
+    return remember, hit
+
+
+def _pass_result(result: tuple[str, bool, str]) -> tuple[str, bool, str]:
+    return result
+
+
+def _memo_hit(action: ActionSpec, reasoning_id: str, result: tuple[str, bool, str]) -> tuple[str, bool, str]:
+    msg = f"MEMO HIT: {action.skill_name} reasoning_id={reasoning_id}"
+    _log_action(msg, "memo_hit", echo=True, skill=action.skill_name, reasoning_id=reasoning_id)
+    emit_event("action_started", {"skill_name": action.skill_name}, reasoning_id)
+    return _action_completed(action, reasoning_id, result, started=time.perf_counter())
+
+
+# Set in an `_ActionBatch` worker: the worker's completion and the batch's timeout race for this lock.
+_completion_claim: ContextVar[threading.Lock | None] = ContextVar("pagi_completion_claim", default=None)
+
+
+def _action_completed(
+    action: ActionSpec,
+    reasoning_id: str,
+    result: tuple[str, bool, str],
+    started: float | None = None,
+    remember: Callable[[tuple[str, bool, str]], tuple[str, bool, str]] = _pass_result,
+) -> tuple[str, bool, str]:
+    """Log, memoize (`remember`) and emit a finished action, unless its batch already reported it timed out."""
+    claim = _completion_claim.get()
+    if claim is not None and not claim.acquire(blocking=False):
+        return result  # late: the step moved on without it, so it is neither logged nor memoized
+    result = remember(result)
+    obs, ok, err = result
+    duration_ms = round((time.perf_counter() - started) * 1000, 3) if started is not None else None
+    _log_action(
+        "", "action_completed", skill=action.skill_name, reasoning_id=reasoning_id, duration_ms=duration_ms, ok=ok, err=err or None
+    )
+    payload: dict[str, Any] = {"skill_name": action.skill_name, "success": ok, "observation": obs[:PEEK_MAX_CHARS]}
+    if err:
+        payload["error"] = err
+    emit_event("action_completed", payload, reasoning_id)
+    return result
+
+
+def _action_request(action: ActionSpec, *, depth: int, reasoning_id: str, mock_mode: bool) -> pagi_pb2.ActionRequest:
+    req_kw: dict = {
+        "skill_name": action.skill_name,
+        # params_json keeps nested/typed values; the stringified map stays for orchestrators without it.
+        "params": {k: str(v) for k, v in (action.params or {}).items()},
+        "params_json": json.dumps(action.params or {}, default=str),
+        "depth": depth,
+        "reasoning_id": reasoning_id,
+        "mock_mode": mock_mode,
+    }
+    if _allow_real_dispatch():
+        req_kw["timeout_ms"] = 10000
+    return pagi_pb2.ActionRequest(**req_kw)
+
+
+def _action_result(resp: pagi_pb2.ActionResponse) -> tuple[str, bool, str]:
+    if resp.success:
+        return (resp.observation, True, "")
+    return (resp.observation, False, resp.error)
 
 
 def _execute_action(
@@ -336,34 +532,60 @@ def _execute_action(
     mock_mode: bool,
 ) -> tuple[str, bool, str]:
     """Execute an action via Rust gRPC (preferred) or locally (Phase 3)."""
-    skill = action.skill_name
-    params = action.params or {}
-
-    msg = f"EXECUTING: {skill} mock={mock_mode} reasoning_id={reasoning_id}"
-    if _env_truthy("PAGI_VERBOSE_ACTIONS", default=True):
-        print(msg)
-    _log_action(msg)
+    remember, hit = _memo_lookup(action, mock_mode)
+    if hit is not None:
+        return _memo_hit(action, reasoning_id, hit)
+    started = time.perf_counter()
+    _announce_action(action, reasoning_id, mock_mode)
 
     # Prefer Rust-mediated execution to preserve polyglot hierarchy + stable schema.
     if _actions_via_grpc():
         try:
             stub = _get_grpc_stub()
-            req_kw: dict = {
-                "skill_name": skill,
-                "params": {k: str(v) for k, v in params.items()},
-                "depth": depth,
-                "reasoning_id": reasoning_id,
-                "mock_mode": mock_mode,
-            }
-            if _allow_real_dispatch():
-                req_kw["timeout_ms"] = 10000
-            req = pagi_pb2.ActionRequest(**req_kw)
-            resp = stub.ExecuteAction(req, timeout=10.0)
-            if resp.success:
-                return (resp.observation, True, "")
-            return (resp.observation, False, resp.error)
+            req = _action_request(action, depth=depth, reasoning_id=reasoning_id, mock_mode=mock_mode)
+            result = _action_result(stub.ExecuteAction(req, timeout=10.0))
         except Exception as e:
-            return ("Action failed", False, f"grpc_error:{e!s}")
+            result = ("Action failed", False, f"grpc_error:{e!s}")
+    else:
+        result = _execute_action_in_process(action, mock_mode)
+    return _action_completed(action, reasoning_id, result, started, remember)
+
+
+async def _aexecute_action(
+    action: ActionSpec,
+    *,
+    depth: int,
+    reasoning_id: str,
+    mock_mode: bool,
+) -> tuple[str, bool, str]:
+    """Async `_execute_action`: ExecuteAction over grpc.aio; in-process skills block, so they run on a worker thread."""
+    # Fingerprinting stats (or walks) the filesystem: off the event loop for skills that are memoized.
+    lookup = asyncio.to_thread if action.skill_name in IDEMPOTENT_SKILLS else _call_inline
+    remember, hit = await lookup(_memo_lookup, action, mock_mode)
+    if hit is not None:
+        return _memo_hit(action, reasoning_id, hit)
+    started = time.perf_counter()
+    _announce_action(action, reasoning_id, mock_mode)
+
+    if _actions_via_grpc():
+        try:
+            req = _action_request(action, depth=depth, reasoning_id=reasoning_id, mock_mode=mock_mode)
+            if get_settings().actions_grpc_stream:
+                resp = await _get_action_stream().execute(req, timeout=10.0)
+            else:
+                resp = await _get_grpc_aio_stub().ExecuteAction(req, timeout=10.0)
+            result = _action_result(resp)
+        except Exception as e:
+            result = ("Action failed", False, f"grpc_error:{e!s}")
+    else:
+        result = await asyncio.to_thread(_execute_action_in_process, action, mock_mode)
+    return _action_completed(action, reasoning_id, result, started, remember)
+
+
+def _execute_action_in_process(action: ActionSpec, mock_mode: bool) -> tuple[str, bool, str]:
+    """Non-gRPC execution: gated local dispatch, mock observation, or the bare-metal built-ins."""
+    skill = action.skill_name
+    params = action.params or {}
 
     # Optional local dispatch (gated + allow-listed).
     if _allow_local_dispatch():
@@ -406,72 +628,537 @@ def _execute_action(
         return ("Action failed", False, str(e))
 
 
+_llm_cache_instance: LLMResponseCache | None = None
+_llm_cache_version = -1
+_llm_cache_embedder: Callable[[str], Any] | None = None
+_llm_cache_lock = threading.Lock()
+
+
+def set_llm_cache_embedder(embed: Callable[[str], Any] | None) -> None:
+    """Embedding function for the semantic tier (main registers `_embed_content`, sharing its model/cache)."""
+    global _llm_cache_embedder
+    _llm_cache_embedder = embed
+    if _llm_cache_instance is not None:
+        _llm_cache_instance.embed = embed
+
+
+def _llm_cache() -> LLMResponseCache:
+    """Shared structured-step response cache (PAGI_LLM_CACHE_MAX_ENTRIES / _TTL_SECS / _SEMANTIC_THRESHOLD).
+
+    Opt-in (max entries default 0): a hit replays the cached answer's actions, not just its text.
+    Emptied when the settings version moves: answers planned under the previous config are stale.
+    """
+    global _llm_cache_instance, _llm_cache_version
+    if _llm_cache_instance is None:
+        with _llm_cache_lock:
+            if _llm_cache_instance is None:
+                threshold = (os.environ.get("PAGI_LLM_CACHE_SEMANTIC_THRESHOLD") or "").strip()
+                _llm_cache_instance = LLMResponseCache(
+                    max_entries=int(os.environ.get("PAGI_LLM_CACHE_MAX_ENTRIES", "0")),
+                    ttl_s=float(os.environ.get("PAGI_LLM_CACHE_TTL_SECS", "600")),
+                    semantic_threshold=float(threshold) if threshold else None,
+                    embed=_llm_cache_embedder,
+                )
+    version = get_settings().version
+    if version != _llm_cache_version:
+        _llm_cache_version = version
+        _llm_cache_instance.clear()
+    return _llm_cache_instance
+
+
+class _FanoutBudget:
+    """Limits shared by every loop under one root sub-query fan-out (children, grandchildren, ...).
+
+    Concurrency is capped on LLM calls, not on child loops, so a parent waiting on its children never
+    holds a slot they need. The token budget is soft: it is checked before each fan-out or delegation
+    call and charged (prompt + completion) after each call, so one wave may overrun it.
+    """
+
+    def __init__(self, concurrency: int, tokens: int) -> None:
+        self.thread_slots = threading.BoundedSemaphore(concurrency)
+        self.task_slots = asyncio.Semaphore(concurrency)
+        self.tokens_left = tokens
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.tokens_left <= 0
+
+    def charge(self, kwargs: dict, content: Optional[str]) -> None:
+        model = kwargs.get("model")
+        used = sum(count_tokens(m["content"], model) for m in kwargs["messages"]) + count_tokens(content or "", model)
+        with self._lock:
+            self.tokens_left -= used
+
+
+_fanout_budget: ContextVar[_FanoutBudget | None] = ContextVar("pagi_fanout_budget", default=None)
+
+
+class _Completion:
+    """Loop effect: one LLM chat completion; the step generator is sent the message content (may be None).
+
+    With `cache=True` the response cache is consulted first and filled on success; the semantic tier
+    embeds only `user_query` (default: the last message), within the scope of model + system prompt +
+    `depth` + `context`, so a similar query over a different context is a miss.
+    """
+
+    def __init__(
+        self, *, cache: bool = False, user_query: str | None = None, depth: int = 0, context: str = "", **kwargs: Any
+    ) -> None:
+        self.kwargs = kwargs
+        self.cache = _llm_cache() if cache else None
+        if self.cache is not None:
+            model, messages = kwargs["model"], kwargs["messages"]
+            system = next((m["content"] for m in messages if m["role"] == "system"), "")
+            self.key = LLMResponseCache.key(model, messages)
+            self.scope = LLMResponseCache.scope(model, system, depth, context)
+            self.text = user_query if user_query is not None else messages[-1]["content"]
+
+    def _call(self) -> Optional[str]:
+        budget = _fanout_budget.get()
+        with budget.thread_slots if budget is not None else nullcontext():
+            content = litellm.completion(**self.kwargs).choices[0].message.content
+        if budget is not None:
+            budget.charge(self.kwargs, content)
+        return content
+
+    async def _acall(self) -> Optional[str]:
+        budget = _fanout_budget.get()
+        async with budget.task_slots if budget is not None else nullcontext():
+            content = (await litellm.acompletion(**self.kwargs)).choices[0].message.content
+        if budget is not None:
+            budget.charge(self.kwargs, content)
+        return content
+
+    def run(self) -> Optional[str]:
+        if self.cache is None:
+            return self._call()
+        hit = self.cache.get(self.key, self.scope, self.text)
+        if hit is not None:
+            return hit
+        t0 = time.perf_counter()
+        content = self._call()
+        if content:
+            self.cache.put(self.key, content, time.perf_counter() - t0, self.scope, self.text)
+        return content
+
+    async def arun(self) -> Optional[str]:
+        if self.cache is None:
+            return await self._acall()
+        # The semantic tier embeds on the model, which blocks; exact-only lookups are cheap enough inline.
+        offload = asyncio.to_thread if self.cache.semantic else _call_inline
+        hit = await offload(self.cache.get, self.key, self.scope, self.text)
+        if hit is not None:
+            return hit
+        t0 = time.perf_counter()
+        content = await self._acall()
+        if content:
+            await offload(self.cache.put, self.key, content, time.perf_counter() - t0, self.scope, self.text)
+        return content
+
+
+async def _call_inline(fn: Callable[..., Any], *args: Any) -> Any:
+    return fn(*args)
+
+
+class _Action:
+    """Loop effect: execute one action; the step generator is sent (observation, ok, error).
+
+    Created where the loop plans the action, so that is where `action_planned` (and `search_issued` for
+    KB-backed skills, i.e. params with a kb_name) are emitted.
+    """
+
+    def __init__(self, action: ActionSpec, *, depth: int, reasoning_id: str, mock_mode: bool) -> None:
+        self.action = action
+        self.kw = {"depth": depth, "reasoning_id": reasoning_id, "mock_mode": mock_mode}
+        params = {k: str(v) for k, v in (action.params or {}).items()}
+        emit_event("action_planned", {"skill_name": action.skill_name, "params": params, "depth": depth}, reasoning_id)
+        if "kb_name" in params:
+            search = {"kb_name": params["kb_name"], "query": params.get("query", ""), "limit": int(params.get("limit") or 10)}
+            emit_event("search_issued", search, reasoning_id)
+
+    def run(self) -> tuple[str, bool, str]:
+        return _execute_action(self.action, **self.kw)
+
+    async def arun(self) -> tuple[str, bool, str]:
+        return await _aexecute_action(self.action, **self.kw)
+
+
+class _SelfHeal:
+    """Loop effect: report an error trace to the Watchdog (`_report_self_heal`)."""
+
+    def __init__(self, error_trace: str, component: str) -> None:
+        self.args = (error_trace, component)
+
+    def run(self) -> None:
+        _report_self_heal(*self.args)
+
+    async def arun(self) -> None:
+        _report_self_heal(*self.args)  # enqueue only: nothing to await
+
+
+class _SaveSkill:
+    """Loop effect: `save_skill` (writes the file and validates it in a subprocess, so it is off the event loop)."""
+
+    def __init__(self, filename: str, code: str) -> None:
+        self.args = (filename, code)
+
+    def run(self) -> None:
+        save_skill(*self.args)
+
+    async def arun(self) -> None:
+        await asyncio.to_thread(save_skill, *self.args)
+
+
+class _ActionBatch:
+    """Loop effect: the independent actions of one step; the step generator is sent their
+    (observation, ok, error) results in plan order.
+
+    At most `action_concurrency` run at once and each gets `action_timeout_s` from its start; a late
+    action yields a `timeout:` error. A running worker is not interrupted, but its eventual result is
+    neither logged nor memoized; actions still queued at their deadline are cancelled without starting.
+    """
+
+    def __init__(self, actions: list[_Action]) -> None:
+        cfg = get_settings()
+        self.actions = actions
+        self.concurrency = cfg.action_concurrency
+        self.timeout_s = cfg.action_timeout_s
+
+    def _timed_out(self, effect: _Action, started: bool = True) -> tuple[str, bool, str]:
+        result = ("Action failed", False, f"timeout:{self.timeout_s:g}s" + ("" if started else " (not started)"))
+        started = time.perf_counter() - self.timeout_s
+        return _action_completed(effect.action, effect.kw["reasoning_id"], result, started)
+
+    def run(self) -> list[tuple[str, bool, str]]:
+        workers = min(self.concurrency, len(self.actions))
+        started: list[float | None] = [None] * len(self.actions)
+        claims = [threading.Lock() for _ in self.actions]
+
+        def call(i: int, effect: _Action) -> tuple[str, bool, str]:
+            started[i] = time.monotonic()
+            _completion_claim.set(claims[i])
+            return effect.run()
+
+        def deadline(i: int) -> float:
+            # Not started yet: assume it waits one timeout per wave of workers ahead of it.
+            return (started[i] or t0 + self.timeout_s * (i // workers)) + self.timeout_s
+
+        t0 = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pagi-action")
+        try:
+            # One context copy per task: settings scope and event sink follow the action into its worker.
+            futures = [pool.submit(contextvars.copy_context().run, call, i, a) for i, a in enumerate(self.actions)]
+            results = []
+            for i, future in enumerate(futures):
+                while True:
+                    try:
+                        results.append(future.result(timeout=max(0.0, deadline(i) - time.monotonic())))
+                    except FuturesTimeoutError:
+                        if deadline(i) > time.monotonic():
+                            continue  # started after we began waiting: its own deadline is further out
+                        if future.cancel():
+                            results.append(self._timed_out(self.actions[i], started=False))
+                        elif claims[i].acquire(blocking=False):
+                            results.append(self._timed_out(self.actions[i]))
+                        else:
+                            continue  # finished (and was logged) just now: collect its result
+                    except Exception as e:
+                        results.append(("Action failed", False, str(e)))
+                    break
+            return results
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def arun(self) -> list[tuple[str, bool, str]]:
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def one(effect: _Action) -> tuple[str, bool, str]:
+            async with slots:
+                try:
+                    return await asyncio.wait_for(effect.arun(), self.timeout_s)
+                except asyncio.TimeoutError:
+                    return self._timed_out(effect)
+                except Exception as e:
+                    return ("Action failed", False, str(e))
+
+        return list(await asyncio.gather(*(one(a) for a in self.actions)))
+
+
+class _ChainStep:
+    """One node of a vertical chain: `action` (or a builder from the finished nodes' results) run once the
+    nodes named in `after` have completed."""
+
+    def __init__(
+        self,
+        name: str,
+        action: ActionSpec | Callable[[dict[str, tuple[str, bool, str]]], ActionSpec],
+        after: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.action = action
+        self.after = after
+
+
+class _ActionGraph:
+    """Loop effect: a post-synthesis chain as a dependency graph; the step generator is sent
+    {step name: (observation, ok, error)}.
+
+    Every step whose dependencies are done is launched at once, so independent branches (e.g. run_tests
+    next to analyze_code → write_file_safe) overlap. Each completion is logged as it lands.
+    """
+
+    def __init__(self, steps: list[_ChainStep], *, depth: int) -> None:
+        seen: set[str] = set()
+        for step in steps:
+            if step.name in seen or not seen.issuperset(step.after):
+                raise ValueError(f"chain step {step.name!r}: duplicate name or dependency not declared before it")
+            seen.add(step.name)
+        self.steps = steps
+        self.depth = depth
+
+    def _ready(self, pending: dict[str, _ChainStep], results: dict) -> list[tuple[str, _Action]]:
+        ready = []
+        for name, step in list(pending.items()):
+            if all(d in results for d in step.after):
+                del pending[name]
+                action = step.action(results) if callable(step.action) else step.action
+                ready.append((name, _Action(action, depth=self.depth, reasoning_id=str(uuid.uuid4()), mock_mode=False)))
+        return ready
+
+    @staticmethod
+    def _done(results: dict, name: str, result: tuple[str, bool, str]) -> None:
+        results[name] = result
+        obs, ok, err = result
+        _log_action(f"CHAIN: {name} ok={ok} err={err} obs={obs[:200]}", "chain_step", step=name, ok=ok, err=err or None)
+
+    def run(self) -> dict[str, tuple[str, bool, str]]:
+        results: dict[str, tuple[str, bool, str]] = {}
+        pending = {step.name: step for step in self.steps}
+        running: dict[Any, str] = {}
+        pool = ThreadPoolExecutor(max_workers=len(self.steps), thread_name_prefix="pagi-chain")
+        try:
+            while pending or running:
+                for name, effect in self._ready(pending, results):
+                    running[pool.submit(contextvars.copy_context().run, effect.run)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self._done(results, name, future.result())
+                    except Exception as e:
+                        self._done(results, name, ("Action failed", False, str(e)))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    async def arun(self) -> dict[str, tuple[str, bool, str]]:
+        results: dict[str, tuple[str, bool, str]] = {}
+        pending = {step.name: step for step in self.steps}
+        running: dict[asyncio.Task, str] = {}
+        try:
+            while pending or running:
+                for name, effect in self._ready(pending, results):
+                    running[asyncio.ensure_future(effect.arun())] = name
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    try:
+                        self._done(results, name, task.result())
+                    except Exception as e:
+                        self._done(results, name, ("Action failed", False, str(e)))
+        finally:
+            for task in running:
+                task.cancel()
+        return results
+
+
+class _SubQueries:
+    """Loop effect: solve child queries with their own loops, concurrently; the step generator is sent their
+    RLMSummary results in order.
+
+    The root fan-out creates the `_FanoutBudget` its whole subtree shares (children see it via the context).
+    """
+
+    def __init__(self, queries: list[RLMQuery]) -> None:
+        cfg = get_settings()
+        self.queries = queries
+        self.budget = _fanout_budget.get() or _FanoutBudget(cfg.subquery_concurrency, cfg.subquery_token_budget)
+
+    def _child_context(self) -> contextvars.Context:
+        ctx = contextvars.copy_context()
+        ctx.run(_fanout_budget.set, self.budget)
+        return ctx
+
+    def run(self) -> list[RLMSummary]:
+        with ThreadPoolExecutor(max_workers=len(self.queries), thread_name_prefix="pagi-subquery") as pool:
+            futures = [pool.submit(self._child_context().run, recursive_loop, q) for q in self.queries]
+            return [f.result() for f in futures]
+
+    async def arun(self) -> list[RLMSummary]:
+        # create_task copies the running context, so create each task inside its child context.
+        tasks = [self._child_context().run(asyncio.create_task, arecursive_loop(q)) for q in self.queries]
+        return list(await asyncio.gather(*tasks))
+
+
+_DECOMPOSE_PROMPT = (
+    "If the query has independent parts, split it into at most {width} self-contained sub-queries. "
+    'Then respond ONLY as JSON: {{"sub_queries": [string]}}. Otherwise answer the query directly in plain text.'
+)
+
+
+def _parse_sub_queries(content: Optional[str], width: int) -> list[str]:
+    """Sub-queries from a decomposition reply; [] when the reply is not the expected JSON."""
+    try:
+        data = json.loads(_strip_json_fences(content or ""))
+    except ValueError:
+        return []
+    subs = data.get("sub_queries") if isinstance(data, dict) else None
+    if not isinstance(subs, list):
+        return []
+    return [q.strip() for q in subs if isinstance(q, str) and q.strip()][:width]
+
+
+_LoopSteps = Generator[Any, Any, RLMSummary]
+
+
+def _run_steps(steps: _LoopSteps) -> RLMSummary:
+    """Drive the step generator with blocking effects (sync `recursive_loop`)."""
+    value: Any = None
+    error: Exception | None = None
+    while True:
+        try:
+            effect = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as done:
+            return done.value
+        value, error = None, None
+        try:
+            value = effect.run()
+        except Exception as e:  # raised at the yield, so the loop's own try/except sees it
+            error = e
+
+
+async def _arun_steps(steps: _LoopSteps) -> RLMSummary:
+    """Drive the step generator with awaited effects (`arecursive_loop`)."""
+    value: Any = None
+    error: Exception | None = None
+    while True:
+        try:
+            effect = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as done:
+            return done.value
+        value, error = None, None
+        try:
+            value = await effect.arun()
+        except Exception as e:
+            error = e
+
+
+def _converged(out: RLMSummary) -> RLMSummary:
+    if out.converged:
+        emit_event("converged", {"summary": out.summary})
+    return out
+
+
+def _memo_scope():
+    """A fresh action-memo session unless the caller (multi-turn session, parent fan-out) provides one."""
+    return memo_session() if current_memo() is None else nullcontext()
+
+
 def recursive_loop(query: RLMQuery) -> RLMSummary:
     """Peek / delegate / synthesize loop. Circuit breaker at depth > 5."""
-    try:
-        return _recursive_loop_impl(query)
-    except Exception:
-        error_trace = traceback.format_exc()
-        _report_self_heal(error_trace, "python_skill")
-        return RLMSummary(
-            summary=f"Self-heal reported: {error_trace[:500]}",
-            converged=False,
-        )
+    with _memo_scope():
+        try:
+            return _converged(_run_steps(_loop_steps(query)))
+        except Exception:
+            error_trace = traceback.format_exc()
+            _report_self_heal(error_trace, "python_skill")
+            return RLMSummary(
+                summary=f"Self-heal reported: {error_trace[:500]}",
+                converged=False,
+            )
+
+
+async def arecursive_loop(query: RLMQuery) -> RLMSummary:
+    """Async `recursive_loop`: litellm.acompletion, ExecuteAction over grpc.aio, blocking skills on worker
+    threads. A session waiting on the LLM holds no thread, so one process can serve many concurrently.
+    """
+    with _memo_scope():
+        try:
+            return _converged(await _arun_steps(_loop_steps(query)))
+        except Exception:
+            error_trace = traceback.format_exc()
+            _report_self_heal(error_trace, "python_skill")
+            return RLMSummary(
+                summary=f"Self-heal reported: {error_trace[:500]}",
+                converged=False,
+            )
 
 
-def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
-    """Inner implementation; exceptions bubble for self-heal capture."""
+def _packed_user_prompt(query: RLMQuery, context: str, model: str, system_prompt: str = "") -> str:
+    """User message for `query` with `context` packed so system + user prompt fit the token budget (0: unpacked)."""
+    cfg = get_settings()
+    budget = cfg.context_max_tokens
+    if budget > 0:
+        bare = query.model_copy(update={"context": ""}).model_dump_json()
+        fixed = count_tokens(system_prompt, model) + count_tokens(bare, model)
+        context = pack_context(context, max(0, budget - fixed), model, obs_max_tokens=cfg.context_obs_max_tokens)
+    prompt = query.model_copy(update={"context": context}).model_dump_json()
+    tokens = count_tokens(system_prompt, model) + count_tokens(prompt, model)
+    _log_action(f"PROMPT: tokens={tokens} budget={budget}", "prompt", tokens=tokens, budget=budget)
+    return prompt
+
+
+def _loop_steps(query: RLMQuery) -> _LoopSteps:
+    """Loop body as a generator: yields _Completion/_Action/_SelfHeal effects and is sent their results,
+    so the sync and async entrypoints share one implementation. Exceptions bubble for self-heal capture.
+    """
     if query.depth >= MAX_RECURSION_DEPTH:
         return RLMSummary(summary="Depth limit reached", converged=False)
 
     context = query.context
-    # Optional cap for multi-turn context accumulation (character-based).
-    max_chars = os.environ.get("PAGI_MULTI_TURN_CONTEXT_MAX_CHARS") or os.environ.get("PAGI_MULTI_TURN_CONTEXT_MAX_TOKENS")
-    if max_chars is not None:
-        try:
-            cap = int(max_chars)
-            if len(context) > cap:
-                context = context[-cap:]
-        except ValueError:
-            pass
+    # One settings snapshot per step, so a concurrent /api/config swap cannot change flags mid-step.
+    cfg = get_settings()
+    vertical = cfg.vertical_use_case
+    dispatch_enabled = cfg.allow_local_dispatch or cfg.actions_via_grpc
 
     # Request-level override: mock_mode=false forces real RLM even when PAGI_MOCK_MODE=true (e.g. from UI).
-    mock_mode = query.mock_mode if query.mock_mode is not None else _mock_mode()
-    allow_outbound = _env_truthy("PAGI_ALLOW_OUTBOUND", default=False)
-    enforce_structured = _env_truthy("PAGI_ENFORCE_STRUCTURED", default=True)
+    mock_mode = query.mock_mode if query.mock_mode is not None else cfg.mock_mode
+    allow_outbound = cfg.allow_outbound
+    enforce_structured = cfg.enforce_structured
 
     # Phase 3 MockMode: deterministic chain testing without outbound calls.
     if mock_mode:
         print("Mock mode active – returning generic response")
         rid = str(uuid.uuid4())
+        emit_event("thought", {"thought": f"MockMode: plan mock_skill for {query.query[:200]}", "depth": query.depth}, rid)
         action = ActionSpec(
             skill_name="mock_skill",
             params={"query": query.query, "depth": query.depth, "reasoning_id": rid},
         )
-        obs, ok, err = _execute_action(action, depth=query.depth, reasoning_id=rid, mock_mode=True)
+        obs, ok, err = yield _Action(action, depth=query.depth, reasoning_id=rid, mock_mode=True)
         summary = f"MockMode thought: planned={action.skill_name}; ok={ok}; err={err}; {obs}"
         return RLMSummary(summary=summary, converged=True)
 
     # Structured JSON enforcement (no outbound by default):
     # - If PAGI_RLM_STUB_JSON is set, parse and act on it.
     # - If PAGI_ALLOW_OUTBOUND=true and litellm is available, request a structured JSON response.
-    stub = _stub_llm_raw_response()
+    stub = cfg.rlm_stub_json
     if enforce_structured and (stub is not None or (allow_outbound and litellm is not None)):
         try:
             if stub is not None:
                 raw = stub
             else:
-                system_prompt = os.environ.get(
-                    "PAGI_SYSTEM_PROMPT",
-                    "Respond ONLY as JSON: {thought: string, action?: {skill_name, params}, observation?: string, is_final: bool}",
-                )
-                if _vertical_use_case() == "research":
+                system_prompt = cfg.system_prompt
+                if system_prompt is None:
+                    system_prompt = "Respond ONLY as JSON: {thought: string, action?: {skill_name, params}, actions?: [{skill_name, params}] (independent actions, run concurrently), observation?: string, is_final: bool}"
+                if vertical == "research":
                     system_prompt = system_prompt + " Prioritize self-patch for errors: RCA → propose code → save to L5."
-                elif _vertical_use_case() == "codegen":
+                elif vertical == "codegen":
                     system_prompt = system_prompt + " Prioritize generating code (snippets, tests, refactors). Always end with action: write_file_safe to codegen_output/<filename>"
-                elif _vertical_use_case() == "code_review":
+                elif vertical == "code_review":
                     system_prompt = system_prompt + " Prioritize code review: analyze for issues, propose fixes, run_tests, save reviewed code."
-                elif _vertical_use_case() == "personal":
+                elif vertical == "personal":
                     system_prompt = system_prompt + " Handle personal health/finance/social/email with dedicated KBs, prioritize privacy/safety. Prioritize web dev/coding tasks, use personal KB, generate/run code, save to L5. Prefer search_codebase, analyze_code, run_tests, write_file_safe."
                     # Feature flags from frontend: enable specific personal sub-features
                     if getattr(query, "feature_flags", None) and isinstance(query.feature_flags, dict):
@@ -496,36 +1183,49 @@ def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
                         system_prompt = system_prompt + " For email/message/draft: use kb_email. Prefer email skills chain: track_email (log sent/received/draft), query_email_history (history/patterns), email_draft (generate draft, log-only)."
                     if "calendar" in q or "event" in q or "schedule" in q or "reminder" in q:
                         system_prompt = system_prompt + " For calendar/event/schedule/reminder: use kb_calendar. Prefer track_calendar_event (log events, recurring, reminders)."
-                resp = litellm.completion(
-                    model=os.environ.get("PAGI_OPENROUTER_MODEL", "openrouter/auto"),
+                model = cfg.openrouter_model
+                content = yield _Completion(
+                    cache=True,
+                    user_query=query.query,
+                    depth=query.depth,
+                    context=context,
+                    model=model,
                     messages=[
                         {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": query.model_dump_json()},
+                        {"role": "user", "content": _packed_user_prompt(query, context, model, system_prompt)},
                     ],
                 )
-                raw = resp.choices[0].message.content or "{}"
+                raw = content or "{}"
 
             parsed = _parse_structured_response(raw)
-            _log_action(f"THOUGHT: {parsed.thought}")
-
-            if parsed.action is not None:
-                rid = str(parsed.action.params.get("reasoning_id") or "") if parsed.action.params else ""
-                rid = rid or str(uuid.uuid4())
-                obs, ok, err = _execute_action(
-                    parsed.action,
-                    depth=query.depth,
-                    reasoning_id=rid,
-                    mock_mode=mock_mode,
-                )
+            _log_action(f"THOUGHT: {parsed.thought}", "thought", depth=query.depth)
+
+            planned = parsed.planned_actions()
+            rids = [str((a.params or {}).get("reasoning_id") or "") or str(uuid.uuid4()) for a in planned]
+            emit_event("thought", {"thought": parsed.thought, "depth": query.depth}, rids[0] if rids else None)
+            effects = [
+                _Action(a, depth=query.depth, reasoning_id=rid, mock_mode=mock_mode) for a, rid in zip(planned, rids)
+            ]
+            if len(effects) == 1:
+                obs, ok, err = yield effects[0]
                 context += f"\nObservation: {obs}"
-                _log_action(f"OBSERVATION: ok={ok} err={err} obs={obs[:200]}")
+                _log_action(f"OBSERVATION: ok={ok} err={err} obs={obs[:200]}", "observation", skill=planned[0].skill_name, reasoning_id=rids[0], ok=ok, err=err or None)
+            elif effects:
+                results = yield _ActionBatch(effects)
+                # Plan order, whatever order they finished in: the prompt (and cache key) stays deterministic.
+                for i, (a, (obs, ok, err)) in enumerate(zip(planned, results), start=1):
+                    context += f"\nObservation: [{i}] {a.skill_name}: {obs}"
+                    _log_action(
+                        f"OBSERVATION: [{i}] {a.skill_name} ok={ok} err={err} obs={obs[:200]}",
+                        "observation", skill=a.skill_name, reasoning_id=rids[i - 1], ok=ok, err=err or None,
+                    )
 
             if parsed.is_final:
                 summary = parsed.thought
                 # Vertical: codegen — when converged, force write_file_safe to codegen_output/<timestamp>.py with generated code from thought (gated by dispatch).
-                if _vertical_use_case() == "codegen" and (_allow_local_dispatch() or _actions_via_grpc()):
-                    codegen_dir = os.environ.get("PAGI_CODEGEN_OUTPUT_DIR", "codegen_output")
-                    root = os.environ.get("PAGI_PROJECT_ROOT", ".")
+                if vertical == "codegen" and dispatch_enabled:
+                    codegen_dir = cfg.codegen_output_dir
+                    root = cfg.project_root
                     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                     codegen_path = str(Path(root) / codegen_dir / f"{ts}.py")
                     codegen_action = ActionSpec(
@@ -537,12 +1237,12 @@ def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
                         },
                     )
                     rid = str(uuid.uuid4())
-                    obs, ok, err = _execute_action(codegen_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
+                    obs, ok, err = yield _Action(codegen_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
                     summary = f"{summary}\nCodegen write: ok={ok} err={err}; obs={obs[:200]}"
                 # Vertical: code_review — when converged, force chain analyze_code → run_tests → write_file_safe to reviewed/<filename> (gated by dispatch).
-                elif _vertical_use_case() == "code_review" and (_allow_local_dispatch() or _actions_via_grpc()):
-                    root = Path(os.environ.get("PAGI_PROJECT_ROOT", ".")).resolve()
-                    review_dir = os.environ.get("PAGI_CODE_REVIEW_OUTPUT_DIR", "reviewed")
+                elif vertical == "code_review" and dispatch_enabled:
+                    root = Path(cfg.project_root).resolve()
+                    review_dir = cfg.code_review_output_dir
                     out_dir = root / review_dir
                     out_dir.mkdir(parents=True, exist_ok=True)
                     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -559,63 +1259,81 @@ def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
                         skill_name="analyze_code",
                         params={"code": code_for_analysis[:4096], "language": "python", "max_length": 4096},
                     )
-                    rid = str(uuid.uuid4())
-                    analyze_obs, _, _ = _execute_action(analyze_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
                     test_dir = str(root)
                     run_tests_action = ActionSpec(
                         skill_name="run_tests",
                         params={"dir": test_dir, "type": "python", "timeout_sec": 30},
                     )
-                    rid = str(uuid.uuid4())
-                    test_obs, _, _ = _execute_action(run_tests_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
-                    review_content = f"# Code review {ts}\n# RCA: {analyze_obs[:500]}\n\n{parsed.thought}"
-                    write_action = ActionSpec(
-                        skill_name="write_file_safe",
-                        params={"path": review_path, "content": review_content, "overwrite": True},
+
+                    def review_write(done: dict) -> ActionSpec:
+                        review_content = f"# Code review {ts}\n# RCA: {done['analyze'][0][:500]}\n\n{parsed.thought}"
+                        return ActionSpec(
+                            skill_name="write_file_safe",
+                            params={"path": review_path, "content": review_content, "overwrite": True},
+                        )
+
+                    # run_tests on the root does not depend on the analysis: it runs next to analyze → write.
+                    chain = yield _ActionGraph(
+                        [
+                            _ChainStep("analyze", analyze_action),
+                            _ChainStep("tests", run_tests_action),
+                            _ChainStep("write", review_write, after=("analyze",)),
+                        ],
+                        depth=query.depth,
                     )
-                    rid = str(uuid.uuid4())
-                    write_obs, write_ok, write_err = _execute_action(write_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
+                    test_obs = chain["tests"][0]
+                    write_obs, write_ok, write_err = chain["write"]
                     summary = f"{summary}\nCode review: analyze ok; run_tests: {test_obs[:200]}; write: ok={write_ok} err={write_err}; obs={write_obs[:200]}"
                 # Vertical: personal — when converged, force chain search_codebase → analyze_code → run_tests → write_file_safe (gated by dispatch).
-                elif _vertical_use_case() == "personal" and (_allow_local_dispatch() or _actions_via_grpc()):
-                    root = Path(os.environ.get("PAGI_PROJECT_ROOT", ".")).resolve()
+                elif vertical == "personal" and dispatch_enabled:
+                    root = Path(cfg.project_root).resolve()
                     search_action = ActionSpec(
                         skill_name="search_codebase",
                         params={"path": str(root), "pattern": "def |class ", "max_files": 20, "mode": "keyword"},
                     )
-                    rid = str(uuid.uuid4())
-                    search_obs, _, _ = _execute_action(search_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
-                    code_for_analysis = (parsed.thought + "\n" + search_obs)[:4096]
-                    analyze_action = ActionSpec(
-                        skill_name="analyze_code",
-                        params={"code": code_for_analysis, "language": "python", "max_length": 4096},
-                    )
-                    rid = str(uuid.uuid4())
-                    analyze_obs, _, _ = _execute_action(analyze_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
+
+                    def personal_analyze(done: dict) -> ActionSpec:
+                        code_for_analysis = (parsed.thought + "\n" + done["search"][0])[:4096]
+                        return ActionSpec(
+                            skill_name="analyze_code",
+                            params={"code": code_for_analysis, "language": "python", "max_length": 4096},
+                        )
+
                     run_tests_action = ActionSpec(
                         skill_name="run_tests",
                         params={"dir": str(root), "type": "python", "timeout_sec": 30},
                     )
-                    rid = str(uuid.uuid4())
-                    test_obs, _, _ = _execute_action(run_tests_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
-                    personal_dir = os.environ.get("PAGI_CODEGEN_OUTPUT_DIR", "codegen_output")
+                    personal_dir = cfg.codegen_output_dir
                     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                     personal_path = str(root / personal_dir / f"personal_{ts}.py")
                     Path(root / personal_dir).mkdir(parents=True, exist_ok=True)
-                    write_action = ActionSpec(
-                        skill_name="write_file_safe",
-                        params={"path": personal_path, "content": f"# Personal AGI\n# RCA: {analyze_obs[:500]}\n\n{parsed.thought}", "overwrite": True},
+
+                    def personal_write(done: dict) -> ActionSpec:
+                        return ActionSpec(
+                            skill_name="write_file_safe",
+                            params={"path": personal_path, "content": f"# Personal AGI\n# RCA: {done['analyze'][0][:500]}\n\n{parsed.thought}", "overwrite": True},
+                        )
+
+                    # search → analyze → write, with run_tests (independent of all three) alongside.
+                    chain = yield _ActionGraph(
+                        [
+                            _ChainStep("search", search_action),
+                            _ChainStep("analyze", personal_analyze, after=("search",)),
+                            _ChainStep("tests", run_tests_action),
+                            _ChainStep("write", personal_write, after=("analyze",)),
+                        ],
+                        depth=query.depth,
                     )
-                    rid = str(uuid.uuid4())
-                    write_obs, write_ok, write_err = _execute_action(write_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
+                    test_obs = chain["tests"][0]
+                    write_obs, write_ok, write_err = chain["write"]
                     summary = f"{summary}\nPersonal chain: search ok; analyze ok; run_tests: {test_obs[:200]}; write: ok={write_ok}; obs={write_obs[:200]}"
                 # Vertical: self-patch codegen — when converged and query asks for self-patch, write fix to L5 (gated by dispatch).
                 # Optional auto_evolve: when PAGI_AUTO_EVOLVE_SKILLS=true, Watchdog triggers evolve_skill_from_patch after successful python_skill apply.
-                elif "self-patch" in query.query.lower() and _vertical_use_case() == "research":
-                    if _allow_local_dispatch() or _actions_via_grpc():
+                elif "self-patch" in query.query.lower() and vertical == "research":
+                    if dispatch_enabled:
                         fix_content = (context + "\n" + parsed.thought)[:4000]
-                        root = os.environ.get("PAGI_PROJECT_ROOT", ".")
-                        patch_dir = os.environ.get("PAGI_SELF_PATCH_DIR", "patches")
+                        root = cfg.project_root
+                        patch_dir = cfg.self_patch_dir
                         patch_path = str(Path(root) / patch_dir / "patch_rs.txt")
                         patch_action = ActionSpec(
                             skill_name="write_file_safe",
@@ -626,12 +1344,12 @@ def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
                             },
                         )
                         rid = str(uuid.uuid4())
-                        obs, ok, err = _execute_action(patch_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
+                        obs, ok, err = yield _Action(patch_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
                         summary = f"{summary}\nSelf-patch write: ok={ok} err={err}; obs={obs[:200]}"
 
                 # Optional "auto_evolve" action in synthesis when vertical==research and is_final.
                 # Emit marker only; evolution is gated and performed by Rust Watchdog after apply/commit.
-                if _vertical_use_case() == "research" and _auto_evolve_enabled():
+                if vertical == "research" and cfg.auto_evolve_skills:
                     try:
                         synth = SynthesisAction(name="auto_evolve", params={"enabled": True})
                         summary = f"{summary}\nSYNTHESIS_ACTION:{synth.model_dump_json()}"
@@ -641,7 +1359,7 @@ def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
             return RLMSummary(summary=parsed.thought, converged=False)
         except Exception as e:
             error_trace = f"Schema enforcement failed: {e!s}"
-            _report_self_heal(error_trace, "python_skill")
+            yield _SelfHeal(error_trace, "python_skill")
             return RLMSummary(summary=error_trace, converged=False)
 
     # Peeking: if context signals large-file, try to peek (generic; verticals override)
@@ -654,37 +1372,66 @@ def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
                 context += f"\nPeeked: {peeked[:PEEK_MAX_CHARS]}"
 
     # Delegation: outbound delegation is disabled unless PAGI_ALLOW_OUTBOUND=true.
-    if allow_outbound and "complex" in query.query.lower():
+    # PAGI_DELEGATION_MODE=decompose: the model may split the query; each sub-query runs as a child loop at
+    # depth + 1, concurrently, and the child summaries are merged as Sub-summary records.
+    subs_converged = False
+    budget = _fanout_budget.get()
+    if budget is not None and budget.exhausted and "complex" in query.query.lower():
+        context += "\nSub-summary: (fan-out token budget exhausted)"
+    elif allow_outbound and "complex" in query.query.lower():
         if litellm is not None:
             try:
-                resp = litellm.completion(
-                    model=os.environ.get("PAGI_OPENROUTER_MODEL", "openrouter/auto"),
-                    messages=[{"role": "user", "content": query.model_dump_json()}],
-                )
-                sub_summary = resp.choices[0].message.content or ""
-                context += f"\nSub-summary: {sub_summary[:PEEK_MAX_CHARS]}"
+                model = cfg.openrouter_model
+                decompose = cfg.delegation_mode == "decompose" and query.depth + 1 < MAX_RECURSION_DEPTH
+                messages = [{"role": "user", "content": _packed_user_prompt(query, context, model)}]
+                if decompose:
+                    messages.insert(0, {"role": "system", "content": _DECOMPOSE_PROMPT.format(width=cfg.subquery_max_width)})
+                content = yield _Completion(model=model, messages=messages)
+                sub_queries = _parse_sub_queries(content, cfg.subquery_max_width) if decompose else []
+                if sub_queries:
+                    children = [
+                        RLMQuery(
+                            query=sub,
+                            context=f"Parent query: {query.query}",
+                            depth=query.depth + 1,
+                            feature_flags=query.feature_flags,
+                            mock_mode=query.mock_mode,
+                        )
+                        for sub in sub_queries
+                    ]
+                    outs = yield _SubQueries(children)
+                    subs_converged = all(out.converged for out in outs)
+                    for i, (sub, out) in enumerate(zip(sub_queries, outs), start=1):
+                        context += f"\nSub-summary: [{i}] {sub}: {out.summary[:PEEK_MAX_CHARS]}"
+                        _log_action(
+                            f"SUB-SUMMARY: [{i}] depth={query.depth + 1} converged={out.converged} {sub}: {out.summary[:200]}",
+                            "sub_summary", depth=query.depth + 1, converged=out.converged,
+                        )
+                else:
+                    sub_summary = content or ""
+                    context += f"\nSub-summary: {sub_summary[:PEEK_MAX_CHARS]}"
             except Exception as e:
                 context += f"\nSub-error: {e!s}"
         else:
             context += "\nSub-summary: (litellm not available)"
 
     # Synthesis: generic convergence check (placeholder; verticals override)
-    converged = "resolved" in context.lower() or query.depth >= MAX_RECURSION_DEPTH - 1
+    converged = "resolved" in context.lower() or subs_converged or query.depth >= MAX_RECURSION_DEPTH - 1
 
     # Skill save if validated (L5 traceability)
     if converged and "save_skill" in query.query.lower():
         try:
-            save_skill("new_skill.py", "# Generic skill code\nprint('Executed')")
+            yield _SaveSkill("new_skill.py", "# Generic skill code\nprint('Executed')")
         except ValueError:
             pass
 
     # Vertical: self-patch codegen — in fallback synthesis, if query asks for self-patch and dispatch allowed, write fix stub.
     summary_final = "Synthesized generic response"
-    if converged and "self-patch" in query.query.lower() and _vertical_use_case() == "research":
-        if _allow_local_dispatch() or _actions_via_grpc():
+    if converged and "self-patch" in query.query.lower() and vertical == "research":
+        if dispatch_enabled:
             fix_content = (context or "")[:2000]
-            root = os.environ.get("PAGI_PROJECT_ROOT", ".")
-            patch_dir = os.environ.get("PAGI_SELF_PATCH_DIR", "patches")
+            root = cfg.project_root
+            patch_dir = cfg.self_patch_dir
             patch_path = str(Path(root) / patch_dir / "patch_rs.txt")
             patch_action = ActionSpec(
                 skill_name="write_file_safe",
@@ -695,7 +1442,7 @@ def _recursive_loop_impl(query: RLMQuery) -> RLMSummary:
                 },
             )
             rid = str(uuid.uuid4())
-            obs, ok, err = _execute_action(patch_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
+            obs, ok, err = yield _Action(patch_action, depth=query.depth, reasoning_id=rid, mock_mode=False)
             summary_final = f"Self-patch synthesis: ok={ok}; obs={obs[:200]}"
 
     return RLMSummary(summary=summary_final, converged=converged)
@@ -711,7 +1458,7 @@ def save_skill(filename: str, code: str) -> None:
     path.write_text(code, encoding="utf-8")
     try:
         subprocess.run(
-            [os.environ.get("PAGI_PYTHON", "python"), str(path)],
+            [get_settings().python, str(path)],
             check=True,
             capture_output=True,
             timeout=10,
@@ -0,0 +1,161 @@
+"""Background, deduplicating queue for self-heal reports (`recursive_loop._report_self_heal`).
+
+The error path only fingerprints the trace and enqueues, so its cost no longer depends on the
+orchestrator: one daemon worker delivers reports (ProposePatch / ApplyPatch, self-heal log), at most
+`rate_per_min` per minute. The fingerprint is the exception type plus the normalized stack frames
+(file name and function; no line numbers, paths or message text). A trace whose fingerprint was
+queued or delivered within `dedup_window_s` is not queued again: it bumps that report's
+`occurrences` counter, which is delivered with the report if it is still waiting. At most
+`max_pending` reports wait; beyond that new ones are dropped and counted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+_FRAME_RE = re.compile(r'^\s*File "([^"]+)", line \d+, in (\S+)', re.MULTILINE)
+_VOLATILE_RE = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+def trace_fingerprint(error_trace: str, component: str = "") -> str:
+    frames = [f"{os.path.basename(path)}:{func}" for path, func in _FRAME_RE.findall(error_trace)]
+    if frames:
+        # Last unindented line is the exception ("ValueError: message"): keep only its type.
+        heads = [line for line in error_trace.strip().splitlines() if line and not line[0].isspace()]
+        exc = heads[-1].split(":", 1)[0] if heads else ""
+    else:  # not a traceback: the text itself, without ids and counters
+        exc = _VOLATILE_RE.sub("#", error_trace.strip())[:500]
+    blob = "\n".join([component, exc, *frames])
+    return hashlib.sha256(blob.encode("utf-8", "replace")).hexdigest()[:16]
+
+
+@dataclass
+class SelfHealReport:
+    fingerprint: str
+    error_trace: str
+    component: str
+    first_seen: float
+    context: Any = None  # submitter's state the delivery needs (e.g. its settings snapshot)
+    occurrences: int = 1
+
+
+class SelfHealQueue:
+    """Bounded report queue drained by one worker thread, started on first submit."""
+
+    def __init__(
+        self,
+        deliver: Callable[[SelfHealReport], None],
+        max_pending: int = 100,
+        dedup_window_s: float = 300.0,
+        rate_per_min: float = 6.0,
+    ) -> None:
+        self._deliver = deliver
+        self.max_pending = max_pending
+        self.dedup_window_s = dedup_window_s
+        self.min_interval_s = 60.0 / rate_per_min if rate_per_min > 0 else 0.0
+        self._pending: deque[SelfHealReport] = deque()
+        self._recent: OrderedDict[str, SelfHealReport] = OrderedDict()  # by first_seen
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._in_flight = False
+        self._closed = False
+        self._drain_until = 0.0
+        self._next_send = 0.0
+        self.submitted = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+
+    def submit(self, error_trace: str, component: str, context: Any = None) -> bool:
+        """Queue a report, or count it against a recent duplicate. True if a new report was queued."""
+        fingerprint = trace_fingerprint(error_trace, component)
+        now = time.monotonic()
+        with self._cond:
+            self.submitted += 1
+            while self._recent:
+                oldest = next(iter(self._recent.values()))
+                if now - oldest.first_seen < self.dedup_window_s:
+                    break
+                self._recent.popitem(last=False)
+            recent = self._recent.get(fingerprint)
+            if recent is not None:
+                recent.occurrences += 1
+                self.deduplicated += 1
+                return False
+            if self._closed or len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            report = SelfHealReport(fingerprint, error_trace, component, now, context)
+            self._recent[fingerprint] = report
+            self._pending.append(report)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pagi-self-heal", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    if self._closed and (not self._pending or now >= self._drain_until):
+                        self.dropped += len(self._pending)
+                        self._pending.clear()
+                        self._cond.notify_all()
+                        return
+                    if self._pending and (self._closed or now >= self._next_send):
+                        break
+                    self._cond.wait(self._next_send - now if self._pending else None)
+                report = self._pending.popleft()
+                self._in_flight = True
+            try:
+                self._deliver(report)
+                ok = True
+            except Exception:
+                ok = False
+            with self._cond:
+                self._in_flight = False
+                self.delivered += ok
+                self.failed += not ok
+                self._next_send = time.monotonic() + self.min_interval_s
+                self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued report has been delivered; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Deliver what is queued, ignoring the rate limit, for up to `timeout`; drop the rest."""
+        with self._cond:
+            self._closed = True
+            self._drain_until = time.monotonic() + timeout
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout + 1.0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "recent": [
+                    {"fingerprint": r.fingerprint, "component": r.component, "occurrences": r.occurrences}
+                    for r in self._recent.values()
+                ],
+            }
@@ -0,0 +1,209 @@
+"""Typed settings snapshot for the bridge hot path (recursive_loop, main routes, skills).
+
+The PAGI_* variables read per request are parsed once into a frozen `Settings`; readers call
+`get_settings()` (one global read) instead of `os.environ`. `apply_overrides` (POST /api/config) and
+`reload_settings` write the environment and swap in a new snapshot atomically, bumping `version`, so
+caches that depend on config (e.g. the LLM response cache in recursive_loop) can invalidate.
+
+`scoped_settings` overlays request-scoped changes (e.g. the /rlm-multi-turn vertical) through a
+ContextVar: visible to the current task and the worker threads it starts (asyncio.to_thread copies the
+context), never to concurrent requests.
+
+The snapshot is taken at import: writing os.environ directly is not seen until `reload_settings()`
+(tests get this from the `monkeypatch` fixture in tests/conftest.py). Knobs read once when a shared
+object is built (embed model, batcher, cache, aio channel pool) are snapshot fields too, so they are
+picked up when that object is next built.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+_TRUTHY = frozenset({"1", "true", "yes", "y", "on"})
+
+
+def _truthy(env: Mapping[str, str], name: str, default: bool = False) -> bool:
+    val = env.get(name)
+    if val is None:
+        return default
+    return val.strip().lower() in _TRUTHY
+
+
+def _int(env: Mapping[str, str], name: str, default: int) -> int:
+    try:
+        return int((env.get(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _float(env: Mapping[str, str], name: str, default: float) -> float:
+    try:
+        return float((env.get(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _context_max_tokens(env: Mapping[str, str]) -> int:
+    """PAGI_MULTI_TURN_CONTEXT_MAX_TOKENS; legacy PAGI_MULTI_TURN_CONTEXT_MAX_CHARS at ~4 chars/token.
+
+    0 (the default, as when neither is set) means no budget: context is passed whole.
+    """
+    for name, per_token in (("PAGI_MULTI_TURN_CONTEXT_MAX_TOKENS", 1), ("PAGI_MULTI_TURN_CONTEXT_MAX_CHARS", 4)):
+        raw = (env.get(name) or "").strip()
+        if raw:
+            try:
+                return max(0, int(raw) // per_token)
+            except ValueError:
+                pass
+    return 0
+
+
+@dataclass(frozen=True)
+class Settings:
+    version: int
+    mock_mode: bool
+    allow_outbound: bool
+    enforce_structured: bool
+    actions_via_grpc: bool
+    actions_grpc_stream: bool  # async path: pipeline actions over one ExecuteActionStream instead of unary calls
+    allow_local_dispatch: bool
+    allow_real_dispatch: bool
+    allow_self_heal_grpc: bool
+    auto_evolve_skills: bool
+    disable_skill_import_cache: bool
+    action_memo: bool  # reuse idempotent skill results within a reasoning session (src/action_memo.py)
+    verbose_actions: bool
+    vertical_use_case: str  # research | codegen | code_review | personal; selects prompts and synthesis chains
+    rlm_stub_json: str | None  # testing hook: assistant JSON blob used instead of an outbound call
+    openrouter_model: str
+    system_prompt: str | None
+    grpc_addr: str
+    kb_grpc_addr: str  # [::1]:PAGI_GRPC_PORT: KB routes and L5 skills
+    grpc_pool_size: int  # aio channels per address in the shared pool (src/grpc_client.py)
+    embed_model: str
+    embed_backend: str  # torch | onnx (src/embed_backends.py)
+    embed_preload: bool  # warm the model and skill registry on startup; /ready waits for it
+    embed_batch_max_size: int
+    embed_batch_wait_ms: float
+    embed_cache_max_mb: float
+    actions_log: str | None
+    actions_jsonl_log: str | None  # structured action log (src/action_log.py)
+    self_heal_log: str | None
+    project_root: str
+    codegen_output_dir: str
+    code_review_output_dir: str
+    self_patch_dir: str
+    python: str
+    poetry: str
+    context_max_tokens: int  # 0: no budget
+    context_obs_max_tokens: int
+    action_concurrency: int  # max actions of one multi-action step in flight at once
+    action_timeout_s: float  # deadline per action within a multi-action step
+    delegation_mode: str  # single (one sub-summary completion) | decompose (sub-queries solved by child loops)
+    subquery_max_width: int
+    subquery_concurrency: int  # max concurrent LLM calls across one fan-out tree
+    subquery_token_budget: int  # tokens (prompt + completion) one fan-out tree may spend
+
+    @property
+    def allow_kb_routes(self) -> bool:
+        """L4 KB routes are open with local dispatch or the personal vertical."""
+        return self.allow_local_dispatch or self.vertical_use_case == "personal"
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] | None = None, version: int = 0) -> Settings:
+        env = os.environ if env is None else env
+        return cls(
+            version=version,
+            mock_mode=_truthy(env, "PAGI_MOCK_MODE"),
+            allow_outbound=_truthy(env, "PAGI_ALLOW_OUTBOUND"),
+            enforce_structured=_truthy(env, "PAGI_ENFORCE_STRUCTURED", default=True),
+            actions_via_grpc=_truthy(env, "PAGI_ACTIONS_VIA_GRPC"),
+            actions_grpc_stream=_truthy(env, "PAGI_ACTIONS_GRPC_STREAM"),
+            allow_local_dispatch=_truthy(env, "PAGI_ALLOW_LOCAL_DISPATCH"),
+            allow_real_dispatch=_truthy(env, "PAGI_ALLOW_REAL_DISPATCH"),
+            allow_self_heal_grpc=_truthy(env, "PAGI_ALLOW_SELF_HEAL_GRPC"),
+            auto_evolve_skills=_truthy(env, "PAGI_AUTO_EVOLVE_SKILLS"),
+            disable_skill_import_cache=_truthy(env, "PAGI_DISABLE_SKILL_IMPORT_CACHE"),
+            action_memo=_truthy(env, "PAGI_ACTION_MEMO", default=True),
+            verbose_actions=_truthy(env, "PAGI_VERBOSE_ACTIONS", default=True),
+            vertical_use_case=(env.get("PAGI_VERTICAL_USE_CASE") or "").strip().lower(),
+            rlm_stub_json=env.get("PAGI_RLM_STUB_JSON"),
+            openrouter_model=env.get("PAGI_OPENROUTER_MODEL", "openrouter/auto"),
+            system_prompt=env.get("PAGI_SYSTEM_PROMPT"),
+            grpc_addr=env.get("PAGI_GRPC_ADDR") or "[::1]:50051",
+            kb_grpc_addr=f"[::1]:{env.get('PAGI_GRPC_PORT', '50051')}",
+            grpc_pool_size=max(1, _int(env, "PAGI_GRPC_POOL_SIZE", 2)),
+            embed_model=env.get("PAGI_EMBED_MODEL", "all-MiniLM-L6-v2"),
+            embed_backend=env.get("PAGI_EMBED_BACKEND", "torch").strip().lower(),
+            embed_preload=_truthy(env, "PAGI_EMBED_PRELOAD"),
+            embed_batch_max_size=_int(env, "PAGI_EMBED_BATCH_MAX_SIZE", 32),
+            embed_batch_wait_ms=_float(env, "PAGI_EMBED_BATCH_WAIT_MS", 5.0),
+            embed_cache_max_mb=_float(env, "PAGI_EMBED_CACHE_MAX_MB", 64.0),
+            actions_log=env.get("PAGI_AGENT_ACTIONS_LOG") or env.get("PAGI_ACTIONS_LOG"),
+            actions_jsonl_log=env.get("PAGI_ACTIONS_JSONL_LOG") or None,
+            self_heal_log=env.get("PAGI_SELF_HEAL_LOG"),
+            project_root=env.get("PAGI_PROJECT_ROOT", "."),
+            codegen_output_dir=env.get("PAGI_CODEGEN_OUTPUT_DIR", "codegen_output"),
+            code_review_output_dir=env.get("PAGI_CODE_REVIEW_OUTPUT_DIR", "reviewed"),
+            self_patch_dir=env.get("PAGI_SELF_PATCH_DIR", "patches"),
+            python=env.get("PAGI_PYTHON", "python"),
+            poetry=env.get("PAGI_POETRY", "poetry"),
+            context_max_tokens=_context_max_tokens(env),
+            context_obs_max_tokens=_int(env, "PAGI_CONTEXT_OBS_MAX_TOKENS", 512),
+            action_concurrency=max(1, _int(env, "PAGI_ACTION_CONCURRENCY", 4)),
+            action_timeout_s=_float(env, "PAGI_ACTION_TIMEOUT_SECS", 10.0),
+            delegation_mode=(env.get("PAGI_DELEGATION_MODE") or "single").strip().lower(),
+            subquery_max_width=max(1, _int(env, "PAGI_SUBQUERY_MAX_WIDTH", 4)),
+            subquery_concurrency=max(1, _int(env, "PAGI_SUBQUERY_CONCURRENCY", 4)),
+            subquery_token_budget=_int(env, "PAGI_SUBQUERY_TOKEN_BUDGET", 32000),
+        )
+
+
+_lock = threading.Lock()
+_current = Settings.from_env()
+_scoped: ContextVar[Settings | None] = ContextVar("pagi_scoped_settings", default=None)
+
+
+def get_settings() -> Settings:
+    return _scoped.get() or _current
+
+
+@contextmanager
+def scoped_settings(**changes: object) -> Iterator[Settings]:
+    """Apply `changes` (Settings field names) over the current snapshot for this context only.
+
+    The scoped snapshot is fixed for the block: a global swap by /api/config applies to the next request.
+    """
+    settings = dataclasses.replace(get_settings(), **changes)
+    token = _scoped.set(settings)
+    try:
+        yield settings
+    finally:
+        _scoped.reset(token)
+
+
+def reload_settings() -> Settings:
+    """Re-read the environment into a new snapshot (version + 1) and swap it in."""
+    global _current
+    with _lock:
+        _current = Settings.from_env(version=_current.version + 1)
+        return _current
+
+
+def apply_overrides(overrides: Mapping[str, str | None]) -> Settings:
+    """Write `overrides` to os.environ (None unsets) and swap in the resulting snapshot as one step."""
+    global _current
+    with _lock:
+        for name, value in overrides.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        _current = Settings.from_env(version=_current.version + 1)
+        return _current
@@ -14,35 +14,43 @@ class GetBalanceSummaryParams(BaseModel):
     kb_name: str = "kb_finance"
 
 
+def _query(params: GetBalanceSummaryParams) -> str:
+    return f"balance summary transactions last {params.period_days} days"
+
+
+def _summary(hits: list) -> str:
+    if not hits:
+        return "[get_balance_summary] Current balance: (no data in kb_finance)"
+    parts = [f"[get_balance_summary] Current balance: {len(hits)} relevant entries."]
+    for i, h in enumerate(hits[:3], 1):
+        snippet = (h.content_snippet or "")[:150]
+        parts.append(f"  {i}. {snippet}")
+    if len(hits) > 3:
+        parts.append(f"  ... and {len(hits) - 3} more")
+    return "\n".join(parts)
+
+
 def run(params: GetBalanceSummaryParams) -> str:
     """Run semantic search on kb_finance for balance/trends, summarize."""
-    query = f"balance summary transactions last {params.period_days} days"
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _kb_hits
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
-
-        vector = _embed_content(query)
-        req = pagi_pb2.SearchRequest(
-            query=query,
-            kb_name=params.kb_name,
-            limit=20,
-            query_vector=vector,
-        )
-        stub = _get_kb_stub()
-        resp = stub.SemanticSearch(req, timeout=10.0)
-        hits = list(resp.hits) if resp.hits else []
-        if not hits:
-            return "[get_balance_summary] Current balance: (no data in kb_finance)"
-        parts = [f"[get_balance_summary] Current balance: {len(hits)} relevant entries."]
-        for i, h in enumerate(hits[:3], 1):
-            snippet = (h.content_snippet or "")[:150]
-            parts.append(f"  {i}. {snippet}")
-        if len(hits) > 3:
-            parts.append(f"  ... and {len(hits) - 3} more")
-        return "\n".join(parts)
+            from pagi_intelligence_bridge.main import _kb_hits
+
+        return _summary(_kb_hits(_query(params), params.kb_name))
+    except Exception:
+        return "[get_balance_summary] Current balance: (search unavailable; stub)"
+
+
+async def arun(params: GetBalanceSummaryParams) -> str:
+    """`run` for async callers (bridge routes): the search goes through the pooled aio stub."""
+    try:
+        try:
+            from src.main import _akb_hits
+        except ImportError:
+            from pagi_intelligence_bridge.main import _akb_hits
+
+        return _summary(await _akb_hits(_query(params), params.kb_name))
     except Exception:
         return "[get_balance_summary] Current balance: (search unavailable; stub)"
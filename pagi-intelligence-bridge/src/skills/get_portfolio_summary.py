@@ -17,37 +17,46 @@ class GetPortfolioSummaryParams(BaseModel):
     kb_name: str = "kb_finance"
 
 
-def run(params: GetPortfolioSummaryParams) -> str:
-    """Call SemanticSearch via gRPC with query like portfolio performance {period_days}d, aggregate hits, return summary."""
+def _query(params: GetPortfolioSummaryParams) -> str:
     query = f"portfolio performance {params.period_days}d"
     if params.tickers:
         query = f"{query} tickers {', '.join(params.tickers)}"
+    return query
+
+
+def _summary(hits: list) -> str:
+    if not hits:
+        return "[get_portfolio_summary] Current value: (no data in kb_finance); gain/loss %: N/A; top holdings: none"
+    parts = [f"[get_portfolio_summary] Current value: {len(hits)} relevant entries."]
+    for i, h in enumerate(hits[:5], 1):
+        snippet = (h.content_snippet or "")[:150]
+        parts.append(f"  {i}. {snippet}")
+    if len(hits) > 5:
+        parts.append(f"  ... and {len(hits) - 5} more")
+    return "\n".join(parts)
+
+
+def run(params: GetPortfolioSummaryParams) -> str:
+    """Call SemanticSearch via gRPC with query like portfolio performance {period_days}d, aggregate hits, return summary."""
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _kb_hits
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
-
-        vector = _embed_content(query)
-        req = pagi_pb2.SearchRequest(
-            query=query,
-            kb_name=params.kb_name,
-            limit=20,
-            query_vector=vector,
-        )
-        stub = _get_kb_stub()
-        resp = stub.SemanticSearch(req, timeout=10.0)
-        hits = list(resp.hits) if resp.hits else []
-        if not hits:
-            return "[get_portfolio_summary] Current value: (no data in kb_finance); gain/loss %: N/A; top holdings: none"
-        parts = [f"[get_portfolio_summary] Current value: {len(hits)} relevant entries."]
-        for i, h in enumerate(hits[:5], 1):
-            snippet = (h.content_snippet or "")[:150]
-            parts.append(f"  {i}. {snippet}")
-        if len(hits) > 5:
-            parts.append(f"  ... and {len(hits) - 5} more")
-        return "\n".join(parts)
+            from pagi_intelligence_bridge.main import _kb_hits
+
+        return _summary(_kb_hits(_query(params), params.kb_name))
+    except Exception as e:
+        return f"[get_portfolio_summary] (search unavailable): {e!s}"
+
+
+async def arun(params: GetPortfolioSummaryParams) -> str:
+    """`run` for async callers (bridge routes): the search goes through the pooled aio stub."""
+    try:
+        try:
+            from src.main import _akb_hits
+        except ImportError:
+            from pagi_intelligence_bridge.main import _akb_hits
+
+        return _summary(await _akb_hits(_query(params), params.kb_name))
     except Exception as e:
         return f"[get_portfolio_summary] (search unavailable): {e!s}"
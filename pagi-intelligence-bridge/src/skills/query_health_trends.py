@@ -15,36 +15,47 @@ class QueryHealthTrendsParams(BaseModel):
     kb_name: str = "kb_health"
 
 
+def _query(params: QueryHealthTrendsParams) -> str:
+    return params.query.strip()
+
+
+def _summary(hits: list) -> str:
+    if not hits:
+        return "[query_health_trends] Trends: no hits (empty or no match)."
+    parts = [f"[query_health_trends] Trends ({len(hits)} hits):"]
+    for i, h in enumerate(hits[:5], 1):
+        snippet = (h.content_snippet or "")[:200]
+        parts.append(f"  {i}. score={getattr(h, 'score', 0):.2f} {snippet}")
+    if len(hits) > 5:
+        parts.append(f"  ... and {len(hits) - 5} more")
+    return "\n".join(parts)
+
+
 def run(params: QueryHealthTrendsParams) -> str:
     """Run semantic search on kb_health, summarize hits as trends."""
     if not (params.query or "").strip():
         return "[query_health_trends] Trends: (no query)"
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _kb_hits
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
-
-        vector = _embed_content(params.query.strip())
-        req = pagi_pb2.SearchRequest(
-            query=params.query.strip(),
-            kb_name=params.kb_name,
-            limit=20,
-            query_vector=vector,
-        )
-        stub = _get_kb_stub()
-        resp = stub.SemanticSearch(req, timeout=10.0)
-        hits = list(resp.hits) if resp.hits else []
-        if not hits:
-            return "[query_health_trends] Trends: no hits (empty or no match)."
-        parts = [f"[query_health_trends] Trends ({len(hits)} hits):"]
-        for i, h in enumerate(hits[:5], 1):
-            snippet = (h.content_snippet or "")[:200]
-            parts.append(f"  {i}. score={getattr(h, 'score', 0):.2f} {snippet}")
-        if len(hits) > 5:
-            parts.append(f"  ... and {len(hits) - 5} more")
-        return "\n".join(parts)
+            from pagi_intelligence_bridge.main import _kb_hits
+
+        return _summary(_kb_hits(_query(params), params.kb_name))
+    except Exception:
+        return "[query_health_trends] Trends: (search unavailable; stub)"
+
+
+async def arun(params: QueryHealthTrendsParams) -> str:
+    """`run` for async callers (bridge routes): the search goes through the pooled aio stub."""
+    if not (params.query or "").strip():
+        return "[query_health_trends] Trends: (no query)"
+    try:
+        try:
+            from src.main import _akb_hits
+        except ImportError:
+            from pagi_intelligence_bridge.main import _akb_hits
+
+        return _summary(await _akb_hits(_query(params), params.kb_name))
     except Exception:
         return "[query_health_trends] Trends: (search unavailable; stub)"
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import os
 import subprocess
 from pathlib import Path
 
@@ -26,7 +25,12 @@ def _path_under_root(resolved: Path, root: Path) -> bool:
 def run(params: RunTestsParams) -> str:
     """Resolve dir, run pytest (python) or cargo test (rust) with timeout; return stdout/stderr summary or prefixed error."""
     try:
-        root = Path(os.environ.get("PAGI_PROJECT_ROOT", ".")).resolve()
+        try:
+            from src.settings import get_settings
+        except ImportError:
+            from pagi_intelligence_bridge.settings import get_settings
+        settings = get_settings()
+        root = Path(settings.project_root).resolve()
         dir_path = Path(params.dir).resolve()
         if not dir_path.exists():
             return f"[run_tests] Path not found: {params.dir}"
@@ -40,7 +44,7 @@ def run(params: RunTestsParams) -> str:
 
         if test_type == "python":
             cmd = [
-                os.environ.get("PAGI_POETRY", "poetry"),
+                settings.poetry,
                 "run",
                 "pytest",
                 "-v",
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import os
 import re
 from pathlib import Path
 
@@ -35,7 +34,11 @@ def _is_text_file(path: Path) -> bool:
 def run(params: SearchCodebaseParams) -> str:
     """Resolve path, walk dir (cap at max_files), search for pattern; return file:line matches or prefixed error."""
     try:
-        root = Path(os.environ.get("PAGI_PROJECT_ROOT", ".")).resolve()
+        try:
+            from src.settings import get_settings
+        except ImportError:
+            from pagi_intelligence_bridge.settings import get_settings
+        root = Path(get_settings().project_root).resolve()
         dir_path = Path(params.path).resolve()
         if not dir_path.exists():
             return f"[search_codebase] Path not found: {params.path}"
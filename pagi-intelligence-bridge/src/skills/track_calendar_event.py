@@ -7,7 +7,6 @@ when available; otherwise stub. No real calendar API calls.
 from __future__ import annotations
 
 import json
-import uuid
 from typing import Optional
 
 from pydantic import BaseModel
@@ -24,8 +23,8 @@ class TrackCalendarEventParams(BaseModel):
     kb_name: str = "kb_calendar"
 
 
-def run(params: TrackCalendarEventParams) -> str:
-    """Validate times, format event JSON, call UpsertVectors via gRPC to kb_calendar, return summary."""
+def _entry(params: TrackCalendarEventParams) -> tuple[str, str]:
+    """(text to embed, payload content) for the logged point."""
     payload = {
         "title": params.title,
         "start_time": params.start_time,
@@ -40,25 +39,32 @@ def run(params: TrackCalendarEventParams) -> str:
     if params.reminder_minutes is not None:
         payload["reminder_minutes"] = params.reminder_minutes
     content = json.dumps(payload)
+    return content, content
+
+
+def run(params: TrackCalendarEventParams) -> str:
+    """Validate times, format event JSON, call UpsertVectors via gRPC to kb_calendar, return summary."""
+    try:
+        try:
+            from src.main import _kb_log
+        except ImportError:
+            from pagi_intelligence_bridge.main import _kb_log
+
+        _kb_log(params.kb_name, *_entry(params))
+    except Exception:
+        pass
+    return f"[track_calendar_event] Event logged: {params.title} {params.start_time}"
+
+
+async def arun(params: TrackCalendarEventParams) -> str:
+    """`run` for async callers (bridge routes): the upsert goes through the pooled aio stub."""
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _akb_log
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
+            from pagi_intelligence_bridge.main import _akb_log
 
-        vector = _embed_content(content[:10000])
-        point_id = str(uuid.uuid4())
-        payload_str = content[:10000]
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": payload_str},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name=params.kb_name, points=[point])
-        stub = _get_kb_stub()
-        stub.UpsertVectors(req, timeout=10.0)
+        await _akb_log(params.kb_name, *_entry(params))
     except Exception:
         pass
     return f"[track_calendar_event] Event logged: {params.title} {params.start_time}"
@@ -7,7 +7,6 @@ when bridge/orchestrator are available; otherwise stub (log-only). No real exter
 from __future__ import annotations
 
 import json
-import uuid
 from typing import Optional
 
 from pydantic import BaseModel
@@ -19,32 +18,42 @@ class TrackHealthMetricsParams(BaseModel):
     kb_name: str = "kb_health"
 
 
+def _entry(params: TrackHealthMetricsParams) -> tuple[str, str]:
+    """(text to embed, payload content) for the logged point."""
+    content = json.dumps(params.metrics)
+    text = content
+    if params.timestamp:
+        text += f" {params.timestamp}"
+    return text, content
+
+
 def run(params: TrackHealthMetricsParams) -> str:
     """Validate params, optionally upsert to kb_health via gRPC, return summary."""
     if not params.metrics:
         return "[track_health_metrics] No metrics provided; skipped."
-    content = json.dumps(params.metrics)
-    if params.timestamp:
-        content += f" {params.timestamp}"
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _kb_log
+        except ImportError:
+            from pagi_intelligence_bridge.main import _kb_log
+
+        _kb_log(params.kb_name, *_entry(params))
+    except Exception:
+        pass  # Stub path: no gRPC or embed; still report logged
+    return "[track_health_metrics] Logged"
+
+
+async def arun(params: TrackHealthMetricsParams) -> str:
+    """`run` for async callers (bridge routes): the upsert goes through the pooled aio stub."""
+    if not params.metrics:
+        return "[track_health_metrics] No metrics provided; skipped."
+    try:
+        try:
+            from src.main import _akb_log
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
-
-        vector = _embed_content(content[:10000])
-        point_id = str(uuid.uuid4())
-        payload_str = json.dumps(params.metrics)[:10000]
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": payload_str},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name=params.kb_name, points=[point])
-        stub = _get_kb_stub()
-        stub.UpsertVectors(req, timeout=10.0)
+            from pagi_intelligence_bridge.main import _akb_log
+
+        await _akb_log(params.kb_name, *_entry(params))
     except Exception:
         pass  # Stub path: no gRPC or embed; still report logged
     return "[track_health_metrics] Logged"
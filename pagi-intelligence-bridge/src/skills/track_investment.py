@@ -7,7 +7,6 @@ when available; otherwise stub (log-only). No real external APIs.
 from __future__ import annotations
 
 import json
-import uuid
 from typing import Optional
 
 from pydantic import BaseModel
@@ -22,39 +21,49 @@ class TrackInvestmentParams(BaseModel):
     kb_name: str = "kb_finance"
 
 
-def run(params: TrackInvestmentParams) -> str:
-    """Validate inputs, format as structured JSON, call UpsertVectors via gRPC to kb_finance, return summary."""
-    action = (params.action or "").strip().lower()
-    if action not in ("buy", "sell"):
-        return f"[track_investment] Invalid action: {params.action}; use buy or sell"
+def _entry(params: TrackInvestmentParams) -> tuple[str, str]:
+    """(text to embed, payload content) for the logged point."""
     payload = {
         "ticker": params.ticker,
-        "action": action,
+        "action": (params.action or "").strip().lower(),
         "quantity": params.quantity,
         "price": params.price,
     }
     if params.timestamp:
         payload["timestamp"] = params.timestamp
     content = json.dumps(payload)
+    return content, content
+
+
+def run(params: TrackInvestmentParams) -> str:
+    """Validate inputs, format as structured JSON, call UpsertVectors via gRPC to kb_finance, return summary."""
+    action = (params.action or "").strip().lower()
+    if action not in ("buy", "sell"):
+        return f"[track_investment] Invalid action: {params.action}; use buy or sell"
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _kb_log
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
-
-        vector = _embed_content(content[:10000])
-        point_id = str(uuid.uuid4())
-        payload_str = content[:10000]
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": payload_str},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name=params.kb_name, points=[point])
-        stub = _get_kb_stub()
-        stub.UpsertVectors(req, timeout=10.0)
+            from pagi_intelligence_bridge.main import _kb_log
+
+        _kb_log(params.kb_name, *_entry(params))
+    except Exception:
+        pass
+    return f"[track_investment] Logged {action} {params.quantity} {params.ticker} @ {params.price}"
+
+
+async def arun(params: TrackInvestmentParams) -> str:
+    """`run` for async callers (bridge routes): the upsert goes through the pooled aio stub."""
+    action = (params.action or "").strip().lower()
+    if action not in ("buy", "sell"):
+        return f"[track_investment] Invalid action: {params.action}; use buy or sell"
+    try:
+        try:
+            from src.main import _akb_log
+        except ImportError:
+            from pagi_intelligence_bridge.main import _akb_log
+
+        await _akb_log(params.kb_name, *_entry(params))
     except Exception:
         pass
     return f"[track_investment] Logged {action} {params.quantity} {params.ticker} @ {params.price}"
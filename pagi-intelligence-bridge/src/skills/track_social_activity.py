@@ -7,7 +7,6 @@ when available; otherwise stub. No real external API calls.
 from __future__ import annotations
 
 import json
-import uuid
 from typing import Optional
 
 from pydantic import BaseModel
@@ -21,8 +20,8 @@ class TrackSocialActivityParams(BaseModel):
     kb_name: str = "kb_social"
 
 
-def run(params: TrackSocialActivityParams) -> str:
-    """Format log entry, call UpsertVectors via gRPC to kb_social, return summary."""
+def _entry(params: TrackSocialActivityParams) -> tuple[str, str]:
+    """(text to embed, payload content) for the logged point."""
     payload = {
         "platform": params.platform,
         "action": (params.action or "").strip().lower(),
@@ -31,25 +30,32 @@ def run(params: TrackSocialActivityParams) -> str:
     if params.timestamp:
         payload["timestamp"] = params.timestamp
     content = json.dumps(payload)
+    return content, content
+
+
+def run(params: TrackSocialActivityParams) -> str:
+    """Format log entry, call UpsertVectors via gRPC to kb_social, return summary."""
+    try:
+        try:
+            from src.main import _kb_log
+        except ImportError:
+            from pagi_intelligence_bridge.main import _kb_log
+
+        _kb_log(params.kb_name, *_entry(params))
+    except Exception:
+        pass
+    return f"[track_social_activity] Logged {params.action} on {params.platform}"
+
+
+async def arun(params: TrackSocialActivityParams) -> str:
+    """`run` for async callers (bridge routes): the upsert goes through the pooled aio stub."""
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _akb_log
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
-
-        vector = _embed_content(content[:10000])
-        point_id = str(uuid.uuid4())
-        payload_str = content[:10000]
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": payload_str},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name=params.kb_name, points=[point])
-        stub = _get_kb_stub()
-        stub.UpsertVectors(req, timeout=10.0)
+            from pagi_intelligence_bridge.main import _akb_log
+
+        await _akb_log(params.kb_name, *_entry(params))
     except Exception:
         pass
     return f"[track_social_activity] Logged {params.action} on {params.platform}"
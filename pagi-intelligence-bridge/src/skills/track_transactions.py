@@ -7,7 +7,6 @@ when available; otherwise stub (log-only). No real external APIs.
 from __future__ import annotations
 
 import json
-import uuid
 from typing import Optional
 
 from pydantic import BaseModel
@@ -19,33 +18,44 @@ class TrackTransactionsParams(BaseModel):
     kb_name: str = "kb_finance"
 
 
+def _entry(params: TrackTransactionsParams) -> tuple[str, str]:
+    """(text to embed, payload content) for the logged point."""
+    content = json.dumps(params.transactions)
+    text = content
+    if params.timestamp:
+        text += f" {params.timestamp}"
+    return text, content
+
+
 def run(params: TrackTransactionsParams) -> str:
     """Validate params, optionally upsert to kb_finance via gRPC, return summary."""
     txs = params.transactions or []
     if not txs:
         return "[track_transactions] Logged 0 transactions"
-    content = json.dumps(txs)
-    if params.timestamp:
-        content += f" {params.timestamp}"
     try:
         try:
-            from src.main import _embed_content, _get_kb_stub
-            from src.pagi_pb import pagi_pb2
+            from src.main import _kb_log
         except ImportError:
-            from pagi_intelligence_bridge.main import _embed_content, _get_kb_stub
-            from pagi_intelligence_bridge.pagi_pb import pagi_pb2
-
-        vector = _embed_content(content[:10000])
-        point_id = str(uuid.uuid4())
-        payload_str = json.dumps(txs)[:10000]
-        point = pagi_pb2.VectorPoint(
-            id=point_id,
-            vector=vector,
-            payload={"content": payload_str},
-        )
-        req = pagi_pb2.UpsertRequest(kb_name=params.kb_name, points=[point])
-        stub = _get_kb_stub()
-        stub.UpsertVectors(req, timeout=10.0)
+            from pagi_intelligence_bridge.main import _kb_log
+
+        _kb_log(params.kb_name, *_entry(params))
+    except Exception:
+        pass
+    return f"[track_transactions] Logged {len(txs)} transactions"
+
+
+async def arun(params: TrackTransactionsParams) -> str:
+    """`run` for async callers (bridge routes): the upsert goes through the pooled aio stub."""
+    txs = params.transactions or []
+    if not txs:
+        return "[track_transactions] Logged 0 transactions"
+    try:
+        try:
+            from src.main import _akb_log
+        except ImportError:
+            from pagi_intelligence_bridge.main import _akb_log
+
+        await _akb_log(params.kb_name, *_entry(params))
     except Exception:
         pass
     return f"[track_transactions] Logged {len(txs)} transactions"
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import os
 from pathlib import Path
 
 from pydantic import BaseModel
@@ -27,7 +26,11 @@ def run(params: WriteFileSafeParams) -> str:
     """Sanitize path, enforce overwrite flag, cap content size, write utf-8."""
     try:
         resolved = Path(params.path).resolve()
-        root = Path(os.environ.get("PAGI_PROJECT_ROOT", ".")).resolve()
+        try:
+            from src.settings import get_settings
+        except ImportError:
+            from pagi_intelligence_bridge.settings import get_settings
+        root = Path(get_settings().project_root).resolve()
         if not _path_under_root(resolved, root):
             return f"[write_file_safe] Path outside project root: {params.path}"
 
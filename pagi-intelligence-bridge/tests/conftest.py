@@ -3,6 +3,46 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
+
+from src.recursive_loop import _close_self_heal_queue  # noqa: E402
+from src.settings import reload_settings  # noqa: E402
+
+
+class SettingsMonkeyPatch(pytest.MonkeyPatch):
+    """MonkeyPatch whose env changes (and their undo) also swap in a fresh settings snapshot.
+
+    src/settings.py snapshots the environment; outside tests only `reload_settings()` or
+    `apply_overrides()` (POST /api/config) make env changes visible.
+    """
+
+    def setenv(self, name, value, prepend=None):
+        super().setenv(name, value, prepend)
+        reload_settings()
+
+    def delenv(self, name, raising=True):
+        super().delenv(name, raising)
+        reload_settings()
+
+    def undo(self):
+        super().undo()
+        reload_settings()
+
+
+@pytest.fixture
+def monkeypatch():
+    """Replaces pytest's `monkeypatch` so tests can set PAGI_* variables and see them in `get_settings()`."""
+    mp = SettingsMonkeyPatch()
+    yield mp
+    mp.undo()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_self_heal_queue():
+    """Self-heal reports are deduplicated and rate-limited per process: each test starts a new queue."""
+    yield
+    _close_self_heal_queue(timeout=0)
@@ -1,13 +1,14 @@
 """Minimal tests for Phase 3 RLM REPL (no outbound calls)."""
 
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
-from src.recursive_loop import RLMSummary
+from src import action_log
+from src.recursive_loop import RLMSummary, _get_self_heal_queue
 
 client = TestClient(app)
 
@@ -450,12 +451,12 @@ def test_rlm_grpc_dispatch_mock(monkeypatch):
         '{"thought":"Planned peek.","action":{"skill_name":"peek_file","params":{"path":"README.md","start":0,"end":10}},"is_final":true}',
     )
 
-    mock_stub = MagicMock()
+    mock_stub = AsyncMock()
     mock_stub.ExecuteAction.return_value = _mock_grpc_response(
         "Observation: mock executed skill=peek_file", success=True, error=""
     )
 
-    with patch("src.recursive_loop._get_grpc_stub", return_value=mock_stub):
+    with patch("src.recursive_loop._get_grpc_aio_stub", return_value=mock_stub):
         r = client.post(
             "/rlm",
             json={"query": "Peek README", "context": "", "depth": 0},
@@ -479,12 +480,12 @@ def test_rlm_grpc_dispatch_real_allowed(monkeypatch, tmp_path):
         % path_arg,
     )
 
-    mock_stub = MagicMock()
+    mock_stub = AsyncMock()
     mock_stub.ExecuteAction.return_value = _mock_grpc_response(
         "Real peek content", success=True, error=""
     )
 
-    with patch("src.recursive_loop._get_grpc_stub", return_value=mock_stub):
+    with patch("src.recursive_loop._get_grpc_aio_stub", return_value=mock_stub):
         r = client.post(
             "/rlm",
             json={"query": "Peek README", "context": "", "depth": 0},
@@ -505,12 +506,12 @@ def test_rlm_grpc_dispatch_timeout(monkeypatch):
         '{"thought":"Timed out.","action":{"skill_name":"peek_file","params":{"path":"x","start":0,"end":10}},"is_final":true}',
     )
 
-    mock_stub = MagicMock()
+    mock_stub = AsyncMock()
     mock_stub.ExecuteAction.return_value = _mock_grpc_response(
         "", success=False, error="Execution timed out"
     )
 
-    with patch("src.recursive_loop._get_grpc_stub", return_value=mock_stub):
+    with patch("src.recursive_loop._get_grpc_aio_stub", return_value=mock_stub):
         r = client.post(
             "/rlm",
             json={"query": "Peek x", "context": "", "depth": 0},
@@ -566,7 +567,7 @@ def test_rlm_multi_turn(monkeypatch):
         '{"thought":"step","action":null,"is_final":false}',
     )
 
-    with patch("src.main.recursive_loop") as mock_loop:
+    with patch("src.main.arecursive_loop", new_callable=AsyncMock) as mock_loop:
         mock_loop.side_effect = [
             RLMSummary(summary="turn1", converged=False),
             RLMSummary(summary="turn2", converged=True),
@@ -588,6 +589,255 @@ def test_rlm_multi_turn(monkeypatch):
     assert summaries[-1]["summary"] == "turn2"
 
 
+def test_rlm_multi_turn_streams_sse_per_turn(monkeypatch):
+    """stream=true: one `turn` SSE event per RLMSummary, then a `done` event; default stays a list."""
+    import json
+
+    with patch("src.main.arecursive_loop", new_callable=AsyncMock) as mock_loop:
+        mock_loop.side_effect = [
+            RLMSummary(summary="turn1", converged=False),
+            RLMSummary(summary="turn2", converged=False),
+        ]
+        r = client.post("/rlm-multi-turn", json={"query": "q", "max_turns": 2, "stream": True})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    frames = [f for f in r.text.split("\n\n") if f.strip()]
+    events = [(f.split("\n")[0].removeprefix("event: "), json.loads(f.split("\n")[1].removeprefix("data: "))) for f in frames]
+    assert [e for e, _ in events] == ["turn", "turn", "done"]
+    assert events[0][1] == {"turn": 1, "summary": "turn1", "converged": False}
+    assert events[2][1] == {"turns": 2, "converged": False, "status": "max_turns"}
+
+
+def test_arecursive_loop_overlaps_llm_waits(monkeypatch):
+    """Async loop: concurrent sessions wait on acompletion together; sync loop drives the same steps."""
+    import asyncio
+    import time
+    from types import SimpleNamespace
+
+    import src.recursive_loop as rl
+
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_ALLOW_OUTBOUND", "true")
+    monkeypatch.delenv("PAGI_RLM_STUB_JSON", raising=False)
+    reply = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"thought":"done","is_final":true}'))]
+    )
+
+    async def _acompletion(**kwargs):
+        await asyncio.sleep(0.2)
+        return reply
+
+    monkeypatch.setattr(rl, "litellm", SimpleNamespace(acompletion=_acompletion, completion=lambda **kw: reply))
+
+    async def _many(n):
+        return await asyncio.gather(*(rl.arecursive_loop(rl.RLMQuery(query=f"q{i}")) for i in range(n)))
+
+    t0 = time.perf_counter()
+    outs = asyncio.run(_many(20))
+    assert time.perf_counter() - t0 < 1.0  # serial would be 4s
+    assert all(o.converged and o.summary == "done" for o in outs)
+    assert rl.recursive_loop(rl.RLMQuery(query="sync")) == outs[0]
+
+
+def test_arecursive_loop_saves_skill_off_event_loop(monkeypatch):
+    """Synthesis-step save_skill (write + subprocess validation) runs on a worker thread under the async loop."""
+    import asyncio
+    import threading
+
+    import src.recursive_loop as rl
+
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_ALLOW_OUTBOUND", "false")
+    monkeypatch.delenv("PAGI_RLM_STUB_JSON", raising=False)
+    saved = []
+    monkeypatch.setattr(rl, "save_skill", lambda filename, code: saved.append((filename, threading.get_ident())))
+
+    async def _run():
+        out = await rl.arecursive_loop(rl.RLMQuery(query="save_skill for this", context="resolved"))
+        return out, threading.get_ident()
+
+    out, loop_thread = asyncio.run(_run())
+    assert out.converged
+    assert [name for name, _ in saved] == ["new_skill.py"]
+    assert saved[0][1] != loop_thread
+    assert rl.recursive_loop(rl.RLMQuery(query="save_skill for this", context="resolved")).converged
+    assert len(saved) == 2
+
+
+def test_llm_response_cache_exact_semantic_ttl():
+    """Exact key hits, semantic tier reuses within threshold and scope, TTL and LRU bound evict."""
+    from src.llm_cache import LLMResponseCache
+
+    vectors = {"balance summary": [1.0, 0.0], "balance summary please": [0.99, 0.05], "weather": [0.0, 1.0]}
+    cache = LLMResponseCache(max_entries=2, ttl_s=60, semantic_threshold=0.95, embed=vectors.__getitem__)
+    msgs = [{"role": "system", "content": "sys"}, {"role": "user", "content": "balance summary"}]
+    key, scope = cache.key("m", msgs), cache.scope("m", "sys")
+    cache.put(key, "answer", 1.5, scope, "balance summary")
+
+    assert cache.get(key, scope, "balance summary") == "answer"
+    assert cache.get(b"other", scope, "balance summary please") == "answer"
+    assert cache.get(b"other", cache.scope("m", "other sys"), "balance summary please") is None
+    assert cache.get(b"other", scope, "weather") is None
+    st = cache.stats()
+    assert (st["exact_hits"], st["semantic_hits"], st["misses"]) == (1, 1, 2)
+    assert st["latency_saved_s"] == 3.0
+
+    cache.put(b"k2", "two", 0.1)
+    cache.put(b"k3", "three", 0.1)
+    assert cache.get(key) is None and cache.stats()["evictions"] == 1
+    expired = LLMResponseCache(max_entries=4, ttl_s=0)
+    expired.put(b"k", "v", 0.1)
+    assert expired.get(b"k") is None
+
+
+def test_structured_step_reuses_cached_llm_response(monkeypatch):
+    """A repeated structured step is answered from the cache; counters show at /health/llm-cache."""
+    from types import SimpleNamespace
+
+    import src.recursive_loop as rl
+
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_ALLOW_OUTBOUND", "true")
+    monkeypatch.setenv("PAGI_LLM_CACHE_MAX_ENTRIES", "64")
+    monkeypatch.delenv("PAGI_RLM_STUB_JSON", raising=False)
+    monkeypatch.setattr(rl, "_llm_cache_instance", None)
+    calls = []
+
+    def _completion(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"thought":"cached","is_final":true}'))]
+        )
+
+    monkeypatch.setattr(rl, "litellm", SimpleNamespace(completion=_completion))
+    query = rl.RLMQuery(query="retry me", context="same context")
+    first = rl.recursive_loop(query)
+    second = rl.recursive_loop(query)
+    assert first == second and first.summary == "cached"
+    assert len(calls) == 1
+    stats = client.get("/health/llm-cache").json()
+    assert stats["exact_hits"] == 1 and stats["misses"] == 1
+
+    monkeypatch.delenv("PAGI_LLM_CACHE_MAX_ENTRIES")  # opt-in: off by default
+    monkeypatch.setattr(rl, "_llm_cache_instance", None)
+    rl.recursive_loop(query)
+    rl.recursive_loop(query)
+    assert len(calls) == 3
+
+
+def test_semantic_llm_cache_matches_query_within_same_context(monkeypatch):
+    """The semantic tier embeds the user query only; a similar query over another context is a miss."""
+    from types import SimpleNamespace
+
+    import src.recursive_loop as rl
+
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_ALLOW_OUTBOUND", "true")
+    monkeypatch.setenv("PAGI_LLM_CACHE_MAX_ENTRIES", "64")
+    monkeypatch.setenv("PAGI_LLM_CACHE_SEMANTIC_THRESHOLD", "0.95")
+    monkeypatch.delenv("PAGI_RLM_STUB_JSON", raising=False)
+    monkeypatch.setattr(rl, "_llm_cache_instance", None)
+    embedded = []
+
+    def _embed(text):
+        embedded.append(text)
+        return [1.0, 0.0] if "balance" in text else [0.0, 1.0]
+
+    monkeypatch.setattr(rl, "_llm_cache_embedder", _embed)
+    calls = []
+
+    def _completion(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f'{{"thought":"a{len(calls)}","is_final":true}}'))]
+        )
+
+    monkeypatch.setattr(rl, "litellm", SimpleNamespace(completion=_completion))
+    first = rl.recursive_loop(rl.RLMQuery(query="balance summary", context="account A"))
+    similar = rl.recursive_loop(rl.RLMQuery(query="balance summary please", context="account A"))
+    other = rl.recursive_loop(rl.RLMQuery(query="balance summary", context="account B"))
+    deeper = rl.recursive_loop(rl.RLMQuery(query="balance summary", context="account A", depth=1))
+    assert (first.summary, similar.summary, other.summary, deeper.summary) == ("a1", "a1", "a2", "a3")
+    assert set(embedded) == {"balance summary", "balance summary please"}
+    stats = rl._llm_cache().stats()
+    assert (stats["exact_hits"], stats["semantic_hits"], stats["misses"]) == (0, 1, 3)
+
+
+def test_pack_context_keeps_newest_records_within_budget():
+    """Packer trims observation blobs, keeps newest records, drops stale ones behind one omission line."""
+    from src.context_packer import count_tokens, pack_context, split_records
+
+    context = "\n".join(
+        [
+            "error_trace: panic at main.rs:42",
+            "Observation: " + "old file dump " * 200,
+            "Summary: turn1 looked at main.rs",
+            "Observation: line one\ncontinued line two " + "x" * 4000,
+            "Summary: turn2 found the bug",
+        ]
+    )
+    assert len(split_records(context)) == 5
+    packed = pack_context(context, budget_tokens=70, obs_max_tokens=40)
+    assert count_tokens(packed) <= 70
+    assert packed.endswith("Summary: turn2 found the bug")
+    assert "Observation: line one\ncontinued" in packed and "…[truncated]" in packed
+    assert packed.startswith("[") and "earlier context records omitted]" in packed
+    assert "old file dump" not in packed
+    assert pack_context("short", budget_tokens=120) == "short"
+
+
+def test_truncate_tokens_bisects_to_longest_fitting_head(monkeypatch):
+    """truncate_tokens keeps the longest head that fits, with O(log n) token counts."""
+    import math
+
+    from src import context_packer
+
+    counted = []
+    real_count = context_packer.count_tokens
+    monkeypatch.setattr(context_packer, "litellm", None)  # ~4 chars/token estimate
+    monkeypatch.setattr(context_packer, "count_tokens", lambda text, model=None: counted.append(1) or real_count(text, model))
+
+    text = "abcd" * 25_000
+    cut = context_packer.truncate_tokens(text, 1_000)
+    assert cut.endswith(context_packer.TRUNCATED_MARKER)
+    assert real_count(cut) <= 1_000
+    assert real_count(text[: len(cut) - len(context_packer.TRUNCATED_MARKER) + 1] + context_packer.TRUNCATED_MARKER) > 1_000
+    assert len(counted) <= math.ceil(math.log2(len(text))) + 2
+    assert context_packer.truncate_tokens(text, 1) == ""
+
+    from src.settings import Settings
+
+    assert Settings.from_env({}).context_max_tokens == 0  # no budget unless configured
+
+
+def test_structured_prompt_is_packed_to_token_budget(monkeypatch):
+    """The user prompt sent to the model carries the packed context, not the raw accumulated one."""
+    import json
+    from types import SimpleNamespace
+
+    import src.recursive_loop as rl
+
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_ALLOW_OUTBOUND", "true")
+    monkeypatch.setenv("PAGI_MULTI_TURN_CONTEXT_MAX_TOKENS", "200")
+    monkeypatch.setenv("PAGI_LLM_CACHE_MAX_ENTRIES", "0")
+    monkeypatch.delenv("PAGI_RLM_STUB_JSON", raising=False)
+    monkeypatch.setattr(rl, "_llm_cache_instance", None)
+    sent = []
+
+    def _completion(**kwargs):
+        sent.append(kwargs["messages"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"thought":"ok","is_final":true}'))])
+
+    monkeypatch.setattr(rl, "litellm", SimpleNamespace(completion=_completion))
+    context = "\n".join(f"Summary: turn{i} " + "detail " * 30 for i in range(20))
+    assert rl.recursive_loop(rl.RLMQuery(query="q", context=context)).converged is True
+    user = json.loads(sent[0][1]["content"])
+    assert "Summary: turn19" in user["context"]
+    assert "turn0 " not in user["context"]
+    assert rl.count_tokens(sent[0][0]["content"]) + rl.count_tokens(sent[0][1]["content"]) <= 200 + 16
+
+
 def test_rlm_vertical_self_patch(monkeypatch, tmp_path):
     """Vertical research: self-patch query with error_trace returns converged and summary contains proposed fix."""
     monkeypatch.setenv("PAGI_VERTICAL_USE_CASE", "research")
@@ -707,6 +957,7 @@ def test_self_heal_grpc(monkeypatch):
             "/rlm",
             json={"query": "anything", "context": "", "depth": 0},
         )
+        assert _get_self_heal_queue().flush(timeout=5.0)  # reports are delivered off the request path
     assert r.status_code == 200
     data = r.json()
     assert data["converged"] is False
@@ -730,6 +981,7 @@ def test_self_heal_grpc_propose(monkeypatch):
 
     with patch("src.recursive_loop._get_grpc_stub", return_value=mock_stub):
         client.post("/rlm", json={"query": "x", "context": "", "depth": 0})
+        assert _get_self_heal_queue().flush(timeout=5.0)  # reports are delivered off the request path
 
     mock_stub.ProposePatch.assert_called_once()
     req = mock_stub.ProposePatch.call_args[0][0]
@@ -750,6 +1002,7 @@ def test_self_heal_grpc_apply(monkeypatch):
 
     with patch("src.recursive_loop._get_grpc_stub", return_value=mock_stub):
         client.post("/rlm", json={"query": "x", "context": "", "depth": 0})
+        assert _get_self_heal_queue().flush(timeout=5.0)  # reports are delivered off the request path
 
     mock_stub.ProposePatch.assert_called_once()
     mock_stub.ApplyPatch.assert_called_once()
@@ -1310,13 +1563,13 @@ def test_kb_memory_search(monkeypatch):
     from src.pagi_pb import pagi_pb2
 
     monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "true")
-    mock_stub = MagicMock()
+    mock_stub = AsyncMock()
     mock_stub.UpsertVectors.return_value = pagi_pb2.UpsertResponse(success=True, upserted_count=1)
     mock_stub.SemanticSearch.return_value = pagi_pb2.SearchResponse(
         hits=[pagi_pb2.SearchHit(document_id="id1", score=0.9, content_snippet="test content")]
     )
 
-    with patch("src.main._get_kb_stub", return_value=mock_stub), patch(
+    with patch("src.main._get_kb_aio_stub", return_value=mock_stub), patch(
         "src.main._embed_content", return_value=[0.1] * 384
     ):
         r_upsert = client.post(
@@ -1343,13 +1596,13 @@ def test_health_kb_routes(monkeypatch):
     from src.pagi_pb import pagi_pb2
 
     monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "true")
-    mock_stub = MagicMock()
+    mock_stub = AsyncMock()
     mock_stub.UpsertVectors.return_value = pagi_pb2.UpsertResponse(success=True, upserted_count=1)
     mock_stub.SemanticSearch.return_value = pagi_pb2.SearchResponse(
         hits=[pagi_pb2.SearchHit(document_id="h1", score=0.85, content_snippet="weight 70 steps 5000")]
     )
 
-    with patch("src.main._get_kb_stub", return_value=mock_stub), patch(
+    with patch("src.main._get_kb_aio_stub", return_value=mock_stub), patch(
         "src.main._embed_content", return_value=[0.1] * 384
     ):
         r_track = client.post(
@@ -1376,13 +1629,13 @@ def test_finance_kb_routes(monkeypatch):
     from src.pagi_pb import pagi_pb2
 
     monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "true")
-    mock_stub = MagicMock()
+    mock_stub = AsyncMock()
     mock_stub.UpsertVectors.return_value = pagi_pb2.UpsertResponse(success=True, upserted_count=1)
     mock_stub.SemanticSearch.return_value = pagi_pb2.SearchResponse(
         hits=[pagi_pb2.SearchHit(document_id="f1", score=0.88, content_snippet="budget 2000 spent 1200")]
     )
 
-    with patch("src.main._get_kb_stub", return_value=mock_stub), patch(
+    with patch("src.main._get_kb_aio_stub", return_value=mock_stub), patch(
         "src.main._embed_content", return_value=[0.1] * 384
     ):
         r_track = client.post(
@@ -1402,3 +1655,1045 @@ def test_finance_kb_routes(monkeypatch):
         assert len(summary) == 1
         assert "budget" in (summary[0].get("content") or "") or "spent" in (summary[0].get("content") or "")
         assert summary[0].get("score") == 0.88
+
+
+def test_grpc_channels_are_pooled(monkeypatch):
+    """Sync stub is cached; one aio pool round-robins PAGI_GRPC_POOL_SIZE channels for main and the RLM loop."""
+    import asyncio
+
+    from src import main as bridge_main
+    from src import recursive_loop as rl
+    from src.grpc_client import keepalive_options
+
+    monkeypatch.setenv("PAGI_GRPC_POOL_SIZE", "2")
+    monkeypatch.setenv("PAGI_GRPC_KEEPALIVE_TIME_MS", "15000")
+    assert ("grpc.keepalive_time_ms", 15000) in keepalive_options()
+    assert bridge_main._get_grpc_stub() is bridge_main._get_grpc_stub()
+
+    async def _take(n):
+        stubs = [bridge_main._get_kb_aio_stub() for _ in range(n)]
+        stubs.append(rl._get_grpc_aio_stub(bridge_main._grpc_addr()))
+        await rl._close_grpc_aio()
+        return stubs
+
+    stubs = asyncio.run(_take(4))
+    assert stubs[0] is stubs[2] and stubs[1] is stubs[3]
+    assert stubs[0] is not stubs[1]
+    assert stubs[4] is stubs[0]  # the RLM loop draws from the same pool
+
+
+def test_aio_pool_closes_channels_of_a_previous_loop():
+    """A loop change rebuilds the pool and closes the old channels instead of dropping them."""
+    import asyncio
+
+    from src.grpc_client import AioChannelPool
+
+    pool = AioChannelPool(lambda ch: ch)
+
+    async def _open():
+        return pool.stub("[::1]:1", size=2), pool.stub("[::1]:1", size=2)
+
+    old = asyncio.run(_open())
+
+    async def _reopen():
+        fresh = pool.stub("[::1]:1")
+        await asyncio.sleep(0)  # let the scheduled close run
+        await pool.close()
+        return fresh
+
+    fresh = asyncio.run(_reopen())
+    assert fresh not in old
+    assert all(ch._channel.closed() for ch in old) and fresh._channel.closed()
+
+
+def test_email_routes_run_skills_on_pooled_aio_stub(monkeypatch):
+    """KB skill routes await the skill's arun: upsert and search go through the pooled aio stub, not the sync one."""
+    import numpy as np
+
+    from src.pagi_pb import pagi_pb2
+
+    monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "true")
+    aio_stub = AsyncMock()
+    aio_stub.UpsertVectors.return_value = pagi_pb2.UpsertResponse(success=True, upserted_count=1)
+    aio_stub.SemanticSearch.return_value = pagi_pb2.SearchResponse(
+        hits=[pagi_pb2.SearchHit(document_id="id1", score=0.5, content_snippet="Q3 report from Ann")]
+    )
+    sync_stub = MagicMock(side_effect=AssertionError("sync KB stub used"))
+
+    with patch("src.main._get_kb_aio_stub", return_value=aio_stub), patch(
+        "src.main._get_kb_stub", sync_stub
+    ), patch("src.main._embed_content", return_value=np.full(384, 0.1, dtype=np.float32)):
+        r_track = client.post("/api/email/track", json={"action": "Sent", "subject": "Q3 report", "summary": "numbers"})
+        r_history = client.get("/api/email/history", params={"keyword": "report"})
+
+    assert r_track.status_code == 200 and r_track.json()["message"] == "[track_email] Logged sent: Q3 report"
+    assert r_history.status_code == 200 and "Q3 report from Ann" in r_history.json()["history"]
+    req = aio_stub.UpsertVectors.await_args.args[0]
+    assert req.points[0].payload["content"].startswith('{"action": "sent"')
+    assert aio_stub.SemanticSearch.await_args.args[0].query.endswith("report")
+    sync_stub.assert_not_called()
+
+
+def test_embedding_batcher_coalesces_concurrent_calls():
+    """Concurrent encode() calls share one batched model call and each caller gets its own row."""
+    import threading
+
+    from src.embedding import EmbeddingBatcher
+
+    calls: list[list[str]] = []
+
+    class _FakeModel:
+        def encode(self, texts, batch_size=None):
+            calls.append(list(texts))
+            return [[float(len(t))] for t in texts]
+
+    batcher = EmbeddingBatcher(lambda: _FakeModel(), max_batch=8, max_wait_ms=200)
+    results: dict[str, list[float]] = {}
+
+    def _worker(text: str) -> None:
+        results[text] = batcher.encode(text, timeout=5)
+
+    texts = ["a" * n for n in range(1, 7)]
+    threads = [threading.Thread(target=_worker, args=(t,)) for t in texts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) < len(texts)
+    assert sum(len(c) for c in calls) == len(texts)
+    assert all(results[t] == [float(len(t))] for t in texts)
+    assert batcher.stats()["items"] == len(texts)
+
+
+def test_embed_content_cache_skips_model(monkeypatch):
+    """Repeated _embed_content calls for the same text hit the LRU and skip the model."""
+    from src import main as bridge_main
+    from src.embedding import EmbeddingCache
+
+    class _Row(list):
+        def tolist(self):
+            return list(self)
+
+    encodes: list[str] = []
+
+    class _FakeModel:
+        def encode(self, text, batch_size=None):
+            encodes.append(text)
+            return _Row([0.5, 0.25])
+
+    monkeypatch.setenv("PAGI_EMBEDDING_DIM", "4")
+    monkeypatch.setenv("PAGI_EMBED_BATCH_MAX_SIZE", "1")
+    monkeypatch.setattr(bridge_main, "_embed_batcher", None)
+    monkeypatch.setattr(bridge_main, "_embed_cache", EmbeddingCache(1024))
+    monkeypatch.setattr(bridge_main, "_get_embed_model", lambda: _FakeModel())
+
+    first = bridge_main._embed_content("balance summary transactions last 30 days")
+    second = bridge_main._embed_content("balance summary transactions last 30 days")
+    assert first.dtype.name == "float32"
+    assert first.tolist() == second.tolist() == [0.5, 0.25, 0.0, 0.0]
+    assert len(encodes) == 1
+    bridge_main._embed_content("balance  summary transactions last 30 days")  # keyed on the exact text
+    assert len(encodes) == 2
+
+    stats = client.get("/health/embed").json()["cache"]
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_embedding_cache_evicts_by_bytes():
+    """Cache stays within max_bytes, evicting least-recently-used vectors."""
+    from src.embedding import EmbeddingCache
+
+    cache = EmbeddingCache(max_bytes=2 * 4 * 4)  # two 4-dim float32 vectors
+    keys = [cache.key("m", 4, t) for t in ("a", "b", "c")]
+    cache.put(keys[0], [1.0] * 4)
+    cache.put(keys[1], [2.0] * 4)
+    assert cache.get(keys[0]).tolist() == [1.0] * 4  # touch a -> b becomes LRU
+    cache.put(keys[2], [3.0] * 4)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_embed_model_loads_once_under_concurrency(monkeypatch):
+    """Concurrent first calls to _get_embed_model construct the model exactly once."""
+    import sys
+    import threading
+    import time
+    import types
+
+    from src import main as bridge_main
+
+    loads: list[str] = []
+
+    class _SlowModel:
+        def __init__(self, name):
+            loads.append(name)
+            time.sleep(0.05)
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=_SlowModel))
+    monkeypatch.setattr(bridge_main, "_embed_model", None)
+    threads = [threading.Thread(target=bridge_main._get_embed_model) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 1
+
+
+def test_ready_waits_for_warmup(monkeypatch):
+    """With PAGI_EMBED_PRELOAD, /ready is 503 until warm-up has loaded skills and encoded once."""
+    from src import main as bridge_main
+
+    encoded: list[list[str]] = []
+
+    class _FakeModel:
+        def encode(self, texts, batch_size=None):
+            encoded.append(texts)
+            return [[0.0]]
+
+    monkeypatch.setenv("PAGI_EMBED_PRELOAD", "true")
+    monkeypatch.delenv("PAGI_ALLOW_LOCAL_DISPATCH", raising=False)
+    monkeypatch.delenv("PAGI_ACTIONS_VIA_GRPC", raising=False)
+    monkeypatch.delenv("PAGI_VERTICAL_USE_CASE", raising=False)
+    monkeypatch.setattr(bridge_main, "_warmup_status", dict(bridge_main._warmup_status, state="idle", skills_loaded=None))
+    monkeypatch.setattr(bridge_main, "_get_embed_model", lambda: _FakeModel())
+
+    resp = client.get("/ready")
+    assert resp.status_code == 503
+    assert resp.json()["checks"]["model"]["ready"] is False
+    assert resp.json()["checks"]["grpc"]["required"] is False
+
+    bridge_main._warmup()
+    resp = client.get("/ready")
+    assert resp.status_code == 200, resp.json()
+    assert resp.json()["checks"]["skills"]["loaded"] > 0
+    assert encoded == [["warm-up"]]
+
+
+def test_embed_backend_selection_and_pooling(monkeypatch, tmp_path):
+    """PAGI_EMBED_BACKEND defaults to torch, rejects unknown names, and ONNX pooling ignores padding."""
+    import sys
+    import types
+
+    import numpy as np
+
+    from src import embed_backends
+
+    monkeypatch.delenv("PAGI_EMBED_BACKEND", raising=False)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=lambda name: ("st", name)))
+    assert embed_backends.load_embed_model("all-MiniLM-L6-v2") == ("st", "all-MiniLM-L6-v2")
+
+    monkeypatch.setenv("PAGI_EMBED_BACKEND", "tensorrt")
+    with pytest.raises(ValueError):
+        embed_backends.embed_backend()
+
+    monkeypatch.setenv("PAGI_ONNX_MODEL_DIR", str(tmp_path))
+    assert embed_backends.onnx_model_dir("all-MiniLM-L6-v2") == tmp_path
+
+    tokens = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+    assert embed_backends._pool(tokens, mask, "mean").tolist() == [[2.0, 2.0]]
+    assert embed_backends._pool(tokens, mask, "cls").tolist() == [[1.0, 1.0]]
+    parity = embed_backends.cosine_parity(np.eye(2), np.eye(2) * 3)
+    assert parity["min"] == pytest.approx(1.0)
+
+
+def test_packed_vector_requests_match_canonical_wire():
+    """Packed float32 buffers serialize to the same bytes as repeated-float messages and go out as is;
+    native dim skips padding."""
+    from concurrent import futures
+
+    import grpc
+    import numpy as np
+
+    from src import embed_and_upsert as eu
+    from src.pagi_pb import pagi_pb2, pagi_pb2_grpc
+
+    vec = np.arange(384, dtype=np.float32) / 384
+    req = eu.upsert_request("kb_core", [("p1", vec, {"content": "x"})])
+    expected = pagi_pb2.UpsertRequest(
+        kb_name="kb_core",
+        points=[pagi_pb2.VectorPoint(id="p1", vector=vec.tolist(), payload={"content": "x"})],
+        embedding_dim=384,
+    )
+    assert req.SerializeToString() == expected.SerializeToString()
+    search = eu.search_request("q", "kb_core", 5, vec)
+    decoded = pagi_pb2.SearchRequest.FromString(search.SerializeToString())
+    assert list(decoded.query_vector) == pytest.approx(vec.tolist()) and decoded.embedding_dim == 384
+
+    received = []
+
+    class _Orchestrator(pagi_pb2_grpc.PagiServicer):
+        def UpsertVectors(self, request, context):
+            received.append(request)
+            return pagi_pb2.UpsertResponse(success=True, upserted_count=len(request.points))
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    pagi_pb2_grpc.add_PagiServicer_to_server(_Orchestrator(), server)
+    port = server.add_insecure_port("[::1]:0")
+    server.start()
+    try:
+        with grpc.insecure_channel(f"[::1]:{port}") as channel:
+            assert eu.PagiKBStub(channel).UpsertVectors(req, timeout=5).upserted_count == 1
+    finally:
+        server.stop(None)
+    assert received == [expected]
+
+    with patch.dict(os.environ, {"PAGI_EMBEDDING_DIM": "native"}):
+        assert eu._embedding_dim() is None
+        assert eu.fit_dim(vec, eu._embedding_dim()).shape == (384,)
+    assert not eu.fit_dim(vec, 1536)[384:].any()
+    assert eu.fit_dim(np.ones((2, 8), dtype=np.float32), 4).shape == (2, 4)
+
+
+def test_quantized_vector_encodings_round_trip():
+    """float16/int8 requests carry QuantizedVector (no floats), shrink the wire and decode back closely."""
+    import numpy as np
+
+    from src import embed_and_upsert as eu
+
+    rng = np.random.default_rng(0)
+    vec = rng.standard_normal(384).astype(np.float32)
+    full = eu.upsert_request("kb_core", [("p1", vec, {})], encoding="float32").ByteSize()
+    for enc, max_err in (("float16", 1e-2), ("int8", 0.05)):
+        req = eu.upsert_request("kb_core", [("p1", vec, {})], encoding=enc)
+        point = req.points[0]
+        assert len(point.vector) == 0
+        assert req.ByteSize() < full
+        assert np.abs(eu.dequantize(point.quantized) - vec).max() < max_err
+    search = eu.search_request("q", "kb_core", 5, vec, encoding="int8")
+    assert len(search.query_vector) == 0 and len(search.quantized_query.data) == 384
+    with patch.dict(os.environ, {"PAGI_VECTOR_ENCODING": "int4"}), pytest.raises(ValueError):
+        eu.upsert_request("kb_core", [("p1", vec, {})])
+
+
+def test_embed_and_upsert_incremental_manifest(monkeypatch, tmp_path):
+    """Second run skips unchanged chunks, re-embeds edited ones, and reports removed chunk ids."""
+    from src import embed_and_upsert as eu
+    from src.pagi_pb import pagi_pb2
+
+    class _Vec(list):
+        def tolist(self):
+            return list(self)
+
+    class _FakeModel:
+        def encode(self, texts, batch_size=None):
+            return [_Vec([0.1, 0.2]) for _ in texts]
+
+    upserted: list[list[str]] = []
+
+    class _UpsertRpc:
+        def future(self, req):
+            upserted.append([p.id for p in req.points])
+            from concurrent.futures import Future
+
+            fut = Future()
+            fut.set_result(pagi_pb2.UpsertResponse(success=True, upserted_count=len(req.points)))
+            return fut
+
+    class _FakeStub:
+        UpsertVectors = _UpsertRpc()
+
+    monkeypatch.setenv("PAGI_EMBEDDING_DIM", "2")
+    monkeypatch.setattr(eu, "_load_model", lambda name: _FakeModel())
+    monkeypatch.setattr(eu, "_make_stub", lambda addr: _FakeStub())
+    doc = tmp_path / "doc.md"
+    manifest = tmp_path / "manifest.json"
+
+    doc.write_text("a" * 10 + "b" * 10 + "c" * 10, encoding="utf-8")
+    first = eu.upsert_to_kb("kb_core", doc, chunk_size=10, manifest_path=manifest)
+    assert first.upserted == 3 and first.skipped == 0
+
+    again = eu.upsert_to_kb("kb_core", doc, chunk_size=10, manifest_path=manifest)
+    assert again.upserted == 0 and again.skipped == 3 and again.response.success
+    assert len(upserted) == 1  # no RPC when nothing changed
+
+    doc.write_text("a" * 10 + "B" * 10, encoding="utf-8")
+    edited = eu.upsert_to_kb("kb_core", doc, chunk_size=10, manifest_path=manifest)
+    assert upserted[-1] == ["doc.md_chunk_1"]
+    assert edited.removed == ["doc.md_chunk_2"]
+
+
+def test_iter_chunks_streams_with_overlap_and_utf8(tmp_path):
+    """Streaming chunker matches whole-file chunking, honours overlap, and never splits a code point."""
+    from src.embed_and_upsert import chunk_doc, iter_chunks
+
+    text = ("héllo wörld ✓ " * 50)[:613]
+    doc = tmp_path / "u.txt"
+    doc.write_text(text, encoding="utf-8")
+
+    plain = list(iter_chunks(doc, chunk_size=100, read_chars=7))
+    assert plain == [text[i : i + 100] for i in range(0, len(text), 100)]
+    assert chunk_doc(doc, chunk_size=100) == plain
+
+    overlapped = list(iter_chunks(doc, chunk_size=100, overlap=20, read_chars=3))
+    assert all(a[-20:] == b[:20] for a, b in zip(overlapped, overlapped[1:]))
+    assert overlapped[0] + "".join(c[20:] for c in overlapped[1:]) == text
+
+
+def test_index_paths_directories_and_globs(monkeypatch, tmp_path):
+    """Multi-doc indexing expands dirs/globs, keeps doc ids unique, and reports throughput."""
+    from concurrent.futures import Future
+
+    from src import embed_and_upsert as eu
+    from src.pagi_pb import pagi_pb2
+
+    class _Vec(list):
+        def tolist(self):
+            return list(self)
+
+    class _FakeModel:
+        def encode(self, texts, batch_size=None):
+            return [_Vec([0.1, 0.2]) for _ in texts]
+
+    sent: list[str] = []
+
+    class _UpsertRpc:
+        def future(self, req):
+            sent.extend(p.id for p in req.points)
+            fut = Future()
+            fut.set_result(pagi_pb2.UpsertResponse(success=True, upserted_count=len(req.points)))
+            return fut
+
+    class _FakeStub:
+        UpsertVectors = _UpsertRpc()
+
+    monkeypatch.setenv("PAGI_EMBEDDING_DIM", "2")
+    monkeypatch.setattr(eu, "_load_model", lambda name: _FakeModel())
+    monkeypatch.setattr(eu, "_make_stub", lambda addr: _FakeStub())
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    (docs / "README.md").write_text("x" * 25, encoding="utf-8")
+    (docs / "sub" / "README.md").write_text("y" * 5, encoding="utf-8")
+    (docs / "skip.txt").write_text("z", encoding="utf-8")
+    (tmp_path / "top.md").write_text("t" * 10, encoding="utf-8")
+
+    run = eu.index_paths(
+        "kb_core",
+        [str(docs), str(tmp_path / "*.md")],
+        chunk_size=10,
+        batch_size=2,
+        workers=1,
+        pattern="*.md",
+        manifest_path=tmp_path / "m.json",
+    )
+    assert not run.errors
+    assert {"README.md", "sub/README.md"} <= set(run.docs)
+    assert run.total_chunks == 3 + 1 + 1
+    assert "sub/README.md_chunk_0" in sent and "README.md_chunk_2" in sent
+    cps, mbps = run.throughput()
+    assert cps > 0 and mbps > 0
+
+
+def test_index_docs_share_one_embed_batch_bound(monkeypatch, tmp_path):
+    """Concurrent docs draw embed batches from one shared semaphore, so the total in flight stays bounded."""
+    import threading
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    import numpy as np
+
+    from src import embed_and_upsert as eu
+    from src.pagi_pb import pagi_pb2
+
+    lock = threading.Lock()
+    outstanding = [0, 0]  # current, peak
+
+    def embed_submit(texts):
+        with lock:
+            outstanding[0] += 1
+            outstanding[1] = max(outstanding[1], outstanding[0])
+        fut = Future()
+        threading.Timer(0.01, fut.set_result, [np.full((len(texts), 2), 0.5, dtype=np.float32)]).start()
+        return fut
+
+    class _UpsertRpc:
+        def future(self, req):
+            with lock:
+                outstanding[0] -= 1
+            fut = Future()
+            fut.set_result(pagi_pb2.UpsertResponse(success=True, upserted_count=len(req.points)))
+            return fut
+
+    class _FakeStub:
+        UpsertVectors = _UpsertRpc()
+
+    monkeypatch.setenv("PAGI_EMBEDDING_DIM", "2")
+    embed_slots, upsert_slots = threading.Semaphore(3), threading.Semaphore(2)
+
+    def _index(i):
+        doc = tmp_path / f"d{i}.md"
+        doc.write_text("x" * 200, encoding="utf-8")
+        return eu._index_doc(
+            "kb_core", doc, doc.name, {}, model_name="m", chunk_size=10, overlap=0, batch_size=2, full=False,
+            embed_submit=embed_submit, get_stub=_FakeStub, upsert_slots=upsert_slots, embed_slots=embed_slots,
+        )[0]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        reports = list(pool.map(_index, range(8)))
+    assert all(r.response.success and r.upserted == 20 for r in reports)
+    assert outstanding == [0, 3]
+
+
+def test_api_config_swaps_settings_snapshot(monkeypatch):
+    """POST /api/config swaps in a new settings version; hot-path readers see it without env reads."""
+    from src.recursive_loop import _allow_local_dispatch, _local_dispatch_allow_list
+    from src.settings import get_settings
+
+    monkeypatch.setenv("PAGI_ALLOW_UI_CONFIG_OVERRIDE", "true")
+    monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "false")
+    before = get_settings()
+    assert before.allow_local_dispatch is False and _allow_local_dispatch() is False
+
+    r = client.post("/api/config", json={"overrides": {"PAGI_ALLOW_LOCAL_DISPATCH": True, "PAGI_MOCK_MODE": True}})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["applied"] == {"PAGI_ALLOW_LOCAL_DISPATCH": "true"}
+    after = get_settings()
+    assert body["settings_version"] == after.version == before.version + 1
+    assert after.allow_local_dispatch is True and after.allow_kb_routes is True
+    assert before.allow_local_dispatch is False  # old snapshot is immutable
+    assert _allow_local_dispatch() is True
+    assert _local_dispatch_allow_list() is _local_dispatch_allow_list()
+
+
+def test_multi_turn_verticals_are_request_scoped(monkeypatch):
+    """Concurrent /rlm-multi-turn sessions with different verticals each see only their own vertical."""
+    import asyncio
+    import json
+    from types import SimpleNamespace
+
+    import src.recursive_loop as rl
+    from src.main import RLMMultiTurnRequest, handle_rlm_multi_turn
+    from src.settings import get_settings
+
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_ALLOW_OUTBOUND", "true")
+    monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "false")
+    monkeypatch.setenv("PAGI_VERTICAL_USE_CASE", "research")
+    monkeypatch.delenv("PAGI_RLM_STUB_JSON", raising=False)
+    seen: dict[str, str] = {}
+
+    async def _acompletion(**kwargs):
+        system, user = kwargs["messages"][0]["content"], kwargs["messages"][1]["content"]
+        await asyncio.sleep(0.05)  # both sessions are in flight at once
+        seen[json.loads(user)["query"]] = system
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"thought":"ok","is_final":true}'))])
+
+    monkeypatch.setattr(rl, "litellm", SimpleNamespace(acompletion=_acompletion))
+
+    async def _both():
+        return await asyncio.gather(
+            handle_rlm_multi_turn(RLMMultiTurnRequest(query="codegen task", vertical_use_case="codegen")),
+            handle_rlm_multi_turn(RLMMultiTurnRequest(query="review task", vertical_use_case="code_review")),
+        )
+
+    asyncio.run(_both())
+    assert "Prioritize generating code" in seen["codegen task"] and "code review" not in seen["codegen task"]
+    assert "Prioritize code review" in seen["review task"] and "generating code" not in seen["review task"]
+    assert get_settings().vertical_use_case == "research"
+
+
+def test_ws_agent_streams_loop_events(monkeypatch):
+    """/ws/agent: contract AgentEvents from the live loop, session_started through session_ended."""
+    monkeypatch.delenv("PAGI_ACTIONS_VIA_GRPC", raising=False)
+    monkeypatch.delenv("PAGI_ALLOW_LOCAL_DISPATCH", raising=False)
+    with client.websocket_connect("/ws/agent") as ws:
+        ws.send_json({"query": "hello", "mock_mode": True, "max_turns": 1})
+        events = [ws.receive_json()]
+        while events[-1]["event"] != "session_ended":
+            events.append(ws.receive_json())
+        ws.send_text("{}")  # invalid body: error event, socket stays open
+        invalid = ws.receive_json()
+    kinds = [e["event"] for e in events]
+    assert kinds == [
+        "session_started", "thought", "action_planned", "action_started", "action_completed",
+        "converged", "session_ended",
+    ]
+    assert all("timestamp" in e for e in events)
+    rid = events[1]["reasoning_id"]
+    assert all(e["reasoning_id"] == rid for e in events[1:5])
+    assert events[2]["skill_name"] == "mock_skill" and events[2]["params"]["query"] == "hello"
+    assert events[4]["success"] is True
+    assert events[-1]["converged"] is True and events[-1]["session_id"] == events[0]["session_id"]
+    assert invalid["event"] == "error" and invalid["component"] == "ws_agent"
+
+
+def test_multi_action_step_runs_concurrently_with_timeouts(monkeypatch, tmp_path):
+    """`actions` list: run concurrently, a slow action times out, observations merged in plan order."""
+    import asyncio
+    import time
+
+    import src.recursive_loop as rl
+
+    log = tmp_path / "actions.log"
+    monkeypatch.delenv("PAGI_MOCK_MODE", raising=False)
+    monkeypatch.delenv("PAGI_ACTIONS_VIA_GRPC", raising=False)
+    monkeypatch.setenv("PAGI_AGENT_ACTIONS_LOG", str(log))
+    monkeypatch.setenv("PAGI_ACTION_TIMEOUT_SECS", "0.5")
+    monkeypatch.setenv(
+        "PAGI_RLM_STUB_JSON",
+        '{"thought":"look around","actions":['
+        '{"skill_name":"peek_file","params":{"delay":"0.3"}},'
+        '{"skill_name":"search_codebase","params":{"delay":"2"}},'
+        '{"skill_name":"list_dir","params":{"delay":"0.1"}}],"is_final":false}',
+    )
+
+    def _slow(action, mock_mode):
+        time.sleep(float(action.params["delay"]))
+        return (f"obs-{action.skill_name}", True, "")
+
+    def _timed(fn):
+        t0 = time.perf_counter()
+        return fn(), time.perf_counter() - t0
+
+    async def _atimed():  # timed inside the event loop: asyncio.run joins the abandoned worker on exit
+        t0 = time.perf_counter()
+        return await rl.arecursive_loop(query), time.perf_counter() - t0
+
+    monkeypatch.setattr(rl, "_execute_action_in_process", _slow)
+    query = rl.RLMQuery(query="q")
+    for run in (lambda: _timed(lambda: rl.recursive_loop(query)), lambda: asyncio.run(_atimed())):
+        log.write_text("")
+        out, elapsed = run()
+        assert out.summary == "look around"
+        assert elapsed < 1.0  # 0.3 + 0.5 (deadline) + 0.1 would be sequential
+        assert action_log.flush()  # the action log is written by a background listener
+        lines = [l for l in log.read_text().splitlines() if l.startswith("OBSERVATION:")]
+        assert lines == [
+            "OBSERVATION: [1] peek_file ok=True err= obs=obs-peek_file",
+            "OBSERVATION: [2] search_codebase ok=False err=timeout:0.5s obs=Action failed",
+            "OBSERVATION: [3] list_dir ok=True err= obs=obs-list_dir",
+        ]
+
+
+def test_timed_out_batch_action_completes_once(monkeypatch, tmp_path):
+    """A timed-out action finishing later logs no second completion and is not memoized; queued ones never start."""
+    import json
+    import time
+
+    import src.recursive_loop as rl
+    from src.action_memo import memo_session
+
+    jsonl = tmp_path / "actions.jsonl"
+    monkeypatch.delenv("PAGI_ACTIONS_VIA_GRPC", raising=False)
+    monkeypatch.setenv("PAGI_ACTIONS_JSONL_LOG", str(jsonl))
+    monkeypatch.setenv("PAGI_ACTION_CONCURRENCY", "1")
+    monkeypatch.setenv("PAGI_ACTION_TIMEOUT_SECS", "0.2")
+    ran = []
+
+    def _slow(action, mock_mode):
+        ran.append(action.skill_name)
+        time.sleep(float(action.params["delay"]))
+        return (f"obs-{action.skill_name}", True, "")
+
+    monkeypatch.setattr(rl, "_execute_action_in_process", _slow)
+    search = rl.ActionSpec(skill_name="search_codebase", params={"query": "x", "path": str(tmp_path), "delay": "0.6"})
+    peek = rl.ActionSpec(skill_name="peek_file", params={"path": str(tmp_path / "f"), "delay": "0"})
+    with memo_session() as memo:
+        batch = rl._ActionBatch([
+            rl._Action(search, depth=0, reasoning_id="slow", mock_mode=False),
+            rl._Action(peek, depth=0, reasoning_id="queued", mock_mode=False),
+        ])
+        results = batch.run()
+        time.sleep(0.8)  # let the abandoned worker finish
+    assert results == [
+        ("Action failed", False, "timeout:0.2s"),
+        ("Action failed", False, "timeout:0.2s (not started)"),
+    ]
+    assert ran == ["search_codebase"]
+    assert not memo._data
+    assert action_log.flush()
+    completed = [r for r in map(json.loads, jsonl.read_text().splitlines()) if r["event"] == "action_completed"]
+    assert sorted((r["reasoning_id"], r["err"]) for r in completed) == [
+        ("queued", "timeout:0.2s (not started)"),
+        ("slow", "timeout:0.2s"),
+    ]
+
+
+def test_personal_chain_runs_tests_alongside_analysis(monkeypatch, tmp_path):
+    """Personal vertical chain is a DAG: run_tests overlaps search → analyze → write; write sees analyze output."""
+    import time
+
+    import src.recursive_loop as rl
+
+    monkeypatch.setenv("PAGI_VERTICAL_USE_CASE", "personal")
+    monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "true")
+    monkeypatch.setenv("PAGI_PROJECT_ROOT", str(tmp_path))
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_RLM_STUB_JSON", '{"thought":"ship it","is_final":true}')
+    delays = {"search_codebase": 0.1, "analyze_code": 0.1, "run_tests": 0.4, "write_file_safe": 0.1}
+    calls = []
+
+    def _slow(action, mock_mode):
+        time.sleep(delays[action.skill_name])
+        calls.append(action)
+        return (f"obs-{action.skill_name}", True, "")
+
+    monkeypatch.setattr(rl, "_execute_action_in_process", _slow)
+    t0 = time.perf_counter()
+    out = rl.recursive_loop(rl.RLMQuery(query="personal task"))
+    elapsed = time.perf_counter() - t0
+    assert out.converged is True
+    assert "run_tests: obs-run_tests" in out.summary and "obs=obs-write_file_safe" in out.summary
+    assert elapsed < 0.6  # sequential chain would take 0.7s; bounded by run_tests (0.4s)
+    order = [a.skill_name for a in calls]
+    assert order.index("search_codebase") < order.index("analyze_code") < order.index("write_file_safe")
+    assert order[-1] == "run_tests"
+    write = next(a for a in calls if a.skill_name == "write_file_safe")
+    assert "RCA: obs-analyze_code" in write.params["content"]
+
+
+def test_complex_query_fans_out_to_child_loops(monkeypatch, tmp_path):
+    """Decompose mode: sub-queries run as concurrent child loops at depth+1, LLM calls capped tree-wide."""
+    import asyncio
+    import json
+    import time
+    from types import SimpleNamespace
+
+    import src.recursive_loop as rl
+
+    log = tmp_path / "actions.log"
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv("PAGI_ALLOW_OUTBOUND", "true")
+    monkeypatch.setenv("PAGI_ENFORCE_STRUCTURED", "false")
+    monkeypatch.setenv("PAGI_DELEGATION_MODE", "decompose")
+    monkeypatch.setenv("PAGI_AGENT_ACTIONS_LOG", str(log))
+
+    async def _acompletion(**kwargs):
+        user = kwargs["messages"][-1]["content"]
+        if "Parent query" in user:  # child: answer its sub-query directly
+            await asyncio.sleep(0.2)
+            text = "resolved " + json.loads(user)["query"]
+        else:
+            text = '{"sub_queries": ["complex part a", "complex part b", "complex part c"]}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+    monkeypatch.setattr(rl, "litellm", SimpleNamespace(acompletion=_acompletion))
+
+    async def _timed():
+        t0 = time.perf_counter()
+        out = await rl.arecursive_loop(rl.RLMQuery(query="complex question"))
+        return out, time.perf_counter() - t0
+
+    out, elapsed = asyncio.run(_timed())
+    assert elapsed < 0.45  # three 0.2s branches overlap
+    assert out.converged is True  # children's "resolved" sub-summaries were merged into the parent context
+    assert action_log.flush()  # the action log is written by a background listener
+    lines = [l for l in log.read_text().splitlines() if l.startswith("SUB-SUMMARY:")]
+    assert lines == [
+        f"SUB-SUMMARY: [{i}] depth=1 converged=True complex part {p}: Synthesized generic response"
+        for i, p in enumerate("abc", start=1)
+    ]
+    monkeypatch.setenv("PAGI_SUBQUERY_CONCURRENCY", "1")
+    assert asyncio.run(_timed())[1] >= 0.6  # one LLM call at a time across the tree
+
+
+def test_root_level_search_is_memoized_past_build_output(monkeypatch, tmp_path):
+    """The tree fingerprint does not descend into target/ or hidden dirs, so a repo-root search stays
+    under TREE_MAX_ENTRIES and is memoized; the search result itself is unchanged."""
+    import src.recursive_loop as rl
+    from src.action_memo import TREE_MAX_ENTRIES, memo_session
+
+    build = tmp_path / "target" / "debug"
+    build.mkdir(parents=True)
+    for i in range(TREE_MAX_ENTRIES + 1):
+        (build / f"{i:05d}.d").write_text("dep\n")
+    source = tmp_path / "src" / "main.rs"
+    source.parent.mkdir()
+    source.write_text("fn main() { panic!() }\n")
+    monkeypatch.setenv("PAGI_PROJECT_ROOT", str(tmp_path))
+    monkeypatch.setenv("PAGI_ALLOW_LOCAL_DISPATCH", "true")
+    monkeypatch.delenv("PAGI_ACTIONS_VIA_GRPC", raising=False)
+    search = rl.ActionSpec(skill_name="search_codebase", params={"path": str(tmp_path), "pattern": "panic"})
+
+    with memo_session() as memo:
+        first = rl._execute_action(search, depth=0, reasoning_id="r1", mock_mode=False)
+        assert rl._execute_action(search, depth=0, reasoning_id="r2", mock_mode=False) == first
+        assert memo.hits == 1
+        source.write_text("fn main() { panic!(\"again\") }\n")
+        assert "again" in rl._execute_action(search, depth=0, reasoning_id="r3", mock_mode=False)[0]
+        assert memo.hits == 1
+    assert f"{source}:1:" in first[0]
+    assert "truncated at 50 files" in first[0]  # the skill still walks target/
+
+def test_idempotent_actions_memoized_per_session(monkeypatch, tmp_path):
+    """Repeated peek_file in a session is served from the memo until the file's mtime/size change."""
+    import json
+    import src.recursive_loop as rl
+    from src.action_memo import memo_session
+
+    log = tmp_path / "actions.log"
+    target = tmp_path / "notes.txt"
+    target.write_text("v1\n")
+    monkeypatch.delenv("PAGI_ACTIONS_VIA_GRPC", raising=False)
+    monkeypatch.delenv("PAGI_ALLOW_LOCAL_DISPATCH", raising=False)
+    monkeypatch.setenv("PAGI_AGENT_ACTIONS_LOG", str(log))
+    peek = rl.ActionSpec(skill_name="peek_file", params={"path": str(target)})
+
+    def _run(rid):
+        return rl._execute_action(peek, depth=0, reasoning_id=rid, mock_mode=False)
+
+    with memo_session():
+        assert _run("r1")[0] == "v1\n"
+        assert _run("r2")[0] == "v1\n"
+        target.write_text("v2 longer\n")
+        assert _run("r3")[0] == "v2 longer\n"
+    assert _run("r4")[0] == "v2 longer\n"  # no session: never memoized
+    assert action_log.flush()  # the action log is written by a background listener
+    lines = log.read_text().splitlines()
+    assert [l.rsplit("=", 1)[1] for l in lines if l.startswith("MEMO HIT")] == ["r2"]
+    assert sum(l.startswith("EXECUTING: peek_file") for l in lines) == 3
+
+    # /rlm-multi-turn: one session across turns, so turn 2's identical peek is a hit.
+    log.write_text("")
+    monkeypatch.setenv("PAGI_MOCK_MODE", "false")
+    monkeypatch.setenv(
+        "PAGI_RLM_STUB_JSON",
+        json.dumps({"thought": "look", "action": {"skill_name": "peek_file", "params": {"path": str(target)}}}),
+    )
+    r = client.post("/rlm-multi-turn", json={"query": "q", "max_turns": 2})
+    assert r.status_code == 200 and len(r.json()) == 2
+    assert action_log.flush()  # the action log is written by a background listener
+    assert sum(l.startswith("MEMO HIT: peek_file") for l in log.read_text().splitlines()) == 1
+
+
+def test_actions_pipelined_over_execute_action_stream(monkeypatch):
+    """PAGI_ACTIONS_GRPC_STREAM: concurrent actions share one stream; out-of-order responses match by call_id."""
+    import asyncio
+    import json
+    import src.recursive_loop as rl
+    from src.pagi_pb import pagi_pb2
+
+    monkeypatch.setenv("PAGI_ACTIONS_VIA_GRPC", "true")
+    monkeypatch.setenv("PAGI_ACTIONS_GRPC_STREAM", "true")
+    batches = [3, 1, 0]  # per opened stream: answer after this many requests (0: end without answering)
+    opened = []
+
+    class _Call:
+        def __init__(self, requests, batch):
+            self.requests, self.batch, self.seen = requests, batch, []
+
+        def cancel(self):
+            pass
+
+        async def __aiter__(self):
+            async for msg in self.requests:
+                self.seen.append(msg)
+                if len(self.seen) >= self.batch:
+                    for m in reversed(self.seen[: self.batch]):  # newest first
+                        opts = json.loads(m.action.params_json)["opts"]
+                        yield pagi_pb2.ActionStreamResponse(
+                            call_id=m.call_id,
+                            result=pagi_pb2.ActionResponse(observation=f"{m.action.skill_name}:{opts['depth']}", success=True),
+                        )
+                    return
+
+    class _Stub:
+        def ExecuteActionStream(self, requests):
+            opened.append(_Call(requests, batches[len(opened)]))
+            return opened[-1]
+
+    monkeypatch.setattr(rl, "_get_grpc_aio_stub", lambda: _Stub())
+    actions = [rl.ActionSpec(skill_name=f"skill_{i}", params={"opts": {"depth": i}}) for i in range(3)]
+
+    async def _run():
+        run = lambda a: rl._aexecute_action(a, depth=0, reasoning_id="r1", mock_mode=True)
+        results = await asyncio.gather(*(run(a) for a in actions))
+        after_close = [await run(actions[1]), await run(actions[2])]  # each stream ended: a new one is opened
+        await rl._close_grpc_aio()
+        return results, after_close
+
+    results, after_close = asyncio.run(_run())
+    assert results == [(f"skill_{i}:{i}", True, "") for i in range(3)]  # nested params arrived typed
+    assert len(opened[0].seen) == 3 and len(opened) == 3
+    assert after_close[0] == ("skill_1:1", True, "")
+    assert after_close[1][1] is False and after_close[1][2].startswith("grpc_error:ExecuteActionStream closed")
+
+
+def test_grpc_breaker_fails_fast_when_orchestrator_down(monkeypatch):
+    """Consecutive UNAVAILABLE results open the method's breaker; later calls fail without a round trip."""
+    import asyncio
+    import socket
+    import time
+    import grpc
+    from src import grpc_client
+    from src.pagi_pb import pagi_pb2, pagi_pb2_grpc
+
+    with socket.socket() as s:  # a port nothing listens on
+        s.bind(("127.0.0.1", 0))
+        addr = f"127.0.0.1:{s.getsockname()[1]}"
+    monkeypatch.setenv("PAGI_GRPC_BREAKER_FAILURES", "2")
+    monkeypatch.setenv("PAGI_GRPC_BREAKER_RESET_SECS", "60")
+    grpc_client.reset_breakers()
+    stub = pagi_pb2_grpc.PagiStub(grpc_client.sync_channel(addr))
+    req = pagi_pb2.SearchRequest(query="q", kb_name="kb_core", limit=1)
+    codes = []
+    for _ in range(2):
+        with pytest.raises(grpc.RpcError) as exc:
+            stub.SemanticSearch(req, timeout=5.0)
+        codes.append(exc.value.code())
+    assert codes == [grpc.StatusCode.UNAVAILABLE] * 2
+    t0 = time.perf_counter()
+    with pytest.raises(grpc_client.CircuitOpenError):
+        stub.SemanticSearch(req, timeout=5.0)
+    assert time.perf_counter() - t0 < 0.05
+
+    async def _aio_execute():  # aio channels share the per-method breakers; ExecuteAction is still closed
+        channel = grpc_client.aio_channel(addr)
+        try:
+            with pytest.raises(grpc.RpcError) as exc:
+                await pagi_pb2_grpc.PagiStub(channel).ExecuteAction(pagi_pb2.ActionRequest(skill_name="x"), timeout=5.0)
+            return exc.value
+        finally:
+            await channel.close()
+
+    assert not isinstance(asyncio.run(_aio_execute()), grpc_client.CircuitOpenError)
+    breakers = client.get("/health/grpc").json()["breakers"]
+    assert breakers["/pagi.Pagi/SemanticSearch"]["state"] == "open"
+    assert breakers["/pagi.Pagi/SemanticSearch"]["rejected"] == 1
+    assert breakers["/pagi.Pagi/ExecuteAction"]["state"] == "closed"
+    assert breakers["/pagi.Pagi/ExecuteAction"]["consecutive_failures"] == 1
+    grpc_client.reset_breakers()
+
+
+def test_self_heal_reports_queued_and_deduplicated(monkeypatch, tmp_path):
+    """Error responses do not wait on ProposePatch; identical traces collapse into one counted report."""
+    import time
+    from src.self_heal_queue import trace_fingerprint
+
+    log = tmp_path / "self_heal.log"
+    monkeypatch.setenv("PAGI_ALLOW_SELF_HEAL_GRPC", "true")
+    monkeypatch.setenv("PAGI_SELF_HEAL_LOG", str(log))
+    mock_stub = MagicMock()
+
+    def _slow_propose(req, timeout=None):
+        time.sleep(0.5)
+        return MagicMock(patch_id="p1", requires_hitl=True)
+
+    mock_stub.ProposePatch.side_effect = _slow_propose
+    with patch("src.recursive_loop._get_grpc_stub", return_value=mock_stub):
+        for _ in range(5):
+            t0 = time.perf_counter()
+            assert client.post("/debug", json={"trigger_error": True}).status_code == 200
+            assert time.perf_counter() - t0 < 0.25
+        assert _get_self_heal_queue().flush(timeout=5.0)
+    mock_stub.ProposePatch.assert_called_once()
+    assert action_log.flush()  # the action log is written by a background listener
+    assert "Self-heal reported (gRPC) (occurrences=5)" in log.read_text()
+    stats = client.get("/health/self-heal").json()
+    assert (stats["submitted"], stats["deduplicated"], stats["delivered"]) == (5, 4, 1)
+
+    trace = 'Traceback (most recent call last):\n  File "/a/src/x.py", line 10, in f\nKeyError: \'id 17\'\n'
+    moved = trace.replace("line 10", "line 12").replace("17", "99").replace("/a/", "/b/")
+    assert trace_fingerprint(trace, "c") == trace_fingerprint(moved, "c")
+    assert trace_fingerprint(trace, "c") != trace_fingerprint(trace.replace("in f", "in g"), "c")
+
+
+def test_action_log_jsonl_rotates_and_compresses(monkeypatch, tmp_path, capsys):
+    """PAGI_ACTIONS_JSONL_LOG gets one JSON record per action event; size rotation gzips old files."""
+    import gzip
+    import json
+    import src.recursive_loop as rl
+
+    jsonl = tmp_path / "actions.jsonl"
+    target = tmp_path / "notes.txt"
+    target.write_text("hello\n")
+    monkeypatch.delenv("PAGI_ACTIONS_VIA_GRPC", raising=False)
+    monkeypatch.delenv("PAGI_ALLOW_LOCAL_DISPATCH", raising=False)
+    monkeypatch.setenv("PAGI_ACTIONS_JSONL_LOG", str(jsonl))
+    monkeypatch.setenv("PAGI_ACTIONS_LOG_MAX_MB", "0.001")  # ~1 KB per file
+    monkeypatch.setenv("PAGI_ACTIONS_LOG_BACKUPS", "3")
+    monkeypatch.setenv("PAGI_ACTIONS_LOG_COMPRESS", "true")
+    monkeypatch.setenv("PAGI_VERBOSE_ACTIONS", "true")
+    peek = rl.ActionSpec(skill_name="peek_file", params={"path": str(target)})
+    for i in range(8):
+        assert rl._execute_action(peek, depth=0, reasoning_id=f"r{i}", mock_mode=False)[0] == "hello\n"
+    assert action_log.flush()
+
+    rotated = sorted(tmp_path.glob("actions.jsonl.*.gz"))
+    assert rotated and len(rotated) <= 3
+    records = [json.loads(l) for f in rotated for l in gzip.decompress(f.read_bytes()).decode().splitlines()]
+    records += [json.loads(l) for l in jsonl.read_text().splitlines()]
+    completed = [r for r in records if r["event"] == "action_completed" and r["reasoning_id"] == "r7"]
+    assert len(completed) == 1
+    assert completed[0]["skill"] == "peek_file" and completed[0]["ok"] is True and completed[0]["duration_ms"] >= 0
+    assert "err" not in completed[0]
+    assert "EXECUTING: peek_file mock=False reasoning_id=r7" in capsys.readouterr().out
+
+
+def test_action_log_survives_unwritable_path(monkeypatch, tmp_path):
+    """A log path that cannot be opened drops its records; the listener keeps writing other paths."""
+    import logging
+
+    monkeypatch.setattr(logging, "raiseExceptions", False)
+    good = tmp_path / "actions.log"
+    action_log.write_record("lost", event="log", text_path="/nonexistent/dir/f.log", jsonl_path="/nonexistent/dir/f.jsonl")
+    action_log.write_record("kept", event="log", text_path=str(good))
+    assert action_log.flush()
+    assert good.read_text() == "kept\n"
+    action_log.write_record("lost again", event="log", text_path="/nonexistent/dir/f.log")
+    action_log.write_record("kept again", event="log", text_path=str(good))
+    assert action_log.flush()
+    assert good.read_text() == "kept\nkept again\n"
+
+
+def test_grpc_breaker_keeps_futures_pipelined():
+    """The breaker interceptor records outcomes on completion: `.future()` calls return at once and overlap."""
+    import time
+    from concurrent import futures
+    import grpc
+    from src import grpc_client
+    from src.pagi_pb import pagi_pb2, pagi_pb2_grpc
+
+    class _SlowUpserts(pagi_pb2_grpc.PagiServicer):
+        def UpsertVectors(self, request, context):
+            time.sleep(0.5)
+            return pagi_pb2.UpsertResponse(success=True, upserted_count=len(request.points))
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    pagi_pb2_grpc.add_PagiServicer_to_server(_SlowUpserts(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    grpc_client.reset_breakers()
+    try:
+        channel = grpc_client.sync_channel(f"127.0.0.1:{port}")
+        stub = pagi_pb2_grpc.PagiStub(channel)
+        grpc.channel_ready_future(channel).result(timeout=5.0)
+        t0 = time.perf_counter()
+        pending = [stub.UpsertVectors.future(pagi_pb2.UpsertRequest(kb_name="kb_core"), timeout=5.0) for _ in range(3)]
+        submitted = time.perf_counter() - t0
+        assert all(f.result().success for f in pending)
+        elapsed = time.perf_counter() - t0
+        channel.close()
+    finally:
+        server.stop(None)
+    assert submitted < 0.2
+    assert elapsed < 1.2  # three 0.5s calls in flight together, not back to back
+    assert grpc_client.breaker_states()["/pagi.Pagi/UpsertVectors"]["state"] == "closed"
+    grpc_client.reset_breakers()
+
+
+def test_grpc_breaker_releases_trial_when_call_setup_raises(monkeypatch):
+    """A sync call that raises before returning a future still releases the half-open trial slot."""
+    from types import SimpleNamespace
+
+    import grpc
+    from src import grpc_client
+
+    monkeypatch.setenv("PAGI_GRPC_BREAKER_FAILURES", "1")
+    monkeypatch.setenv("PAGI_GRPC_BREAKER_RESET_SECS", "0")
+    grpc_client.reset_breakers()
+    breaker = grpc_client.breaker_for("/pagi.Pagi/SemanticSearch")
+    breaker.record(grpc.StatusCode.UNAVAILABLE)
+    assert breaker.state == "open"
+
+    def _raising(details, request):
+        raise ValueError("cannot serialize request")
+
+    details = SimpleNamespace(method="/pagi.Pagi/SemanticSearch")
+    with pytest.raises(ValueError):
+        grpc_client._BreakerInterceptor().intercept_unary_unary(_raising, details, None)
+    breaker.before_call()  # the trial slot is free again, so this does not raise CircuitOpenError
+    assert breaker.state == "half_open"
+    grpc_client.reset_breakers()